@@ -1 +1 @@
-pip install -r requirements.txt && python manage.py migrate && python manage.py collectstatic --noinput
+pip install -r requirements.txt && python manage.py migrate && python manage.py bundle_inline_styles && python manage.py collectstatic --noinput && python manage.py rebuild_blog_cards && python manage.py rebuild_search_index && python manage.py rebuild_blog_navigation && python manage.py build_related_blogs && python manage.py generate_renditions && python manage.py generate_placeholders && python manage.py build_logo_sprites && python manage.py export_site_snapshot
\ No newline at end of file
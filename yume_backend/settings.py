@@ -52,15 +52,21 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "yume_site.middleware.MediaFilesMiddleware",
+    "yume_site.middleware.SiteSnapshotMiddleware",
 
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    # Skipped for anonymous GET/HEAD outside SESSION_PATH_PREFIXES
+    "yume_site.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "yume_site.middleware.AuthenticationMiddleware",
+    "yume_site.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Paths that always get sessions, auth and messages
+SESSION_PATH_PREFIXES = ["/admin/"]
+
 # --------------------------------------------------
 # ROOT URL
 # --------------------------------------------------
@@ -73,8 +79,15 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Django's default loaders, plus swapping <style> blocks for the
+            # bundles built by `manage.py bundle_inline_styles`
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'yume_site.template_loaders.FilesystemLoader',
+                    'yume_site.template_loaders.AppDirectoriesLoader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -113,6 +126,25 @@ DATABASES = {
     )
 }
 
+# --------------------------------------------------
+# CACHE (shared by all gunicorn workers on the dyno)
+# --------------------------------------------------
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("CACHE_DIR", str(BASE_DIR / "django_cache")),
+        "TIMEOUT": 60 * 60 * 24,
+        # Each deploy starts from an empty namespace
+        "KEY_PREFIX": os.environ.get("RENDER_GIT_COMMIT", "")[:12],
+        "OPTIONS": {
+            "MAX_ENTRIES": 5000,
+        },
+    }
+}
+
+# Public pages are cached until the content they show changes
+PAGE_CACHE_ENABLED = os.environ.get("PAGE_CACHE_ENABLED", str(not DEBUG)).lower() == "true"
+
 # --------------------------------------------------
 # PASSWORD VALIDATORS
 # --------------------------------------------------
@@ -137,8 +169,13 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# CSS bundles written by `manage.py bundle_inline_styles` before collectstatic
+INLINE_STYLES_BUILD_DIR = BASE_DIR / 'static_build'
+INLINE_STYLES_MAP = BASE_DIR / 'inline_styles.json'
+
 STATICFILES_DIRS = [
     BASE_DIR / 'static',
+    *([INLINE_STYLES_BUILD_DIR] if INLINE_STYLES_BUILD_DIR.is_dir() else []),
 ]
 
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
@@ -149,6 +186,68 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Served by yume_site.middleware.MediaFilesMiddleware with ETags and ranges.
+# Content-addressed uploads are cached for a year; other media (renditions,
+# older uploads) for this many seconds, then revalidated
+MEDIA_CACHE_MAX_AGE = 60 * 60
+
+# Uploads over 1 MB stream to a temporary file instead of RAM; images are
+# then downsized from disk (yume_site/uploads.py)
+FILE_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024
+
+# --------------------------------------------------
+# ON-DEMAND IMAGE RESIZING (/img/<w>x<h>/..., yume_site/image_resizer.py)
+# --------------------------------------------------
+# Only these boxes are rendered, anything else is a 404
+IMAGE_RESIZE_SIZES = [
+    (160, 40), (320, 80),     # company logos (35px high, 1x/2x)
+    (400, 460), (800, 920),   # founder portraits
+]
+IMAGE_CACHE_ROOT = Path(os.environ.get("IMAGE_CACHE_DIR", str(BASE_DIR / "image_cache")))
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get("IMAGE_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+
+# --------------------------------------------------
+# FORM SUBMISSIONS (yume_site/submissions.py)
+# --------------------------------------------------
+# Contact/enquiry/enrollment POSTs are written to this local journal;
+# `manage.py flush_submissions` (the Procfile's flusher) moves them to the
+# database. SUBMISSION_JOURNAL_PATH must be on a persistent disk the web and
+# flusher processes share
+SUBMISSION_JOURNAL_PATH = os.environ.get("SUBMISSION_JOURNAL_PATH")
+SUBMISSION_JOURNAL = Path(SUBMISSION_JOURNAL_PATH or BASE_DIR / "submissions.sqlite3")
+# On: POSTs are acknowledged once journaled. Only with an explicit journal
+# path, since the default one is on the ephemeral deploy disk. Off: each
+# POST is flushed right away (runserver, or no persistent disk)
+SUBMISSION_WRITE_BEHIND = (
+    bool(SUBMISSION_JOURNAL_PATH)
+    and os.environ.get("SUBMISSION_WRITE_BEHIND", "true").lower() == "true"
+)
+# Seconds within which the same details (email, mobile, course...) are
+# treated as a resend and answered without storing them again
+SUBMISSION_DEDUP_WINDOW = 10 * 60
+
+# Token buckets per form (yume_site/throttling.py), as (rate, burst): per
+# client IP, generous because a campus shares one address, and per email
+# or mobile number submitted
+FORM_THROTTLES = {
+    kind: {"ip": ("60/h", 20), "identity": ("6/h", 3)}
+    for kind in ("contact", "enquiry", "enrollment")
+}
+# Proxies in front of gunicorn that append to X-Forwarded-For (Render: 1)
+THROTTLE_TRUSTED_PROXIES = int(os.environ.get("THROTTLE_TRUSTED_PROXIES", 1))
+
+# --------------------------------------------------
+# PRERENDERED SITE SNAPSHOT
+# --------------------------------------------------
+# Filled by `manage.py export_site_snapshot`, kept fresh on admin saves
+SITE_SNAPSHOT_ROOT = BASE_DIR / "site_snapshot"
+SITE_SNAPSHOT_MAX_AGE = 60
+
+# --------------------------------------------------
+# RELATED BLOG POSTS (TF-IDF index, built by `manage.py build_related_blogs`)
+# --------------------------------------------------
+RELATED_BLOGS_INDEX_PATH = BASE_DIR / "related_blogs_index.npz"
+
 # --------------------------------------------------
 # DEFAULT PRIMARY KEY
 # --------------------------------------------------
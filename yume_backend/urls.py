@@ -1,8 +1,6 @@
 
 from django.contrib import admin
 from django.urls import path, include
-from django.conf import settings
-from django.conf.urls.static import static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -10,7 +8,5 @@ urlpatterns = [
 ]
 
 
+# MEDIA_URL is served by yume_site.middleware.MediaFilesMiddleware
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-    
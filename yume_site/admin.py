@@ -66,6 +66,24 @@ from .models import (
     CurriculumTopic, CourseLearningOutcome, CourseTool,
     CourseCertificationPoint, CourseFAQ, CourseCareerOpportunity
 )
+from .search import matching_ids
+
+
+# =========================
+# FULL-TEXT ADMIN SEARCH
+# =========================
+class IndexedSearchMixin:
+    """
+    Admin search through the site search index instead of `icontains`
+    scans. Falls back to `search_fields` when the query has no words.
+    """
+    search_kind = None
+
+    def get_search_results(self, request, queryset, search_term):
+        matches = matching_ids(self.search_kind, search_term)
+        if matches is None:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk__in=matches), False
 
 
 # =========================
@@ -270,10 +288,11 @@ class CourseCareerOpportunityInline(admin.StackedInline):
 # COURSE ADMIN (MAIN)
 # =========================
 @admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
+class CourseAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ("title", "course_url", "is_active", "order")
     list_editable = ("is_active", "order")
     search_fields = ("title", "course_url")
+    search_kind = "course"
     ordering = ("order",)
 
     fieldsets = (
@@ -361,13 +380,58 @@ ds = ['project_card']
 
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import ProjectCard, ProjectDetail
+from .models import ProjectCard, ProjectDetail, ProjectBlock, BlogBlock
+
+
+# =========================
+# CONTENT BLOCK INLINES
+# =========================
+BLOCK_FIELDS = (
+    ("kind", "order"),
+    ("title", "subtitle"),
+    "text",
+    ("icon", "color"),
+    ("number", "value"),
+    "link",
+)
+
+
+class ProjectBlockInline(admin.StackedInline):
+    """Partners, components, role items... (new pages get the default set)"""
+    model = ProjectBlock
+    extra = 0
+    ordering = ("kind", "order")
+    fields = BLOCK_FIELDS
+    verbose_name_plural = "🧱 Content Blocks (partners, components, features, badges...)"
+
+    def has_add_permission(self, request, obj=None):
+        # Defaults are added when the page is first saved
+        return obj is not None and super().has_add_permission(request, obj)
+
+
+class BlogBlockInline(ProjectBlockInline):
+    """Features, applications, stats and sidebar courses"""
+    model = BlogBlock
+    verbose_name_plural = "🧱 Content Blocks (features, applications, stats, courses)"
+
+
+@admin.register(ProjectDetail)
+class ProjectDetailAdmin(admin.ModelAdmin):
+    """Content blocks of a project detail page (page fields are on the project card)"""
+    list_display = ("__str__", "updated_at")
+    fields = ("project_card",)
+    readonly_fields = ("project_card",)
+    inlines = [ProjectBlockInline]
+
+    def has_add_permission(self, request):
+        return False
 
 
 class ProjectDetailInline(admin.StackedInline):
     """Inline editor for detail page BELOW the card"""
     model = ProjectDetail
     can_delete = False
+    show_change_link = True  # content blocks are edited on the detail page admin
     verbose_name_plural = "Project Detail Page"
     verbose_name = "Detail Page Content"
     
@@ -398,21 +462,6 @@ class ProjectDetailInline(admin.StackedInline):
             'description': 'Show or hide partners section'
         }),
         
-        ('👥 Partner 1', {
-            'fields': ('partner_1_name', 'partner_1_type', 'partner_1_icon', 'partner_1_color'),
-            'description': 'First partner details'
-        }),
-        
-        ('👥 Partner 2', {
-            'fields': ('partner_2_name', 'partner_2_type', 'partner_2_icon', 'partner_2_color'),
-            'description': 'Second partner details'
-        }),
-        
-        ('👥 Partner 3', {
-            'fields': ('partner_3_name', 'partner_3_type', 'partner_3_icon', 'partner_3_color'),
-            'description': 'Third partner details'
-        }),
-        
         ('📝 Detailed Content', {
             'fields': ('detailed_content',),
             'description': 'Full project description for detail page'
@@ -449,39 +498,6 @@ class ProjectDetailInline(admin.StackedInline):
             'description': 'Toggle program components section'
         }),
         
-        ('📋 Component 1 - Technical Skills', {
-            'fields': (
-                'component_1_title',
-                'component_1_subtitle',
-                'component_1_icon',
-                'component_1_color',
-                'component_1_items',
-            ),
-            'description': 'First program component details'
-        }),
-        
-        ('📋 Component 2 - Hands-on Projects', {
-            'fields': (
-                'component_2_title',
-                'component_2_subtitle',
-                'component_2_icon',
-                'component_2_color',
-                'component_2_items',
-            ),
-            'description': 'Second program component details'
-        }),
-        
-        ('📋 Component 3 - Career Development', {
-            'fields': (
-                'component_3_title',
-                'component_3_subtitle',
-                'component_3_icon',
-                'component_3_color',
-                'component_3_items',
-            ),
-            'description': 'Third program component details'
-        }),
-        
                 ('🎯 Role & Impact Section', {
             'fields': ('show_role_impact',),
             'description': 'Toggle role and impact section'
@@ -495,75 +511,15 @@ class ProjectDetailInline(admin.StackedInline):
             'description': 'Main role description'
         }),
         
-        ('🔧 Role Item 1', {
-            'fields': (
-                'role_item_1_title',
-                'role_item_1_subtitle',
-                'role_item_1_icon',
-                'role_item_1_color',
-            ),
-            'description': 'First role responsibility'
-        }),
-        
-        ('🔧 Role Item 2', {
-            'fields': (
-                'role_item_2_title',
-                'role_item_2_subtitle',
-                'role_item_2_icon',
-                'role_item_2_color',
-            ),
-            'description': 'Second role responsibility'
-        }),
-        
-        ('🔧 Role Item 3', {
-            'fields': (
-                'role_item_3_title',
-                'role_item_3_subtitle',
-                'role_item_3_icon',
-                'role_item_3_color',
-            ),
-            'description': 'Third role responsibility'
-        }),
-        
-        ('🔧 Role Item 4', {
-            'fields': (
-                'role_item_4_title',
-                'role_item_4_subtitle',
-                'role_item_4_icon',
-                'role_item_4_color',
-            ),
-            'description': 'Fourth role responsibility'
-        }),
-        
         ('📊 Program Impact', {
             'fields': (
                 'impact_title',
                 'impact_main_number',
                 'impact_main_text',
-                'impact_metric_1_number',
-                'impact_metric_1_text',
-                'impact_metric_2_number',
-                'impact_metric_2_text',
             ),
             'description': 'Impact statistics'
         }),
         
-        ('📈 Outcome Metrics', {
-            'fields': (
-                'outcome_1_label',
-                'outcome_1_value',
-                'outcome_1_color',
-                'outcome_2_label',
-                'outcome_2_value',
-                'outcome_2_color',
-                'outcome_3_label',
-                'outcome_3_value',
-                'outcome_3_color',
-            ),
-            'description': 'Outcome progress bars'
-        }),
-        
-        
             ('🏆 Certification & Support Section', {
             'fields': ('show_certification_support',),
             'description': 'Toggle certification and support section'
@@ -580,15 +536,6 @@ class ProjectDetailInline(admin.StackedInline):
             'description': 'Certification card details'
         }),
         
-        ('✅ Certification Features', {
-            'fields': (
-                ('cert_feature_1_text', 'cert_feature_1_icon', 'cert_feature_1_color'),
-                ('cert_feature_2_text', 'cert_feature_2_icon', 'cert_feature_2_color'),
-                ('cert_feature_3_text', 'cert_feature_3_icon', 'cert_feature_3_color'),
-                ('cert_feature_4_text', 'cert_feature_4_icon', 'cert_feature_4_color'),
-            ),
-            'description': 'Certification features (4 items)'
-        }),
         
         ('💼 Support Card', {
             'fields': (
@@ -601,17 +548,6 @@ class ProjectDetailInline(admin.StackedInline):
             'description': 'Support card details'
         }),
         
-        ('✅ Support Features', {
-            'fields': (
-                ('support_feature_1_text', 'support_feature_1_icon', 'support_feature_1_color'),
-                ('support_feature_2_text', 'support_feature_2_icon', 'support_feature_2_color'),
-                ('support_feature_3_text', 'support_feature_3_icon', 'support_feature_3_color'),
-                ('support_feature_4_text', 'support_feature_4_icon', 'support_feature_4_color'),
-            ),
-            'description': 'Support features (4 items)'
-        }),
-        
-        
                 ('🌱 Sustainable Pathways Section', {
             'fields': ('show_sustainable_pathways',),
             'description': 'Toggle sustainable pathways section'
@@ -625,24 +561,10 @@ class ProjectDetailInline(admin.StackedInline):
             'description': 'Main content for sustainable pathways'
         }),
         
-        ('🏷️ Partner Badges', {
-            'fields': (
-                ('partner_badge_1_name', 'partner_badge_1_icon', 'partner_badge_1_color'),
-                ('partner_badge_2_name', 'partner_badge_2_icon', 'partner_badge_2_color'),
-                ('partner_badge_3_name', 'partner_badge_3_icon', 'partner_badge_3_color'),
-            ),
-            'description': 'Partner badges (3 badges)'
-        }),
         
         ('⭐ Program Highlights', {
             'fields': (
                 'highlights_title',
-                'highlight_1_text',
-                'highlight_1_color',
-                'highlight_2_text',
-                'highlight_2_color',
-                'highlight_3_text',
-                'highlight_3_color',
             ),
             'description': 'Program highlights in right column'
         }),
@@ -656,9 +578,6 @@ class ProjectDetailInline(admin.StackedInline):
         'student_count': 'Number of students in the program',
         'location': 'e.g., Bengaluru, Karnataka, Pan-India',
         'detailed_content': 'Detailed description of the project',
-        'partner_1_icon': 'Select an icon that represents this partner',
-        'partner_2_icon': 'Select an icon that represents this partner',
-        'partner_3_icon': 'Select an icon that represents this partner',
         
         'program_overview_title': 'Title for program overview section',
         'program_objective': 'Describe the program objective and purpose',
@@ -666,13 +585,6 @@ class ProjectDetailInline(admin.StackedInline):
         'learning_approach_icon': 'Select icon for learning approach box',
         'components_title': 'Title for program components section',
         
-        'component_1_items': 'Enter one item per line (press Enter for new line)',
-        'component_2_items': 'Enter one item per line (press Enter for new line)',
-        'component_3_items': 'Enter one item per line (press Enter for new line)',
-        
-        'outcome_1_value': 'Enter percentage value (0-100)',
-        'outcome_2_value': 'Enter percentage value (0-100)',
-        'outcome_3_value': 'Enter percentage value (0-100)',
     }
     
     
@@ -681,7 +593,7 @@ class ProjectDetailInline(admin.StackedInline):
 
 
 @admin.register(ProjectCard)
-class ProjectCardAdmin(admin.ModelAdmin):
+class ProjectCardAdmin(IndexedSearchMixin, admin.ModelAdmin):
     """Admin for Project Cards"""
     
     # === LIST VIEW ===
@@ -696,6 +608,7 @@ class ProjectCardAdmin(admin.ModelAdmin):
     
     list_filter = ['is_active', 'category']
     search_fields = ['project_name', 'tagline']
+    search_kind = 'project'
     list_editable = ['is_active']
     
     # === FORM FIELDSETS ===
@@ -754,13 +667,27 @@ class ProjectCardAdmin(admin.ModelAdmin):
 
 
 
+from django.contrib.admin.views.main import ChangeList
 from .models import DynamicBlog
 # Update the DynamicBlogAdmin class in your existing admin.py
 
+
+class BlogChangeList(ChangeList):
+    """Blog list that only loads the card columns it shows"""
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).cards()
+
+
 @admin.register(DynamicBlog)
-class BlogAdmin(admin.ModelAdmin):  # Changed class name to BlogAdmin
+class BlogAdmin(IndexedSearchMixin, admin.ModelAdmin):  # Changed class name to BlogAdmin
     """Admin for Blogs"""
     
+    def get_changelist(self, request, **kwargs):
+        return BlogChangeList
+    
+    inlines = [BlogBlockInline]
+    
     # === LIST VIEW ===
     list_display = [
         'title', 
@@ -774,6 +701,7 @@ class BlogAdmin(admin.ModelAdmin):  # Changed class name to BlogAdmin
     
     list_filter = ['is_published', 'featured', 'category', 'publish_date']
     search_fields = ['title', 'excerpt', 'author_name']
+    search_kind = 'blog'
     list_editable = ['is_published', 'featured', 'display_order']
     date_hierarchy = 'publish_date'
     
@@ -828,38 +756,12 @@ class BlogAdmin(admin.ModelAdmin):  # Changed class name to BlogAdmin
             'description': 'First content section - Introduction'
         }),
         
-        ('⭐ Section 2: Features (4 Features)', {
-            'fields': (
-                'section_2_title',
-                ('feature_1_title', 'feature_1_icon', 'feature_1_content'),
-                ('feature_2_title', 'feature_2_icon', 'feature_2_content'),
-                ('feature_3_title', 'feature_3_icon', 'feature_3_content'),
-                ('feature_4_title', 'feature_4_icon', 'feature_4_content'),
-            ),
-            'description': 'Four feature cards with icons'
-        }),
-        
-        ('📋 Section 3: Applications', {
-            'fields': (
-                'section_3_title',
-                'application_1',
-                'application_2',
-                'application_3',
-                'application_4',
-                'application_5',
-            ),
-            'description': 'Application list items'
-        }),
-        
         ('📊 Section 4: Career Impact', {
             'fields': (
                 'section_4_title',
                 'section_4_content',
-                ('stat_1_number', 'stat_1_text'),
-                ('stat_2_number', 'stat_2_text'),
-                ('stat_3_number', 'stat_3_text'),
             ),
-            'description': 'Career impact with statistics'
+            'description': 'Career impact text (stats are content blocks below)'
         }),
         
         ('🎯 Call to Action', {
@@ -915,22 +817,12 @@ class BlogAdmin(admin.ModelAdmin):  # Changed class name to BlogAdmin
             'description': 'Social media links in sidebar'
         }),
         
-        ('📚 Related Courses Section', {
-            'fields': (
-                'courses_section_title',
-                ('course_1_title', 'course_1_description', 'course_1_link'),
-                ('course_2_title', 'course_2_description', 'course_2_link'),
-                ('course_3_title', 'course_3_description', 'course_3_link'),
-            ),
-            'description': 'Three related courses in sidebar'
-        }),
         
         ('📊 Blog Categories Section', {
             'fields': (
                 'categories_section_title',
-                ('excel_count', 'sql_count', 'python_count', 'azure_count', 'career_count'),
             ),
-            'description': 'Blog category counts in sidebar'
+            'description': 'Post counts per category are computed from published blogs'
         }),
     )
     
@@ -1056,14 +948,25 @@ class AdvisorAdmin(admin.ModelAdmin):
 
     # ---------- ACTIONS ----------
 
+    # Saved one by one (not queryset.update) so the about page cache
+    # and highlighted bios are refreshed by the model save signals
+
     def activate_advisors(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = 0
+        for advisor in queryset:
+            advisor.is_active = True
+            advisor.save(update_fields=['is_active', 'updated_at'])
+            updated += 1
         self.message_user(request, f"{updated} advisor(s) activated.")
 
     activate_advisors.short_description = "Activate selected advisors"
 
     def deactivate_advisors(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = 0
+        for advisor in queryset:
+            advisor.is_active = False
+            advisor.save(update_fields=['is_active', 'updated_at'])
+            updated += 1
         self.message_user(request, f"{updated} advisor(s) deactivated.")
 
     deactivate_advisors.short_description = "Deactivate selected advisors"
@@ -1291,3 +1194,30 @@ class InternshipSectionAdmin(admin.ModelAdmin):
 
     def has_add_permission(self, request):
         return not InternshipSection.objects.exists()
+
+
+# ==========================
+# Image Rendition Jobs
+# ==========================
+
+from django.utils import timezone
+from .models import RenditionJob
+
+
+@admin.register(RenditionJob)
+class RenditionJobAdmin(admin.ModelAdmin):
+    list_display = ("source", "status", "attempts", "run_after", "updated_at")
+    list_filter = ("status",)
+    search_fields = ("source",)
+    readonly_fields = ("source", "status", "attempts", "run_after", "last_error", "created_at", "updated_at")
+    actions = ["retry_jobs"]
+
+    @admin.action(description="Retry selected jobs")
+    def retry_jobs(self, request, queryset):
+        count = queryset.exclude(status=RenditionJob.RUNNING).update(
+            status=RenditionJob.PENDING, attempts=0, run_after=timezone.now(), last_error=""
+        )
+        self.message_user(request, f"{count} job(s) queued again.")
+
+    def has_add_permission(self, request):
+        return False
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class YumeSiteConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'yume_site'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,50 @@
+from django.db import transaction
+
+from .blog_listing import listing_key
+from .models import BLOG_CARD_FIELDS, BlogCard, DynamicBlog
+
+
+# =========================
+# BLOG CARD TABLE
+# =========================
+# The blog listing reads BlogCard (one narrow row per published blog)
+# instead of DynamicBlog's 100+ columns. Rows are written from DynamicBlog
+# saves with queryset writes only, so they never fire page/snapshot signals
+# of their own (the blog save already did).
+
+CARD_COLUMNS = [field for field in BLOG_CARD_FIELDS if field not in ('id', 'is_published')]
+
+
+def card_values(blog):
+    values = {field: getattr(blog, field) for field in CARD_COLUMNS}
+    values['featured_image'] = blog.featured_image.name
+    # A freshly saved instance can still hold the date as a string
+    publish_date = DynamicBlog._meta.get_field('publish_date').to_python(blog.publish_date)
+    values['listing_key'] = listing_key(blog.display_order, publish_date, blog.pk)
+    return values
+
+
+def refresh_blog_card(blog, deleted=False):
+    """Insert, update or drop the card of a saved/deleted blog"""
+    if deleted or not blog.is_published:
+        BlogCard.objects.filter(blog_id=blog.pk).delete()
+        return
+
+    # Saved from a deferred queryset (admin changelist): read what is missing
+    if blog.get_deferred_fields().intersection(CARD_COLUMNS):
+        blog = DynamicBlog.objects.cards().get(pk=blog.pk)
+    values = card_values(blog)
+    if not BlogCard.objects.filter(blog_id=blog.pk).update(**values):
+        BlogCard.objects.bulk_create([BlogCard(blog_id=blog.pk, **values)])
+
+
+@transaction.atomic
+def rebuild_blog_cards():
+    """Rebuild every card from scratch; returns the number of rows"""
+    cards = [
+        BlogCard(blog_id=blog.pk, **card_values(blog))
+        for blog in DynamicBlog.objects.published().cards().iterator(chunk_size=2000)
+    ]
+    BlogCard.objects.all().delete()
+    BlogCard.objects.bulk_create(cards, batch_size=1000)
+    return len(cards)
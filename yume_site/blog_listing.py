@@ -0,0 +1,96 @@
+import datetime
+import re
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from .cache_utils import get_version, bump_version
+from .models import BlogCard, DynamicBlog
+from .page_cache import note_dependencies
+from .site_snapshot import refresh_for_tags
+
+
+# =========================
+# BLOG LISTING PAGES
+# =========================
+# /blog/ and /blog/category/<category>/ show PAGE_SIZE cards at a time in
+# (display_order, -publish_date, -id) order. BlogCard.listing_key packs
+# that order into one ascending string, and the next page is
+# "?after=<listing_key of the last card>": every page, however deep, is
+# one index range read of PAGE_SIZE + 1 rows.
+
+PAGE_SIZE = 12
+
+DISPLAY_ORDER_OFFSET = 2 ** 31
+LAST_DATE = datetime.date.max.toordinal()
+LAST_ID = 10 ** 12 - 1
+
+CURSOR_RE = re.compile(r"^\d{10}\.\d{7}\.\d{12}$")
+
+
+def listing_key(display_order, publish_date, blog_id):
+    """Sort key whose ascending order is (display_order, -publish_date, -id)"""
+    return "{:010d}.{:07d}.{:012d}".format(
+        display_order + DISPLAY_ORDER_OFFSET,
+        LAST_DATE - publish_date.toordinal(),
+        LAST_ID - blog_id,
+    )
+
+
+def is_valid_cursor(value):
+    return bool(CURSOR_RE.match(value))
+
+
+def blog_page(category=None, after=None):
+    """(cards, next cursor or None) for one listing page"""
+    cards = BlogCard.objects.order_by('listing_key')
+    if category:
+        cards = cards.filter(category=category)
+    if after:
+        cards = cards.filter(listing_key__gt=after)
+
+    cards = list(cards[:PAGE_SIZE + 1])
+    next_cursor = cards[PAGE_SIZE - 1].listing_key if len(cards) > PAGE_SIZE else None
+    return cards[:PAGE_SIZE], next_cursor
+
+
+# =========================
+# CATEGORY FACETS
+# =========================
+# Published posts per category, one grouped query cached until a blog save
+# or delete changes a count (signals.py bumps the version). Pages showing
+# the counts depend on the version like on a page-cache tag.
+
+FACETS_VERSION_KEY = "blog_facets:version"
+FACETS_TIMEOUT = 60 * 60 * 24
+
+
+def bump_blog_facets():
+    bump_version(FACETS_VERSION_KEY)
+    refresh_for_tags([FACETS_VERSION_KEY])
+
+
+def category_counts():
+    """{category: published post count}"""
+    key = f"blog_facets:{get_version(FACETS_VERSION_KEY)}"
+    counts = cache.get(key)
+    if counts is None:
+        counts = dict(
+            BlogCard.objects
+            .order_by()
+            .values_list('category')
+            .annotate(count=Count('blog'))
+        )
+        cache.set(key, counts, FACETS_TIMEOUT)
+    return counts
+
+
+def category_facets():
+    """Categories that have posts, in CATEGORY_CHOICES order"""
+    note_dependencies([FACETS_VERSION_KEY])
+    counts = category_counts()
+    return [
+        {'value': value, 'label': label, 'count': counts[value]}
+        for value, label in DynamicBlog.CATEGORY_CHOICES
+        if counts.get(value)
+    ]
@@ -0,0 +1,186 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import BlogNavigation, DynamicBlog
+from .page_cache import instance_tag
+from .related_blogs import apply_index, has_index, load_index, queue_related_blog
+from .site_snapshot import refresh_pages
+
+
+# =========================
+# BLOG NAVIGATION INDEX
+# =========================
+# Every published blog has a BlogNavigation row with its previous / next
+# post in (publish_date, id) order and 3 related posts. Related posts come
+# from the TF-IDF index (related_blogs.py) once it has been built, and are
+# the 3 newest posts of the same category until then.
+# Saving a blog only touches the rows around its old and new position and
+# the related posts of the blogs it can affect (re-scored by the worker).
+# The rows are written with queryset updates, so the pages of the posts
+# whose row changed are dropped here (navigation_changed).
+
+RELATED_COUNT = 3
+RELATED_FIELDS = ['related_blog_1', 'related_blog_2', 'related_blog_3']
+
+
+def _published():
+    return DynamicBlog.objects.filter(is_published=True)
+
+
+def navigation_changed(blog_ids):
+    """Drop the cached and snapshot detail pages of these posts"""
+    refresh_pages([instance_tag(BlogNavigation, blog_id) for blog_id in blog_ids])
+
+
+def _related_values(related_ids):
+    related_ids = list(related_ids)[:RELATED_COUNT]
+    related_ids += [None] * (RELATED_COUNT - len(related_ids))
+    return {f'{field}_id': blog_id for field, blog_id in zip(RELATED_FIELDS, related_ids)}
+
+
+def _neighbours(blog_id, publish_date):
+    """(previous_id, next_id) of a blog in (publish_date, id) order"""
+    previous_id = (
+        _published()
+        .filter(Q(publish_date__lt=publish_date) | Q(publish_date=publish_date, id__lt=blog_id))
+        .order_by('-publish_date', '-id')
+        .values_list('id', flat=True)
+        .first()
+    )
+    next_id = (
+        _published()
+        .filter(Q(publish_date__gt=publish_date) | Q(publish_date=publish_date, id__gt=blog_id))
+        .order_by('publish_date', 'id')
+        .values_list('id', flat=True)
+        .first()
+    )
+    return previous_id, next_id
+
+
+def _refresh_neighbours(blog_ids):
+    """Returns the ids whose previous / next post changed"""
+    current = {
+        blog_id: (previous_id, next_id)
+        for blog_id, previous_id, next_id in BlogNavigation.objects
+        .filter(blog_id__in=blog_ids)
+        .values_list('blog_id', 'previous_blog_id', 'next_blog_id')
+    }
+    changed = []
+    rows = _published().filter(id__in=blog_ids).values_list('id', 'publish_date')
+    for blog_id, publish_date in rows:
+        previous_id, next_id = _neighbours(blog_id, publish_date)
+        if current.get(blog_id) == (previous_id, next_id):
+            continue
+        BlogNavigation.objects.filter(blog_id=blog_id).update(
+            previous_blog_id=previous_id,
+            next_blog_id=next_id,
+        )
+        changed.append(blog_id)
+    return changed
+
+
+def _refresh_category(category):
+    """Rewrite related posts for every published blog of a category"""
+    navigation_changed(_published().filter(category=category).values_list('id', flat=True))
+    top = list(
+        _published()
+        .filter(category=category)
+        .order_by('-publish_date', '-id')
+        .values_list('id', flat=True)[:RELATED_COUNT + 1]
+    )
+    newest = top[:RELATED_COUNT]
+
+    # Everyone outside the newest 3 shares the same related posts
+    (
+        BlogNavigation.objects
+        .filter(blog__category=category, blog__is_published=True)
+        .exclude(blog_id__in=newest)
+        .update(**_related_values(newest))
+    )
+    for blog_id in newest:
+        BlogNavigation.objects.filter(blog_id=blog_id).update(
+            **_related_values(other for other in top if other != blog_id)
+        )
+
+
+def navigation_state(blog_id):
+    """What the index currently says about a blog (read before it changes)"""
+    return (
+        BlogNavigation.objects
+        .filter(blog_id=blog_id)
+        .values_list('blog__category', 'previous_blog_id', 'next_blog_id')
+        .first()
+    )
+
+
+@transaction.atomic
+def refresh_blog_navigation(blog, old_state=None, deleted=False):
+    """Bring the index up to date after `blog` was saved or deleted"""
+    affected = set()
+    categories = set()
+
+    if old_state:
+        old_category, old_previous_id, old_next_id = old_state
+        affected.update([old_previous_id, old_next_id])
+        categories.add(old_category)
+
+    if blog.is_published and not deleted:
+        previous_id, next_id = _neighbours(blog.pk, blog.publish_date)
+        # Queryset writes only: the blog's own save drops its page (pk
+        # tag); neighbours whose row changes are dropped below
+        # (navigation_changed)
+        values = {'previous_blog_id': previous_id, 'next_blog_id': next_id}
+        if not BlogNavigation.objects.filter(blog_id=blog.pk).update(**values):
+            BlogNavigation.objects.bulk_create([BlogNavigation(blog_id=blog.pk, **values)])
+        affected.update([previous_id, next_id])
+        categories.add(blog.category)
+    elif not deleted:
+        BlogNavigation.objects.filter(blog_id=blog.pk).delete()
+
+    affected.discard(None)
+    affected.discard(blog.pk)
+    navigation_changed(_refresh_neighbours(affected))
+    if has_index():
+        transaction.on_commit(partial(queue_related_blog, blog.pk))
+    else:
+        for category in categories:
+            _refresh_category(category)
+
+
+@transaction.atomic
+def rebuild_blog_navigation():
+    """Rebuild the whole index from scratch; returns the number of rows"""
+    rows = list(
+        _published()
+        .order_by('publish_date', 'id')
+        .values_list('id', 'category')
+    )
+
+    # Newest posts of each category, newest first
+    by_category = {}
+    for blog_id, category in reversed(rows):
+        newest = by_category.setdefault(category, [])
+        if len(newest) <= RELATED_COUNT:
+            newest.append(blog_id)
+
+    navigation = []
+    for position, (blog_id, category) in enumerate(rows):
+        previous_id = rows[position - 1][0] if position > 0 else None
+        next_id = rows[position + 1][0] if position + 1 < len(rows) else None
+        related = (other for other in by_category[category] if other != blog_id)
+        navigation.append(BlogNavigation(
+            blog_id=blog_id,
+            previous_blog_id=previous_id,
+            next_blog_id=next_id,
+            **_related_values(related),
+        ))
+
+    BlogNavigation.objects.all().delete()
+    BlogNavigation.objects.bulk_create(navigation, batch_size=1000)
+
+    index = load_index()
+    if index is not None:
+        apply_index(index)
+    return len(navigation)
@@ -0,0 +1,40 @@
+import time
+
+from django.core.cache import cache
+
+
+# =========================
+# VERSION COUNTERS
+# =========================
+# A version starts from the current time instead of 0/1 so that a counter
+# evicted from the cache never comes back with a value an old entry was
+# stored under.
+
+def _fresh_version():
+    return time.time_ns()
+
+
+def get_version(key):
+    """Current value of a version counter, creating it if missing"""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _fresh_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(keys):
+    """Current values of several version counters in one cache round trip"""
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            versions[key] = get_version(key)
+    return versions
+
+
+def bump_version(key):
+    """Invalidate everything stored under the current version"""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_version(), None)
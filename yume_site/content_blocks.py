@@ -0,0 +1,154 @@
+from .models import BlogBlock, ProjectBlock
+
+
+# =========================
+# CONTENT BLOCKS
+# =========================
+# Repeated items of the project / blog detail pages are ordered child rows
+# (ProjectBlock, BlogBlock) instead of numbered columns. The detail views
+# load them with one query and group them by kind; fallbacks and hidden
+# items are resolved here once, not with |default and {% if %} per item in
+# the templates.
+
+# New pages start with the same items the old column defaults gave them
+PROJECT_DEFAULT_BLOCKS = {
+    'partner': [
+        {'title': 'YuMe Learning', 'subtitle': 'Implementing Partner', 'icon': 'bi-building', 'color': 'primary'},
+        {'title': 'NASSCOM', 'subtitle': 'Knowledge Partner', 'icon': 'bi-shield-check', 'color': 'success'},
+        {'title': 'ITC', 'subtitle': 'CSR Partner', 'icon': 'bi-handshake', 'color': 'info'},
+    ],
+    'component': [
+        {'title': 'Technical Skills', 'subtitle': 'Programming & Development', 'icon': 'bi-code-slash', 'color': 'primary', 'text': 'Python Programming\nFull Stack Development\nData Analytics\nSQL Database Management\nReal Dataset Problem-solving'},
+        {'title': 'Hands-on Projects', 'subtitle': 'Practical Experience', 'icon': 'bi-laptop', 'color': 'success', 'text': 'Weekly Lab Sessions\nIndustry Mini-Projects\nCapstone Project\nTeam-based Simulations\nContinuous Assessment'},
+        {'title': 'Career Readiness', 'subtitle': 'Professional Development', 'icon': 'bi-briefcase', 'color': 'warning', 'text': 'Resume & Portfolio Building\nLinkedIn Optimization\nMock Interview Sessions\nProfessional Communication\nIndustry Networking'},
+    ],
+    'role_item': [
+        {'title': 'Program Delivery', 'subtitle': 'Training execution & management', 'icon': 'bi-gear', 'color': 'primary'},
+        {'title': 'Learner Engagement', 'subtitle': 'Student support & monitoring', 'icon': 'bi-people', 'color': 'success'},
+        {'title': 'Outcome Measurement', 'subtitle': 'Impact assessment & reporting', 'icon': 'bi-graph-up', 'color': 'info'},
+        {'title': 'Multi-region Implementation', 'subtitle': 'Statewide program coverage', 'icon': 'bi-geo-alt', 'color': 'warning'},
+    ],
+    'impact_metric': [
+        {'number': '5+', 'text': 'Regions'},
+        {'number': '50', 'text': 'Hours/Student'},
+    ],
+    'outcome': [
+        {'title': 'Skill Enhancement', 'value': 94, 'color': 'success'},
+        {'title': 'Employability', 'value': 89, 'color': 'warning'},
+        {'title': 'Student Satisfaction', 'value': 96, 'color': 'info'},
+    ],
+    'cert_feature': [
+        {'text': 'Technical Validation', 'icon': 'bi-check-circle', 'color': 'success'},
+        {'text': 'Employability Proof', 'icon': 'bi-person-check', 'color': 'primary'},
+        {'text': 'Industry Recognition', 'icon': 'bi-award', 'color': 'warning'},
+        {'text': 'Career Readiness Support', 'icon': 'bi-briefcase', 'color': 'info'},
+    ],
+    'support_feature': [
+        {'text': 'Industry Connect', 'icon': 'bi-building', 'color': 'info'},
+        {'text': 'Mock Interviews', 'icon': 'bi-chat-dots', 'color': 'warning'},
+        {'text': 'Mentorship', 'icon': 'bi-people', 'color': 'secondary'},
+        {'text': 'Career Guidance', 'icon': 'bi-graph-up', 'color': 'danger'},
+    ],
+    'partner_badge': [
+        {'title': 'YuMe Learning', 'icon': 'bi-building', 'color': 'primary'},
+        {'title': 'NASSCOM Foundation', 'icon': 'bi-shield-check', 'color': 'success'},
+        {'title': 'ITC', 'icon': 'bi-handshake', 'color': 'info'},
+    ],
+    'highlight': [
+        {'text': 'Industry-Aligned Curriculum', 'color': 'success'},
+        {'text': 'Hands-on Practical Experience', 'color': 'primary'},
+        {'text': 'Mentorship & Career Guidance', 'color': 'warning'},
+    ],
+}
+BLOG_DEFAULT_BLOCKS = {
+    'feature': [
+        {'title': 'Pivot Tables', 'icon': 'bi-table', 'text': 'Transform data into insights, create dynamic reports, and use slicers for interactive filtering.'},
+        {'title': 'Power Query', 'icon': 'bi-lightning-charge', 'text': 'Automate data cleaning, combine multiple sources, and create repeatable workflows.'},
+        {'title': 'Advanced Formulas', 'icon': 'bi-graph-up', 'text': 'Master INDEX-MATCH, XLOOKUP, dynamic arrays, and statistical functions.'},
+        {'title': 'Data Visualization', 'icon': 'bi-bar-chart', 'text': 'Create compelling charts and dashboards that communicate insights effectively.'},
+    ],
+    'application': [
+        {'text': 'Business Reporting: Create automated dashboards that update with new data'},
+        {'text': 'Financial Analysis: Build models with scenario analysis and forecasting'},
+        {'text': 'Sales Tracking: Analyze performance and predict future trends'},
+        {'text': 'Inventory Management: Track stock levels and optimize ordering'},
+        {'text': 'Project Management: Create Gantt charts and track project timelines'},
+    ],
+    'stat': [
+        {'number': '82%', 'text': 'Jobs require Excel'},
+        {'number': '35%', 'text': 'Higher productivity'},
+        {'number': '₹6-12L', 'text': 'Salary boost'},
+    ],
+    'course': [
+        {'title': 'Excel for Data Analysis', 'text': 'Learn powerful Excel tools for data analysis', 'link': '/courses/excel-data-analysis'},
+        {'title': 'Data Visualization', 'text': 'Create compelling visualizations', 'link': '/courses/data-visualization'},
+        {'title': 'SQL for Data Analysis', 'text': 'Extract and analyze data using SQL', 'link': '/courses/sql-data-analysis'},
+    ],
+}
+
+DEFAULT_BLOCKS = {**PROJECT_DEFAULT_BLOCKS, **BLOG_DEFAULT_BLOCKS}
+
+# Blank fields that show the default of the same position instead
+FALLBACK_FIELDS = {
+    'component': ('title', 'subtitle', 'text'),
+    'role_item': ('subtitle',),
+    'impact_metric': ('number', 'text'),
+    'feature': ('icon', 'text'),
+    'stat': ('text',),
+    'course': ('link',),
+}
+
+# Items are hidden while this field is blank
+REQUIRED_FIELD = {
+    'partner': 'title',
+    'role_item': 'title',
+    'outcome': 'title',
+    'cert_feature': 'text',
+    'support_feature': 'text',
+    'partner_badge': 'title',
+    'highlight': 'text',
+    'feature': 'title',
+    'application': 'text',
+    'stat': 'number',
+    'course': 'title',
+}
+
+
+def group_blocks(blocks):
+    """{kind: [visible blocks in order]} ready for the template"""
+    grouped = {}
+    for block in blocks:
+        defaults = DEFAULT_BLOCKS.get(block.kind, [])
+        fallback = defaults[block.order - 1] if 0 < block.order <= len(defaults) else {}
+        for field in FALLBACK_FIELDS.get(block.kind, ()):
+            if not getattr(block, field) and field in fallback:
+                setattr(block, field, fallback[field])
+
+        required = REQUIRED_FIELD.get(block.kind)
+        if required and not getattr(block, required):
+            continue
+
+        # List items (program components) split once here
+        block.items = [line.strip() for line in block.text.splitlines() if line.strip()]
+        grouped.setdefault(block.kind, []).append(block)
+    return grouped
+
+
+def _default_blocks(model, parent_field, parent, defaults):
+    return [
+        model(kind=kind, order=order, **{parent_field: parent}, **values)
+        for kind, items in defaults.items()
+        for order, values in enumerate(items, start=1)
+    ]
+
+
+def create_default_project_blocks(project_detail):
+    ProjectBlock.objects.bulk_create(
+        _default_blocks(ProjectBlock, 'project_detail', project_detail, PROJECT_DEFAULT_BLOCKS)
+    )
+
+
+def create_default_blog_blocks(blog):
+    BlogBlock.objects.bulk_create(
+        _default_blocks(BlogBlock, 'blog', blog, BLOG_DEFAULT_BLOCKS)
+    )
@@ -0,0 +1,144 @@
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from .cache_utils import get_version, bump_version
+from .models import (
+    Course, CourseHighlight, CurriculumMonth, CurriculumSection,
+    CurriculumTopic, CourseLearningOutcome, CourseTool,
+    CourseCertificationPoint, CourseFAQ, CourseCareerOpportunity
+)
+
+
+# Every model whose rows end up in a course snapshot
+COURSE_MODELS = (
+    Course, CourseHighlight, CurriculumMonth, CurriculumSection,
+    CurriculumTopic, CourseLearningOutcome, CourseTool,
+    CourseCertificationPoint, CourseFAQ, CourseCareerOpportunity,
+)
+
+
+# =========================
+# SNAPSHOT STRUCTURE
+# =========================
+# Plain namedtuples so the cached value is small, picklable and read-only.
+# Templates read them exactly like model instances ({{ course.title }}).
+
+Highlight = namedtuple("Highlight", ["icon_class", "title", "description"])
+Topic = namedtuple("Topic", ["title"])
+Section = namedtuple("Section", ["title", "topics"])
+Month = namedtuple("Month", ["id", "title", "subtitle", "meta_info", "badge_color", "sections"])
+Outcome = namedtuple("Outcome", ["title", "description", "color"])
+Tool = namedtuple("Tool", ["name", "description", "color"])
+CertificationPoint = namedtuple("CertificationPoint", ["text"])
+FAQ = namedtuple("FAQ", ["question", "answer"])
+CareerOpportunity = namedtuple("CareerOpportunity", ["title", "description", "tag", "icon_type"])
+
+CourseSnapshot = namedtuple("CourseSnapshot", [
+    "id", "title", "subtitle", "overview",
+    "duration", "total_hours", "level", "format",
+    "whatsapp_number", "contact_number", "course_url",
+    "highlights", "curriculum_months", "learning_outcomes", "tools",
+    "certification_points", "faqs", "career_opportunities",
+])
+
+
+VERSION_KEY = "course_snapshot:version"
+SNAPSHOT_TIMEOUT = 60 * 60 * 24
+
+
+def get_course_version():
+    """Current course version (bumped by signals on every course change)"""
+    return get_version(VERSION_KEY)
+
+
+def bump_course_version():
+    """Invalidate every cached course snapshot"""
+    bump_version(VERSION_KEY)
+
+
+def build_course_snapshot(course_url):
+    """Load the whole course page graph in a fixed number of queries"""
+    course = (
+        Course.objects
+        .filter(course_url=course_url, is_active=True)
+        .prefetch_related(
+            Prefetch(
+                "highlights",
+                queryset=CourseHighlight.objects.filter(is_active=True),
+            ),
+            Prefetch(
+                "curriculum_months",
+                queryset=CurriculumMonth.objects.filter(is_active=True),
+            ),
+            "curriculum_months__sections__topics",
+            "learning_outcomes",
+            "tools",
+            "certification_points",
+            "faqs",
+            "career_opportunities",
+        )
+        .first()
+    )
+    if course is None:
+        return None
+
+    return CourseSnapshot(
+        id=course.id,
+        title=course.title,
+        subtitle=course.subtitle,
+        overview=course.overview,
+        duration=course.duration,
+        total_hours=course.total_hours,
+        level=course.level,
+        format=course.format,
+        whatsapp_number=course.whatsapp_number,
+        contact_number=course.contact_number,
+        course_url=course.course_url,
+        highlights=tuple(
+            Highlight(h.icon_class, h.title, h.description)
+            for h in course.highlights.all()
+        ),
+        curriculum_months=tuple(
+            Month(
+                m.id, m.title, m.subtitle, m.meta_info, m.badge_color,
+                tuple(
+                    Section(s.title, tuple(Topic(t.title) for t in s.topics.all()))
+                    for s in m.sections.all()
+                ),
+            )
+            for m in course.curriculum_months.all()
+        ),
+        learning_outcomes=tuple(
+            Outcome(o.title, o.description, o.color)
+            for o in course.learning_outcomes.all()
+        ),
+        tools=tuple(
+            Tool(t.name, t.description, t.color)
+            for t in course.tools.all()
+        ),
+        certification_points=tuple(
+            CertificationPoint(p.text)
+            for p in course.certification_points.all()
+        ),
+        faqs=tuple(
+            FAQ(f.question, f.answer)
+            for f in course.faqs.all()
+        ),
+        career_opportunities=tuple(
+            CareerOpportunity(c.title, c.description, c.tag, c.icon_type)
+            for c in course.career_opportunities.all()
+        ),
+    )
+
+
+def get_course_snapshot(course_url):
+    """Cached course snapshot, or None if the course does not exist"""
+    key = f"course_snapshot:{get_course_version()}:{course_url}"
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_course_snapshot(course_url)
+        if snapshot is not None:
+            cache.set(key, snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
@@ -0,0 +1,215 @@
+import fcntl
+import hashlib
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.utils.functional import SimpleLazyObject
+from PIL import Image, ImageOps
+
+from .media_serving import clean_name, stat
+from .renditions import ENCODER_OPTIONS, has_alpha
+from .uploads import stored_target_size
+
+
+# =========================
+# ON-DEMAND IMAGE RESIZING
+# =========================
+# /img/<w>x<h>/media/<name> and /img/<w>x<h>/static/<path> return the image
+# shrunk to fit inside the box (never enlarged or cropped), for sizes the
+# fixed renditions do not cover: logos, portraits in static/. Only the
+# boxes in IMAGE_RESIZE_SIZES are rendered. Results are kept in
+# IMAGE_CACHE_ROOT, evicted least-recently-used beyond IMAGE_CACHE_MAX_BYTES;
+# one process/thread renders a missing entry while the others wait for it.
+
+SOURCE_KINDS = ("media", "static")
+
+# Output format by source extension; anything else (GIF, BMP...) becomes PNG
+OUTPUT_FORMATS = {".jpg": "jpeg", ".jpeg": "jpeg", ".png": "png", ".webp": "webp", ".avif": "avif"}
+
+# Bump to invalidate every cached entry (encoder settings changed...)
+CACHE_VERSION = 1
+
+# Eviction goes down to this share of the budget, so it does not run per write
+LOW_WATER = 0.9
+
+# Last-use times are only rewritten when older than this
+TOUCH_INTERVAL = 60
+
+LOCK_STRIPES = 256
+
+cache_storage = SimpleLazyObject(lambda: FileSystemStorage(location=str(settings.IMAGE_CACHE_ROOT)))
+
+
+def allowed_size(width, height):
+    return (width, height) in {tuple(size) for size in settings.IMAGE_RESIZE_SIZES}
+
+
+def resize_url(kind, name, width, height):
+    return f"/img/{width}x{height}/{kind}/{name}"
+
+
+def source_path(kind, name):
+    """Local path of a media/static source image, or None"""
+    name = clean_name(name)
+    if name is None or kind not in SOURCE_KINDS:
+        return None
+    if kind == "media":
+        try:
+            return default_storage.path(name) if stat(default_storage, name) else None
+        except NotImplementedError:
+            return None
+    # Collected copy in production, the app/project static dirs under runserver
+    if staticfiles_storage.exists(name):
+        return staticfiles_storage.path(name)
+    return finders.find(name)
+
+
+def cache_name(kind, name, width, height, size, mtime):
+    """Cached file for one source version and box: ab/ab12...ef.png"""
+    key = f"{CACHE_VERSION}:{kind}:{name}:{size}:{mtime}:{width}x{height}"
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    fmt = OUTPUT_FORMATS.get(PurePosixPath(name).suffix.lower(), "png")
+    return f"{digest[:2]}/{digest[:40]}.{fmt}"
+
+
+def render(path, box, destination):
+    """Write the image at `path`, shrunk to fit `box`, to `destination` atomically"""
+    with Image.open(path) as image:
+        fmt = OUTPUT_FORMATS.get(os.path.splitext(destination)[1], "png")
+        image.draft("RGB", stored_target_size(image, box))
+        image.load()
+        ImageOps.exif_transpose(image, in_place=True)
+        if image.mode in ("1", "P"):
+            image = image.convert("RGBA" if has_alpha(image) else "RGB")
+        image.thumbnail(box, Image.LANCZOS, reducing_gap=3.0)
+        if fmt == "jpeg" and image.mode != "RGB":
+            image = image.convert("RGB")
+
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        partial = f"{destination}.{uuid.uuid4().hex}.part"
+        try:
+            image.save(partial, fmt.upper(), **ENCODER_OPTIONS[fmt])
+            os.replace(partial, destination)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+
+@contextmanager
+def render_lock(name):
+    """
+    Exclusive lock for one cache entry across threads and worker processes.
+    Striped over LOCK_STRIPES files so lock files never pile up.
+    """
+    lock_dir = os.path.join(str(settings.IMAGE_CACHE_ROOT), ".locks")
+    os.makedirs(lock_dir, exist_ok=True)
+    stripe = int(PurePosixPath(name).stem[:8], 16) % LOCK_STRIPES
+    with open(os.path.join(lock_dir, f"{stripe:02x}.lock"), "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def touch(path):
+    """Record a use for LRU eviction in the atime, leaving the mtime (ETag) alone"""
+    try:
+        result = os.stat(path)
+    except FileNotFoundError:
+        return
+    now = time.time()
+    if now - result.st_atime > TOUCH_INTERVAL:
+        os.utime(path, (now, result.st_mtime))
+
+
+def cached_image(kind, name, width, height):
+    """Name of the cached resize in cache_storage, rendering it once if missing; None if no source"""
+    path = source_path(kind, name)
+    if path is None:
+        return None
+    source = os.stat(path)
+    cached = cache_name(kind, clean_name(name), width, height, source.st_size, int(source.st_mtime))
+    destination = cache_storage.path(cached)
+
+    if not os.path.exists(destination):
+        with render_lock(cached):
+            # Whoever held the lock may have rendered it meanwhile
+            if not os.path.exists(destination):
+                render(path, (width, height), destination)
+                usage.add(os.path.getsize(destination))
+                return cached
+    touch(destination)
+    return cached
+
+
+# =========================
+# LRU EVICTION
+# =========================
+
+def cache_entries(root):
+    """[(atime, size, path)] of every cached image"""
+    entries = []
+    for directory, subdirs, filenames in os.walk(root):
+        subdirs[:] = [name for name in subdirs if not name.startswith(".")]
+        for filename in filenames:
+            if filename.endswith(".part"):
+                continue
+            path = os.path.join(directory, filename)
+            try:
+                result = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((result.st_atime, result.st_size, path))
+    return entries
+
+
+def evict(root, budget):
+    """Delete least recently used entries until the cache is under LOW_WATER * budget"""
+    entries = sorted(cache_entries(root))
+    total = sum(size for atime, size, path in entries)
+    if total <= budget:
+        return total
+    for atime, size, path in entries:
+        if total <= budget * LOW_WATER:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+    return total
+
+
+class CacheUsage:
+    """
+    Per-process running total of the cache size. It only counts this
+    process's writes, so each eviction re-measures the directory.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.total = None
+
+    def add(self, size):
+        root = str(settings.IMAGE_CACHE_ROOT)
+        budget = settings.IMAGE_CACHE_MAX_BYTES
+        with self.lock:
+            if self.total is None:
+                # The first measurement already includes the new file
+                self.total = sum(size for atime, size, path in cache_entries(root))
+            else:
+                self.total += size
+            if self.total > budget:
+                self.total = evict(root, budget)
+
+
+usage = CacheUsage()
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template.utils import get_app_template_dirs
+
+
+# =========================
+# INLINE STYLE BUNDLES
+# =========================
+# Templates keep their <style> blocks as the source of truth. At build time
+# `manage.py bundle_inline_styles` minifies them into static CSS files
+# (blocks used by several templates go to shared files), and at load time
+# template_loaders.py swaps each run of blocks for <link>s to the
+# collected, manifest-hashed files, so the CSS is cached across pages.
+#
+# A run is a sequence of plain <style> blocks with nothing in between that
+# could render other CSS or skip one of them ({% block %}, {% include %},
+# {% if %}, ...). Its links take the place of its first block, so the
+# cascade order on the rendered page is unchanged. Blocks containing
+# template syntax or with attributes stay inline; <style data-critical>
+# stays inline minified, for above-the-fold rules.
+
+BUNDLE_DIR = "css/inline"
+
+STYLE_RE = re.compile(r"<style(?P<attrs>[^>]*)>(?P<css>.*?)</style\s*>", re.S | re.I)
+HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+COMMENT_TAG_RE = re.compile(r"{%\s*comment\b.*?%}.*?{%\s*endcomment\s*%}", re.S)
+VERBATIM_RE = re.compile(r"{%\s*verbatim\b.*?%}.*?{%\s*endverbatim\s*%}", re.S)
+TAG_RE = re.compile(r"{%\s*(\w+)")
+
+# Tags that neither render other templates nor make output conditional
+INERT_TAGS = {"url", "static", "load", "csrf_token", "now", "trans", "translate"}
+
+CRITICAL_ATTR = "data-critical"
+
+# Relative url()s resolve against the page inline but against the bundle
+# once extracted, so such blocks stay inline
+RELATIVE_URL_RE = re.compile(r"""url\(\s*(?!['"]?(?:data:|https?:|//|/|#))""", re.I)
+
+# Minifier: strings are kept verbatim, comments dropped
+CSS_TOKEN_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|(/\*.*?\*/)', re.S)
+SPACE_AROUND_RE = re.compile(r"\s*([{};,>])\s*")
+SPACE_AFTER_COLON_RE = re.compile(r":\s+")
+
+
+def minify_css(css):
+    """Whitespace/comment minification that never touches strings or selectors' descendant spaces"""
+    out = []
+    position = 0
+    for match in CSS_TOKEN_RE.finditer(css):
+        out.append(_squeeze(css[position:match.start()]))
+        if match.group(1):
+            out.append(match.group(1))
+        position = match.end()
+    out.append(_squeeze(css[position:]))
+    return "".join(out).strip()
+
+
+def _squeeze(text):
+    text = re.sub(r"\s+", " ", text)
+    text = SPACE_AROUND_RE.sub(r"\1", text)
+    return SPACE_AFTER_COLON_RE.sub(":", text).replace(";}", "}")
+
+
+def skipped_spans(source):
+    """(start, end) of regions that never render as markup: comments, verbatim"""
+    spans = []
+    for regex in (COMMENT_TAG_RE, VERBATIM_RE, HTML_COMMENT_RE):
+        spans.extend(match.span() for match in regex.finditer(source))
+    return spans
+
+
+def _inside(position, spans):
+    return any(start <= position < end for start, end in spans)
+
+
+def is_extractable(match):
+    css = match.group("css")
+    if match.group("attrs").strip() or RELATIVE_URL_RE.search(css):
+        return False
+    return "{%" not in css and "{{" not in css and "{#" not in css
+
+
+def is_critical(match):
+    attrs = match.group("attrs").strip()
+    css = match.group("css")
+    return attrs == CRITICAL_ATTR and "{%" not in css and "{{" not in css
+
+
+def _breaks_run(gap):
+    return any(tag not in INERT_TAGS for tag in TAG_RE.findall(gap))
+
+
+def style_blocks(source):
+    """<style> matches that render (not commented out)"""
+    spans = skipped_spans(source)
+    return [match for match in STYLE_RE.finditer(source) if not _inside(match.start(), spans)]
+
+
+def style_runs(source):
+    """
+    [[match, ...]] of consecutive extractable <style> blocks, plus the
+    critical blocks as [match]: everything the loader rewrites, in order
+    """
+    runs, current, previous_end = [], [], None
+    for match in style_blocks(source):
+        if current and (not is_extractable(match) or _breaks_run(source[previous_end:match.start()])):
+            runs.append(current)
+            current = []
+        if is_extractable(match):
+            current.append(match)
+        elif is_critical(match):
+            runs.append([match])
+        previous_end = match.end()
+    if current:
+        runs.append(current)
+    return runs
+
+
+def run_key(blocks):
+    """Identifies a run by its minified CSS, independent of template and position"""
+    return hashlib.sha256("\n".join(blocks).encode()).hexdigest()
+
+
+def rewrite_source(source, links_for):
+    """
+    Template source with each run replaced by the <link>s `links_for(key)`
+    returns (None keeps the run inline) and critical blocks minified
+    """
+    out = []
+    position = 0
+    for run in style_runs(source):
+        if is_critical(run[0]):
+            replacement = f"<style>{minify_css(run[0].group('css'))}</style>"
+        else:
+            links = links_for(run_key([minify_css(match.group("css")) for match in run]))
+            if links is None:
+                continue
+            replacement = "".join(f'<link rel="stylesheet" href="{url}">' for url in links)
+        # The links go where the run starts; later blocks just disappear
+        for index, match in enumerate(run):
+            out.append(source[position:match.start()])
+            if index == 0:
+                out.append(replacement)
+            position = match.end()
+    out.append(source[position:])
+    return "".join(out)
+
+
+def project_templates():
+    """{template name: path} of the project's own templates (not Django's or admin's)"""
+    base = Path(settings.BASE_DIR).resolve()
+    roots = [Path(directory) for engine in settings.TEMPLATES for directory in engine.get("DIRS", [])]
+    roots += [Path(directory) for directory in get_app_template_dirs("templates")]
+    templates = {}
+    for root in roots:
+        root = root.resolve()
+        if not root.is_dir() or base not in root.parents:
+            continue
+        for path in sorted(root.rglob("*.html")):
+            templates.setdefault(path.relative_to(root).as_posix(), path)
+    return templates
+
+
+# =========================
+# BUNDLE MAP (written by the build, read by the template loaders)
+# =========================
+_bundle_map = None
+
+
+def bundle_map():
+    """{run key: [static names]}; empty until `manage.py bundle_inline_styles` has run"""
+    global _bundle_map
+    if _bundle_map is None:
+        try:
+            with open(settings.INLINE_STYLES_MAP) as handle:
+                _bundle_map = json.load(handle)
+        except (OSError, ValueError):
+            _bundle_map = {}
+    return _bundle_map
+
+
+def bundle_links(key):
+    """URLs of the bundles of a run, or None to keep it inline"""
+    names = bundle_map().get(key)
+    if not names:
+        return None
+    try:
+        return [staticfiles_storage.url(name) for name in names]
+    except ValueError:
+        # Not collected (manifest storage), e.g. collectstatic has not run
+        return None
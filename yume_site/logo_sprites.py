@@ -0,0 +1,198 @@
+import hashlib
+import io
+import logging
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Q
+from PIL import Image, ImageOps, features
+
+from .models import LogoSpriteSheet, PlacementsSection
+from .storage import content_addressed_storage
+
+logger = logging.getLogger(__name__)
+
+
+# =========================
+# COMPANY LOGO SPRITE SHEETS
+# =========================
+# The placements page shows every active CompanyLogo of a section. Instead
+# of one request per logo, the logos are packed (in display order, so the
+# top of the grid comes from the first sheet) into a few sheets saved as
+# WebP and PNG. Each logo is then a <span> whose background is its cell,
+# positioned and sized in percentages so it scales with the logo box.
+# Sheets are rebuilt after any logo of the section is saved or deleted.
+
+# Each logo is shrunk to fit this cell: 2x the 35px-high logo box
+CELL_SIZE = (320, 80)
+# Transparent gap around each cell, so scaled neighbours never bleed in
+PADDING = 2
+SHEET_WIDTH = 1024
+MAX_SHEET_HEIGHT = 1024
+
+# Bump when the packing or encoding changes, to rebuild every sheet
+SPRITE_VERSION = 1
+
+# Logos are flat colour: a shared 256-colour palette (with alpha) stored
+# losslessly is a third of the size of lossless truecolour, and smaller
+# than lossy WebP without its ringing around text
+PALETTE_COLORS = 256
+WEBP_OPTIONS = {'lossless': True, 'method': 4}
+PNG_OPTIONS = {'optimize': True}
+
+
+def quantize(image):
+    """RGBA -> palette image; libimagequant when Pillow is built with it"""
+    method = (
+        Image.Quantize.LIBIMAGEQUANT if features.check('libimagequant') else Image.Quantize.FASTOCTREE
+    )
+    return image.quantize(PALETTE_COLORS, method=method)
+
+
+def active_logos(section):
+    return list(section.company_logos.filter(is_active=True).exclude(logo=''))
+
+
+def sprite_signature(logos):
+    parts = [str(SPRITE_VERSION), *(f"{logo.pk}:{logo.logo.name}" for logo in logos)]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def load_logo(logo):
+    """The logo as RGBA, shrunk to fit CELL_SIZE"""
+    with logo.logo.open('rb') as source, Image.open(source) as image:
+        image.draft('RGB', CELL_SIZE)
+        image = ImageOps.exif_transpose(image).convert('RGBA')
+    image.thumbnail(CELL_SIZE, Image.LANCZOS, reducing_gap=3.0)
+    return image
+
+
+def pack(sizes):
+    """
+    Shelf-pack (width, height) boxes in order.
+    Returns sheets as [[(item index, x, y), ...], ...] and their (width, height).
+    """
+    sheets, dimensions = [], []
+    placed, x, y, shelf, right = [], PADDING, PADDING, 0, 0
+    for index, (width, height) in enumerate(sizes):
+        if x + width + PADDING > SHEET_WIDTH:
+            x, y, shelf = PADDING, y + shelf + PADDING, 0
+        if y + height + PADDING > MAX_SHEET_HEIGHT and placed:
+            sheets.append(placed)
+            dimensions.append((right, y))
+            placed, x, y, shelf, right = [], PADDING, PADDING, 0, 0
+        placed.append((index, x, y))
+        x += width + PADDING
+        shelf = max(shelf, height)
+        right = max(right, x)
+    if placed:
+        sheets.append(placed)
+        dimensions.append((right, y + shelf + PADDING))
+    return sheets, dimensions
+
+
+def encode(image, fmt, options):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def build_logo_sprites(section, force=False):
+    """(Re)build the sprite sheets of a section; returns the sheet count, None if up to date"""
+    with transaction.atomic():
+        # Serialises concurrent rebuilds of one section
+        PlacementsSection.objects.select_for_update().filter(pk=section.pk).first()
+        logos = active_logos(section)
+        signature = sprite_signature(logos)
+        existing = LogoSpriteSheet.objects.filter(placements_section=section)
+        if not force and set(existing.values_list('signature', flat=True)) == ({signature} if logos else set()):
+            return None
+
+        images = []
+        for logo in logos:
+            try:
+                images.append((logo, load_logo(logo)))
+            except (OSError, ValueError, Image.DecompressionBombError):
+                # Left out of the sheet; the page shows it as a plain image
+                logger.exception("Could not add logo %s to the sprite sheet", logo.logo.name)
+
+        sheets, dimensions = pack([image.size for logo, image in images])
+        existing.delete()
+        for sheet_index, (placed, size) in enumerate(zip(sheets, dimensions)):
+            canvas = Image.new('RGBA', size, (0, 0, 0, 0))
+            positions = {}
+            for item, x, y in placed:
+                logo, image = images[item]
+                canvas.paste(image, (x, y))
+                positions[str(logo.pk)] = [x, y, *image.size]
+            palette = quantize(canvas)
+            LogoSpriteSheet.objects.create(
+                placements_section=section,
+                index=sheet_index,
+                signature=signature,
+                webp=content_addressed_storage.save(
+                    'sprites/logos.webp', encode(palette.convert('RGBA'), 'WEBP', WEBP_OPTIONS)
+                ),
+                png=content_addressed_storage.save('sprites/logos.png', encode(palette, 'PNG', PNG_OPTIONS)),
+                width=size[0],
+                height=size[1],
+                positions=positions,
+            )
+    return len(sheets)
+
+
+def rebuild_logo_sprites(section_id):
+    """on_commit hook: the section may have been deleted meanwhile"""
+    section = PlacementsSection.objects.filter(pk=section_id).first()
+    if section is not None:
+        build_logo_sprites(section)
+
+
+def release_sprite_file(name):
+    """Delete a replaced sheet file unless another sheet still uses it"""
+    if name and not LogoSpriteSheet.objects.filter(Q(webp=name) | Q(png=name)).exists():
+        content_addressed_storage.delete(name)
+
+
+# =========================
+# TEMPLATE DATA
+# =========================
+
+def percent(value):
+    return f"{value:.4f}".rstrip('0').rstrip('.') + '%'
+
+
+class LogoSprites:
+    """Sheets of one section as CSS rules and per-logo class names"""
+
+    def __init__(self, sheets):
+        self.cells = {}
+        rules = []
+        for sheet in sheets:
+            # Browsers without image-set() type() keep the PNG declaration
+            rules.append(
+                f'.logo-sprite-sheet-{sheet.index}{{background-image:url("{sheet.png.url}");'
+                f'background-image:image-set(url("{sheet.webp.url}") type("image/webp"),'
+                f'url("{sheet.png.url}") type("image/png"))}}'
+            )
+            for logo_id, (x, y, width, height) in sheet.positions.items():
+                # Percent positions: 0% aligns the cell's left edge with the
+                # box's, 100% its right edge, whatever the rendered size
+                free_x, free_y = sheet.width - width, sheet.height - height
+                rules.append(
+                    f'.logo-sprite-{logo_id}{{--ratio:{width / height:.4f};aspect-ratio:{width}/{height};'
+                    f'background-size:{percent(sheet.width / width * 100)} {percent(sheet.height / height * 100)};'
+                    f'background-position:{percent(x / free_x * 100 if free_x else 0)} '
+                    f'{percent(y / free_y * 100 if free_y else 0)}}}'
+                )
+                self.cells[int(logo_id)] = sheet.index
+        self.css = "".join(rules)
+
+    def __bool__(self):
+        return bool(self.cells)
+
+
+def logo_sprites_for(section):
+    if section is None:
+        return LogoSprites([])
+    return LogoSprites(LogoSpriteSheet.objects.filter(placements_section=section))
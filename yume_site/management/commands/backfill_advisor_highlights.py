@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from yume_site.models import Advisor
+
+
+class Command(BaseCommand):
+    help = "Store highlighted bio HTML for advisors saved before it was generated on save"
+
+    def handle(self, *args, **options):
+        advisors = list(Advisor.objects.all())
+        for advisor in advisors:
+            advisor.render_highlighted_bios()
+
+        Advisor.objects.bulk_update(advisors, list(Advisor.HIGHLIGHTED_FIELDS.values()))
+        self.stdout.write(self.style.SUCCESS(f"Highlighted {len(advisors)} advisor(s)"))
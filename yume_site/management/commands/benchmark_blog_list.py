@@ -0,0 +1,101 @@
+import datetime
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from yume_site.blog_cards import CARD_COLUMNS, rebuild_blog_cards
+from yume_site.blog_listing import PAGE_SIZE, blog_page
+from yume_site.models import BLOG_CARD_FIELDS, BlogCard, DynamicBlog
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the blog listing query on full DynamicBlog rows, the card-only "
+        "projection and the BlogCard table, then page one against a deep page. "
+        "Test posts are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=10000, help="Synthetic posts to add")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per query (median is shown)")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.add_posts(options["posts"])
+                rebuild_blog_cards()
+                self.report(options["repeat"])
+                self.report_pages(options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def add_posts(self, count):
+        start = datetime.date(2020, 1, 1)
+        # Model defaults fill the detail page columns with realistic text
+        DynamicBlog.objects.bulk_create(
+            [
+                DynamicBlog(
+                    title=f"Benchmark post {i}",
+                    slug=f"benchmark-post-{i}",
+                    excerpt="A short excerpt shown on the blog card. " * 3,
+                    featured_image=f"blog/featured_images/benchmark-{i}.jpg",
+                    publish_date=start + datetime.timedelta(days=i % 2000),
+                )
+                for i in range(count)
+            ],
+            batch_size=1000,
+        )
+
+    def report(self, repeat):
+        published = DynamicBlog.objects.published().order_by("display_order", "-publish_date")
+        full_fields = [field.attname for field in DynamicBlog._meta.concrete_fields]
+        cases = [
+            ("full rows", published, full_fields),
+            ("cards()", published.cards(), BLOG_CARD_FIELDS),
+            ("BlogCard", BlogCard.objects.order_by("listing_key"), ["blog_id"] + CARD_COLUMNS),
+        ]
+
+        self.stdout.write(f"{'query':<12}{'columns':>9}{'bytes/row':>12}{'median ms':>12}")
+        for label, queryset, fields in cases:
+            rows = list(queryset.all())
+            timings = self.time(repeat, lambda: list(queryset.all()))
+
+            # Width of the fetched values as Python sees them
+            values = queryset.values_list(*fields)
+            total = sum(len(str(value)) for row in values for value in row if value is not None)
+            width = total // max(len(rows), 1)
+            self.stdout.write(
+                f"{label:<12}{len(fields):>9}{width:>12}{statistics.median(timings):>12.1f}"
+            )
+
+    def report_pages(self, repeat):
+        # Cursor of the card just before the last full page
+        keys = BlogCard.objects.order_by("listing_key").values_list("listing_key", flat=True)
+        total = keys.count()
+        deep_offset = max(total - PAGE_SIZE - 1, 0)
+        deep_cursor = keys[deep_offset - 1] if deep_offset else None
+        cards = BlogCard.objects.order_by("listing_key")
+
+        cases = [
+            ("page 1", lambda: blog_page()),
+            ("last page (cursor)", lambda: blog_page(after=deep_cursor)),
+            ("last page (OFFSET)", lambda: list(cards[deep_offset:deep_offset + PAGE_SIZE + 1])),
+        ]
+        self.stdout.write(f"\n{'page':<20}{'median ms':>12}")
+        for label, run in cases:
+            self.stdout.write(f"{label:<20}{statistics.median(self.time(repeat, run)):>12.2f}")
+
+    def time(self, repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
@@ -0,0 +1,70 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+
+# The project's fast-path middleware and the Django classes they extend
+STOCK_MIDDLEWARE = {
+    "yume_site.middleware.SessionMiddleware": "django.contrib.sessions.middleware.SessionMiddleware",
+    "yume_site.middleware.AuthenticationMiddleware": "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "yume_site.middleware.MessageMiddleware": "django.contrib.messages.middleware.MessageMiddleware",
+}
+
+# Would answer before the stack under test when a snapshot exists
+SKIPPED = ("yume_site.middleware.SiteSnapshotMiddleware",)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time anonymous GETs of a public page through the stock middleware stack "
+        "and through the session-less fast path (per request, page cache warm)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="/", help="Public page to request")
+        parser.add_argument("--requests", type=int, default=2000, help="Requests per stack")
+
+    def handle(self, *args, **options):
+        current = [path for path in settings.MIDDLEWARE if path not in SKIPPED]
+        stacks = [
+            ("stock stack", [STOCK_MIDDLEWARE.get(path, path) for path in current]),
+            ("fast path", current),
+        ]
+        host = settings.ALLOWED_HOSTS[0].lstrip(".") if settings.ALLOWED_HOSTS else ""
+        factory = RequestFactory(HTTP_HOST=host if host and host != "*" else "localhost")
+
+        self.stdout.write(f"{'stack':<14}{'median us':>11}{'mean us':>10}{'queries':>9}  Vary")
+        medians = {}
+        for label, middleware in stacks:
+            with override_settings(MIDDLEWARE=middleware):
+                handler = BaseHandler()
+                handler.load_middleware()
+                for _ in range(20):
+                    # Fills the page cache and any lazy imports
+                    handler.get_response(factory.get(options["url"]))
+
+                with CaptureQueriesContext(connection) as queries:
+                    response = handler.get_response(factory.get(options["url"]))
+                timings = []
+                for _ in range(options["requests"]):
+                    request = factory.get(options["url"])
+                    started = time.perf_counter()
+                    handler.get_response(request)
+                    timings.append((time.perf_counter() - started) * 1_000_000)
+
+            medians[label] = statistics.median(timings)
+            self.stdout.write(
+                f"{label:<14}{medians[label]:>11.1f}{statistics.mean(timings):>10.1f}"
+                f"{len(queries):>9}  {response.get('Vary', '-')}"
+            )
+
+        saved = medians["stock stack"] - medians["fast path"]
+        self.stdout.write(self.style.SUCCESS(
+            f"Fast path saves {saved:.1f} us per request "
+            f"({saved / medians['stock stack'] * 100:.0f}% of the median)"
+        ))
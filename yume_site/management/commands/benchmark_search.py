@@ -0,0 +1,89 @@
+import itertools
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from yume_site.models import SearchDocument
+from yume_site.search import matching_ids, search_site
+
+
+class Rollback(Exception):
+    pass
+
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "zen", "dar", "pol", "qui"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Time site search and admin search queries against synthetic search "
+        "documents. The documents are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--docs", type=int, default=100000, help="Synthetic documents to add")
+        parser.add_argument("--words", type=int, default=120, help="Words per document body")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per query (median is shown)")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                vocabulary = self.add_documents(options["docs"], options["words"])
+                self.report(vocabulary, options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def add_documents(self, count, words):
+        # Zipf-like word frequencies, like real text
+        vocabulary = ["".join(parts) for parts in itertools.product(SYLLABLES, repeat=3)]
+        weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+        rng = random.Random(0)
+        first_id = (SearchDocument.objects.aggregate(Max("object_id"))["object_id__max"] or 0) + 1
+
+        started = time.perf_counter()
+        for start in range(0, count, 1000):
+            SearchDocument.objects.bulk_create([
+                SearchDocument(
+                    kind="blog",
+                    object_id=first_id + i,
+                    title=" ".join(rng.choices(vocabulary, weights, k=6)),
+                    url=f"/benchmark/{i}/",
+                    body=" ".join(rng.choices(vocabulary, weights, k=words)),
+                )
+                for i in range(start, min(start + 1000, count))
+            ])
+        self.stdout.write(f"Indexed {count} documents in {time.perf_counter() - started:.1f}s")
+        return vocabulary
+
+    def report(self, vocabulary, repeat):
+        queries = [
+            ("common word", vocabulary[0]),
+            ("mid word", vocabulary[100]),
+            ("rare word", vocabulary[-1]),
+            ("two words", f"{vocabulary[3]} {vocabulary[40]}"),
+            ("prefix", vocabulary[50][:4]),
+        ]
+
+        self.stdout.write(f"{'query':<14}{'site ms':>10}{'admin ms':>10}")
+        for label, query in queries:
+            site = self.median(repeat, lambda: search_site(query))
+            admin = self.median(repeat, lambda: list(
+                SearchDocument.objects
+                .filter(kind="blog", object_id__in=matching_ids("blog", query))
+                .order_by("-id")
+                .values_list("id", flat=True)[:100]
+            ))
+            self.stdout.write(f"{label:<14}{site:>10.1f}{admin:>10.1f}")
+
+    def median(self, repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from yume_site.logo_sprites import build_logo_sprites
+from yume_site.models import PlacementsSection
+
+
+class Command(BaseCommand):
+    help = "Pack the active company logos of every placements section into sprite sheets"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Rebuild sheets that are up to date")
+
+    def handle(self, *args, **options):
+        built = 0
+        for section in PlacementsSection.objects.all():
+            sheets = build_logo_sprites(section, force=options["force"])
+            if sheets is not None:
+                built += 1
+                self.stdout.write(f"{section}: {sheets} sheet(s)")
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the logo sprites of {built} section(s)"))
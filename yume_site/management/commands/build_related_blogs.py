@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from yume_site.related_blogs import rebuild_related_blogs
+
+
+class Command(BaseCommand):
+    help = "Build the TF-IDF index and store the top related posts of every published blog"
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        index = rebuild_related_blogs()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {len(index.ids)} blog(s), {len(index.terms)} terms "
+            f"in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,110 @@
+import json
+import shutil
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from yume_site.inline_styles import (
+    BUNDLE_DIR, is_critical, minify_css, project_templates, rewrite_source, run_key, style_blocks,
+    style_runs,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Minify the <style> blocks of the project templates into static CSS bundles "
+        "(shared between templates where identical) and write the map the template "
+        "loaders use to link them. Run before collectstatic."
+    )
+
+    def handle(self, *args, **options):
+        sources = {name: path.read_text(encoding="utf-8") for name, path in project_templates().items()}
+        self.runs = runs = {
+            name: [[minify_css(match.group("css")) for match in run] for run in style_runs(source) if not is_critical(run[0])]
+            for name, source in sources.items()
+        }
+        used_by = defaultdict(set)
+        for name, template_runs in runs.items():
+            for run in template_runs:
+                for css in run:
+                    used_by[css].add(name)
+
+        output = Path(settings.INLINE_STYLES_BUILD_DIR) / BUNDLE_DIR
+        shutil.rmtree(output, ignore_errors=True)
+        output.mkdir(parents=True)
+
+        mapping, files = {}, {}
+        for name, template_runs in runs.items():
+            slug = name.rsplit(".", 1)[0].replace("/", "-")
+            for run in template_runs:
+                key = run_key(run)
+                if key in mapping:
+                    continue
+                mapping[key] = [
+                    self.write_bundle(output, files, slug, blocks, len(used_by[blocks[0]]) > 1)
+                    for blocks in self.segments(run, used_by)
+                ]
+
+        with open(settings.INLINE_STYLES_MAP, "w") as handle:
+            json.dump(mapping, handle, indent=0, sort_keys=True)
+
+        self.report(sources, mapping, files, used_by)
+
+    def segments(self, run, used_by):
+        """
+        Split a run into files: consecutive blocks used by the same templates
+        share one; a block with @import starts a new one (only valid on top)
+        """
+        segments = []
+        for css in run:
+            if segments and used_by[css] == used_by[segments[-1][0]] and "@import" not in css:
+                segments[-1].append(css)
+            else:
+                segments.append([css])
+        return segments
+
+    def write_bundle(self, output, files, slug, blocks, shared):
+        css = "\n".join(blocks)
+        if shared:
+            filename = f"shared-{run_key(blocks)[:10]}.css"
+        else:
+            filename = f"{slug}.css"
+            counter = 2
+            while f"{BUNDLE_DIR}/{filename}" in files:
+                filename = f"{slug}-{counter}.css"
+                counter += 1
+        name = f"{BUNDLE_DIR}/{filename}"
+        if name not in files:
+            (output / filename).write_text(css, encoding="utf-8")
+            files[name] = css
+        return name
+
+    def report(self, sources, mapping, files, used_by):
+        def links(key):
+            names = mapping.get(key)
+            return [f"{settings.STATIC_URL}{name}" for name in names] if names else None
+
+        saved_total = 0
+        rows = []
+        for name, source in sorted(sources.items()):
+            before = len(source.encode())
+            after = len(rewrite_source(source, links).encode())
+            if before != after:
+                rows.append((before - after, name, before, after))
+                saved_total += before - after
+        for saved, name, before, after in sorted(rows, reverse=True):
+            self.stdout.write(f"  {name:45} {before / 1024:7.1f} KB -> {after / 1024:6.1f} KB  (-{saved / 1024:.1f} KB)")
+
+        shared = sum(1 for name in files if name.rsplit("/", 1)[-1].startswith("shared-"))
+        blocks = sum(len(style_blocks(source)) for source in sources.values())
+        extracted = sum(len(run) for runs in self.runs.values() for run in runs)
+        self.stdout.write(
+            f"{blocks} <style> block(s): {extracted} extracted ({len(used_by)} distinct) into "
+            f"{len(files)} bundle(s), {shared} shared, {sum(len(css.encode()) for css in files.values()) / 1024:.1f} KB "
+            f"minified; {blocks - extracted} kept inline (template syntax, attributes)"
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Template HTML {saved_total / 1024:.1f} KB smaller across {len(rows)} template(s)"
+        ))
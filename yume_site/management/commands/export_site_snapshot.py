@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from yume_site.site_snapshot import export_site, refresh_urls, snapshot_root
+
+
+class Command(BaseCommand):
+    help = "Prerender public pages into SITE_SNAPSHOT_ROOT (served by SiteSnapshotMiddleware)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            action="append",
+            dest="urls",
+            help="Only re-render this URL (can be given more than once)",
+        )
+
+    def handle(self, *args, **options):
+        if not snapshot_root():
+            raise CommandError("SITE_SNAPSHOT_ROOT is not set")
+
+        if options["urls"]:
+            results = refresh_urls(options["urls"])
+        else:
+            results = export_site()
+
+        written = 0
+        total_bytes = 0
+        for url, size in results:
+            if size is None:
+                self.stdout.write(f"  skipped  {url}")
+            else:
+                written += 1
+                total_bytes += size
+                self.stdout.write(f"  {size:>8}  {url}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} pages ({total_bytes // 1024} KB) to {snapshot_root()}"
+        ))
@@ -0,0 +1,64 @@
+import logging
+import signal
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections
+
+from yume_site.submissions import FLUSH_BATCH, flush_submissions, journal
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move journaled contact, enquiry and enrollment submissions into the "
+        "database in batches. Runs until stopped unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=FLUSH_BATCH, help="Submissions per bulk insert")
+        parser.add_argument("--poll", type=float, default=1.0, help="Seconds between journal checks")
+        parser.add_argument("--once", action="store_true", help="Exit when the journal is empty")
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        # Finish the current batch and drain the journal before exiting
+        signal.signal(signal.SIGTERM, self.stop)
+
+        pending, failed = journal.counts()
+        if pending or failed:
+            self.stdout.write(f"Journal holds {pending} pending and {failed} failed submission(s)")
+
+        while True:
+            # The database may have dropped the connection while idle
+            close_old_connections()
+            try:
+                flushed, rejected = flush_submissions(options["batch"])
+            except Exception as exc:
+                # Nothing may stop the flusher while the site keeps
+                # acknowledging submissions: report and retry
+                if isinstance(exc, DatabaseError):
+                    self.stderr.write(f"Database unavailable, keeping submissions journaled: {exc}")
+                elif isinstance(exc, sqlite3.Error):
+                    # e.g. "database is locked" past the journal's busy timeout
+                    self.stderr.write(f"Journal unavailable, retrying: {exc}")
+                else:
+                    logger.exception("Flushing form submissions failed")
+                if options["once"]:
+                    raise
+                time.sleep(options["poll"])
+                continue
+
+            if flushed:
+                self.stdout.write(self.style.SUCCESS(f"Flushed {flushed} submission(s)"))
+            if rejected:
+                self.stderr.write(f"Set aside {rejected} rejected submission(s) in the journal")
+            if flushed + rejected < options["batch"]:
+                if options["once"] or self.stopping:
+                    return
+                time.sleep(options["poll"])
+
+    def stop(self, signum, frame):
+        self.stopping = True
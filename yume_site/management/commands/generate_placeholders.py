@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from yume_site.models import ImagePlaceholder
+from yume_site.renditions import render_placeholder, source_names, store_placeholder
+
+
+class Command(BaseCommand):
+    help = "Compute blurred previews and dominant colours for uploaded images that have none yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true", help="Recompute images that already have a placeholder"
+        )
+
+    def handle(self, *args, **options):
+        names = source_names()
+        if not options["force"]:
+            done = set(ImagePlaceholder.objects.values_list("source", flat=True))
+            names = [name for name in names if name not in done]
+
+        count = 0
+        for name in names:
+            try:
+                store_placeholder(name, render_placeholder(name))
+                count += 1
+            except OSError as exc:
+                self.stderr.write(f"Skipped {name}: {exc}")
+        self.stdout.write(self.style.SUCCESS(f"Stored {count} placeholder(s)"))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from yume_site.models import ImageRendition
+from yume_site.renditions import generate_renditions, source_names
+
+
+class Command(BaseCommand):
+    help = "Generate responsive renditions for uploaded images that have none yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true", help="Regenerate images that already have renditions"
+        )
+
+    def handle(self, *args, **options):
+        names = source_names()
+        if not options["force"]:
+            done = set(ImageRendition.objects.order_by().values_list("source", flat=True).distinct())
+            names = [name for name in names if name not in done]
+
+        images = files = 0
+        for name in names:
+            try:
+                files += generate_renditions(name)
+                images += 1
+            except OSError as exc:
+                self.stderr.write(f"Skipped {name}: {exc}")
+        self.stdout.write(self.style.SUCCESS(f"Generated {files} rendition(s) for {images} image(s)"))
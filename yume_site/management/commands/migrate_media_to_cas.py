@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from yume_site.models import BlogCard, ImagePlaceholder, ImageRendition, RenditionJob
+from yume_site.renditions import IMAGE_FIELDS, source_names
+from yume_site.storage import content_addressed_storage, content_name, file_digest, is_content_addressed
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy uploaded images to content-addressed names (identical files are stored once) "
+        "and rewrite the image paths in the database. The old files are left in place, "
+        "cached pages and snapshots may still link to them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would change")
+
+    def handle(self, *args, **options):
+        storage = content_addressed_storage
+        mapping = {}
+        sizes = {}
+        for name in source_names():
+            if is_content_addressed(name):
+                continue
+            if not storage.exists(name):
+                self.stderr.write(f"Missing: {name}")
+                continue
+            with storage.open(name) as source:
+                if options["dry_run"]:
+                    mapping[name] = content_name(name, file_digest(source))
+                else:
+                    mapping[name] = storage.save(name, source)
+            sizes[mapping[name]] = storage.size(name)
+
+        duplicates = len(mapping) - len(sizes)
+        saved = sum(storage.size(name) for name in mapping) - sum(sizes.values())
+        self.stdout.write(
+            f"{len(mapping)} file(s) -> {len(sizes)} content-addressed file(s), "
+            f"{duplicates} duplicate(s), {saved / 1024:.0f} KB saved"
+        )
+        if options["dry_run"]:
+            for old, new in sorted(mapping.items()):
+                self.stdout.write(f"  {old} -> {new}")
+            return
+
+        with transaction.atomic():
+            rows = self.rewrite_paths(mapping)
+            self.rekey_derived(mapping)
+        self.stdout.write(self.style.SUCCESS(f"Rewrote {rows} image path(s)"))
+
+    def rewrite_paths(self, mapping):
+        # Queryset updates: no signals, nothing is re-downsized or released
+        rows = 0
+        for model, field_name in IMAGE_FIELDS + [(BlogCard, "featured_image")]:
+            for old, new in mapping.items():
+                rows += model.objects.filter(**{field_name: old}).update(**{field_name: new})
+        return rows
+
+    def rekey_derived(self, mapping):
+        """Renditions of the first copy follow it; those of duplicates are dropped"""
+        for old, new in mapping.items():
+            for model in (ImageRendition, ImagePlaceholder, RenditionJob):
+                if model.objects.filter(source=new).exists():
+                    model.objects.filter(source=old).delete()
+                else:
+                    model.objects.filter(source=old).update(source=new)
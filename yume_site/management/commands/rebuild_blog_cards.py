@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from yume_site.blog_cards import rebuild_blog_cards
+
+
+class Command(BaseCommand):
+    help = "Rebuild the narrow blog card rows used by the blog listing page"
+
+    def handle(self, *args, **options):
+        count = rebuild_blog_cards()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} blog card(s)"))
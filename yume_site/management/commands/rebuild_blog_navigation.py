@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from yume_site.blog_navigation import rebuild_blog_navigation
+
+
+class Command(BaseCommand):
+    help = "Rebuild previous / next / related posts for every published blog"
+
+    def handle(self, *args, **options):
+        count = rebuild_blog_navigation()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt navigation for {count} blog(s)"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from yume_site.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the site search documents for every course, blog and project"
+
+    def handle(self, *args, **options):
+        count = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} search document(s)"))
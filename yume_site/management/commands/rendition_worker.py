@@ -0,0 +1,95 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from yume_site.related_blogs import refresh_pending_related
+from yume_site.rendition_jobs import claim_jobs, fail_job, finish_job, release_stale_jobs
+from yume_site.renditions import render_renditions
+from yume_site.site_snapshot import refresh_pending
+
+
+def init_process():
+    # Encoding yields the CPU to gunicorn on a shared machine
+    os.nice(10)
+    if not apps.ready:
+        django.setup()
+
+
+class Command(BaseCommand):
+    help = (
+        "Process queued image rendition jobs in a pool of worker processes, "
+        "re-score queued related posts and re-render queued site snapshot pages. "
+        "Runs until stopped unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+            help="Images encoded at the same time (default: half the CPUs)",
+        )
+        parser.add_argument("--poll", type=float, default=5.0, help="Seconds between queue checks")
+        parser.add_argument("--once", action="store_true", help="Exit when no job is due")
+
+    def handle(self, *args, **options):
+        released = release_stale_jobs()
+        if released:
+            self.stdout.write(f"Re-queued {released} stale job(s)")
+
+        # A crashed child breaks the pool: fail its jobs and start a new one
+        while not self.run_pool(options):
+            self.stderr.write("Worker process died, restarting the pool")
+
+    def run_pool(self, options):
+        """Returns True once done (--once), False if the pool broke"""
+        workers = options["workers"]
+        # Forked children must not share the parent's database sockets
+        connections.close_all()
+        running = {}
+        with ProcessPoolExecutor(workers, initializer=init_process) as pool:
+            while True:
+                if len(running) < workers:
+                    for job_id, source in claim_jobs(workers - len(running)):
+                        running[pool.submit(render_renditions, source)] = (job_id, source)
+
+                # Blogs saved in the admin, before their pages are re-rendered
+                rescored = refresh_pending_related()
+                if rescored:
+                    self.stdout.write(self.style.SUCCESS(f"Re-scored related posts of {rescored} blog(s)"))
+
+                # Pages taken out of the snapshot by admin saves and finished jobs
+                refreshed = refresh_pending()
+                if refreshed:
+                    self.stdout.write(self.style.SUCCESS(f"Re-rendered {len(refreshed)} snapshot page(s)"))
+
+                if not running:
+                    if options["once"]:
+                        return True
+                    time.sleep(options["poll"])
+                    continue
+
+                done, _ = wait(running, timeout=options["poll"], return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    job_id, source = running.pop(future)
+                    try:
+                        rows, placeholder = future.result()
+                    except BrokenProcessPool as exc:
+                        broken = True
+                        fail_job(job_id, f"Worker process died: {exc}")
+                    except Exception as exc:
+                        job = fail_job(job_id, f"{type(exc).__name__}: {exc}")
+                        self.stderr.write(f"{source}: {job.last_error} ({job.get_status_display().lower()})")
+                    else:
+                        finish_job(job_id, source, rows, placeholder)
+                        self.stdout.write(self.style.SUCCESS(f"{source}: {len(rows)} rendition(s)"))
+
+                if broken:
+                    for job_id, source in running.values():
+                        fail_job(job_id, "Worker process died")
+                    return False
@@ -0,0 +1,108 @@
+import os
+import shutil
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from yume_site.media_files import duplicate_groups, media_files, referenced_names
+from yume_site.media_serving import ENCODINGS
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare MEDIA_ROOT with the file paths stored in the database: report orphaned "
+        "files, duplicates and missing files, and optionally quarantine or delete the orphans."
+    )
+
+    def add_arguments(self, parser):
+        action = parser.add_mutually_exclusive_group()
+        action.add_argument("--quarantine", action="store_true", help="Move orphans to --quarantine-dir")
+        action.add_argument("--delete", action="store_true", help="Delete orphans")
+        parser.add_argument("--dry-run", action="store_true", help="Show what --quarantine/--delete would do")
+        parser.add_argument(
+            "--quarantine-dir", default=str(settings.BASE_DIR / "media_quarantine"),
+            help="Where --quarantine moves orphans (default: media_quarantine/ next to media/)",
+        )
+        parser.add_argument(
+            "--min-age", type=float, default=1.0,
+            help="Hours a file must be unchanged before it counts as orphaned (default: 1)",
+        )
+        parser.add_argument("--workers", type=int, default=8, help="Threads hashing files")
+        parser.add_argument("--verbose-list", action="store_true", help="List every file in each section")
+
+    def handle(self, *args, **options):
+        root = str(settings.MEDIA_ROOT)
+        if not os.path.isdir(root):
+            raise CommandError(f"MEDIA_ROOT {root} does not exist")
+
+        started = time.perf_counter()
+        files = media_files(root)
+        referenced = referenced_names()
+        cutoff = time.time() - options["min_age"] * 3600
+
+        # Precompressed .br/.gz copies belong to the file they compress
+        suffixes = tuple(suffix for encoding, suffix in ENCODINGS)
+        orphans = sorted(
+            name for name, (size, mtime) in files.items()
+            if name not in referenced and mtime < cutoff
+            and not (name.endswith(suffixes) and os.path.splitext(name)[0] in referenced)
+        )
+        missing = sorted(name for name in referenced if name not in files)
+        duplicates = duplicate_groups(root, files, options["workers"])
+
+        total = sum(size for size, mtime in files.values())
+        orphan_bytes = sum(files[name][0] for name in orphans)
+        duplicate_bytes = sum(files[group[0]][0] * (len(group) - 1) for group in duplicates)
+
+        self.stdout.write(
+            f"{len(files)} file(s), {self.mb(total)} in {root} "
+            f"(scanned in {time.perf_counter() - started:.1f}s)"
+        )
+        self.section(f"Orphaned: {len(orphans)} file(s), {self.mb(orphan_bytes)}", orphans, options)
+        self.section(f"Missing: {len(missing)} referenced file(s)", missing, options)
+        self.section(
+            f"Duplicates: {len(duplicates)} group(s), {self.mb(duplicate_bytes)} redundant",
+            [" = ".join(group) for group in duplicates], options,
+        )
+        if duplicates:
+            self.stdout.write("  (`manage.py migrate_media_to_cas` stores referenced duplicates once)")
+
+        if options["quarantine"] or options["delete"]:
+            self.remove(root, orphans, options)
+
+    def section(self, title, names, options):
+        self.stdout.write(f"\n{title}")
+        shown = names if options["verbose_list"] else names[:20]
+        for name in shown:
+            self.stdout.write(f"  {name}")
+        if len(names) > len(shown):
+            self.stdout.write(f"  ... {len(names) - len(shown)} more (--verbose-list)")
+
+    def remove(self, root, orphans, options):
+        verb = "Quarantined" if options["quarantine"] else "Deleted"
+        target = os.path.join(options["quarantine_dir"], timezone.now().strftime("%Y%m%d-%H%M%S"))
+        if options["dry_run"]:
+            destination = f" to {target}" if options["quarantine"] else ""
+            self.stdout.write(f"\nDry run: {verb.lower()} nothing, {len(orphans)} orphan(s) would go{destination}")
+            return
+
+        for name in orphans:
+            path = os.path.join(root, name)
+            if options["quarantine"]:
+                destination = os.path.join(target, name)
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                shutil.move(path, destination)
+            else:
+                os.remove(path)
+        self.prune_empty_dirs(root)
+        self.stdout.write(self.style.SUCCESS(f"\n{verb} {len(orphans)} orphan(s)"))
+
+    def prune_empty_dirs(self, root):
+        for directory, subdirs, filenames in os.walk(root, topdown=False):
+            if directory != root and not os.listdir(directory):
+                os.rmdir(directory)
+
+    def mb(self, size):
+        return f"{size / (1024 * 1024):.1f} MB"
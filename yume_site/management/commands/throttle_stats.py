@@ -0,0 +1,20 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from yume_site.throttling import counter_key, throttled_counts
+
+
+class Command(BaseCommand):
+    help = "Show how many form POSTs were throttled, per form and key kind, since the deploy."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the counters after showing them")
+
+    def handle(self, *args, **options):
+        counts = throttled_counts()
+        self.stdout.write(f"{'form':<14}{'key':<10}{'throttled':>10}")
+        for (endpoint, kind), count in counts.items():
+            self.stdout.write(f"{endpoint:<14}{kind:<10}{count:>10}")
+        if options["reset"]:
+            cache.delete_many([counter_key(*name) for name in counts])
+            self.stdout.write(self.style.SUCCESS("Counters reset"))
@@ -0,0 +1,140 @@
+import datetime
+import hashlib
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db import models
+from django.utils import timezone
+
+from .models import ImagePlaceholder, ImageRendition, RenditionJob
+from .renditions import IMAGE_FIELDS
+from .storage import content_addressed_storage
+
+
+# =========================
+# MEDIA REFERENCE COUNTING
+# =========================
+# A stored image may be shared by several rows (content-addressed names
+# deduplicate identical uploads), so a replaced or deleted image is only
+# removed, with its renditions, once no image field points at it.
+
+# Files written or deduplicated this recently may have a reference in a
+# transaction that has not committed yet; the orphan scan removes them later
+RECENT_WRITE_GRACE = datetime.timedelta(hours=1)
+
+
+def reference_count(name):
+    """Rows across every image field that point at the stored image `name`"""
+    return sum(
+        model.objects.filter(**{field_name: name}).count()
+        for model, field_name in IMAGE_FIELDS
+    )
+
+
+def delete_derived(name):
+    """Drop the renditions, placeholder and job of a stored image"""
+    renditions = ImageRendition.objects.filter(source=name)
+    for path in renditions.values_list('file', flat=True):
+        default_storage.delete(path)
+    renditions.delete()
+    ImagePlaceholder.objects.filter(source=name).delete()
+    RenditionJob.objects.filter(source=name).delete()
+
+
+def release_file(name):
+    """Delete a stored image and everything derived from it once unreferenced"""
+    storage = content_addressed_storage
+    if not name or reference_count(name) or not storage.exists(name):
+        return False
+    if storage.get_modified_time(name) > timezone.now() - RECENT_WRITE_GRACE:
+        return False
+    delete_derived(name)
+    storage.delete(name)
+    return True
+
+
+def image_fields(instance):
+    return [field_name for model, field_name in IMAGE_FIELDS if type(instance) is model]
+
+
+def image_names(instance):
+    """{field name: stored name} for the image fields of one instance"""
+    return {field_name: getattr(instance, field_name).name or '' for field_name in image_fields(instance)}
+
+
+def remember_images(instance):
+    """Keep the stored names from before a save, to release replaced ones"""
+    fields = image_fields(instance)
+    stored = None
+    if instance.pk and fields:
+        stored = type(instance).objects.filter(pk=instance.pk).values(*fields).first()
+    instance._stored_images = stored or {}
+
+
+def replaced_images(instance):
+    deferred = instance.get_deferred_fields()
+    return [
+        old for field_name, old in getattr(instance, '_stored_images', {}).items()
+        if old and field_name not in deferred and getattr(instance, field_name).name != old
+    ]
+
+
+# =========================
+# MEDIA SCAN
+# =========================
+# Compares MEDIA_ROOT with every file field in the database (see
+# `manage.py scan_media`): files nothing points at, identical files and
+# rows whose file is gone.
+
+HASH_CHUNK = 1024 * 1024
+
+
+def referenced_names():
+    """Every stored name held by a file/image field of a yume_site model"""
+    names = set()
+    for model in apps.get_app_config('yume_site').get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                values = model.objects.order_by().exclude(**{field.name: ''})
+                names.update(values.values_list(field.name, flat=True).distinct())
+    names.discard(None)
+    return names
+
+
+def media_files(root):
+    """{stored name: (size, mtime)} of every file under MEDIA_ROOT"""
+    files = {}
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            stat = os.stat(path)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            files[name] = (stat.st_size, stat.st_mtime)
+    return files
+
+
+def hash_path(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        # hashlib releases the GIL on large updates, so threads overlap
+        while chunk := handle.read(HASH_CHUNK):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def duplicate_groups(root, files, workers):
+    """[[names with identical bytes], ...]; only files sharing a size are hashed"""
+    by_size = defaultdict(list)
+    for name, (size, mtime) in files.items():
+        by_size[size].append(name)
+    candidates = [name for names in by_size.values() if len(names) > 1 for name in names]
+
+    by_digest = defaultdict(list)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        paths = (os.path.join(root, name) for name in candidates)
+        for name, digest in zip(candidates, pool.map(hash_path, paths)):
+            by_digest[digest].append(name)
+    return [sorted(names) for names in by_digest.values() if len(names) > 1]
@@ -0,0 +1,217 @@
+import mimetypes
+import os
+import posixpath
+import re
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from .storage import is_content_addressed
+
+
+# =========================
+# MEDIA FILE SERVING
+# =========================
+# Uploaded files are served by middleware.MediaFilesMiddleware in every
+# environment (WhiteNoise only indexes the static files collected at build
+# time). Everything goes through default_storage, so a local MEDIA_ROOT
+# and an object-storage backend configured in STORAGES["default"] share
+# one code path: a local file is handed to the server's wsgi.file_wrapper
+# (sendfile under gunicorn, ranges included), a remote one is streamed.
+# Content-addressed names never change bytes and are cached for a year;
+# other names are revalidated with their ETag once MEDIA_CACHE_MAX_AGE ends.
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Older Pythons (3.10 on Render) do not know AVIF
+EXTRA_TYPES = {".avif": "image/avif", ".webp": "image/webp"}
+
+# Only worth looking for .br/.gz siblings of these; images are compressed already
+COMPRESSIBLE_TYPES = ("text/", "image/svg+xml", "application/json", "application/xml", "application/javascript")
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+BLOCK_SIZE = 64 * 1024
+
+
+class FileSlice:
+    """
+    Read-only view of `length` bytes of an open file from `start`.
+
+    Keeps the file's fileno(): the WSGI server's sendfile starts at the
+    current offset and stops at Content-Length, so ranges stay zero-copy.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def clean_name(path):
+    """Stored name for a URL path below MEDIA_URL, or None if it is not servable"""
+    name = posixpath.normpath(path).lstrip("/")
+    parts = PurePosixPath(name).parts
+    if not parts or name.startswith("..") or any(part.startswith(".") for part in parts):
+        return None
+    if name.endswith(".part"):
+        # ContentAddressedStorage writes in progress
+        return None
+    return name
+
+
+def content_type(name):
+    guessed, _ = mimetypes.guess_type(name)
+    return guessed or EXTRA_TYPES.get(PurePosixPath(name).suffix.lower(), "application/octet-stream")
+
+
+def stat(storage, name):
+    """(size, mtime) of a stored file, one os.stat() on local storage; None if missing"""
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        if not storage.exists(name):
+            return None
+        return storage.size(name), storage.get_modified_time(name).timestamp()
+    try:
+        result = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    if not os.path.isfile(path):
+        return None
+    return result.st_size, result.st_mtime
+
+
+def accepted_encodings(request):
+    header = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    offered = {part.split(";")[0].strip() for part in header.split(",")}
+    return [(encoding, suffix) for encoding, suffix in ENCODINGS if encoding in offered]
+
+
+def select_variant(request, storage, name, mime):
+    """(stored name, Content-Encoding, stat) of the best precompressed copy, if any"""
+    if mime.startswith(COMPRESSIBLE_TYPES):
+        for encoding, suffix in accepted_encodings(request):
+            found = stat(storage, name + suffix)
+            if found is not None:
+                return name + suffix, encoding, found
+    return name, None, stat(storage, name)
+
+
+def entity_tag(name, size, mtime, encoding):
+    if is_content_addressed(name):
+        # The name is the content hash: strong, and equal on every server
+        tag = PurePosixPath(name).stem
+    else:
+        tag = f"{int(mtime):x}-{size:x}"
+    return f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+
+def cache_control(name):
+    if is_content_addressed(name):
+        return IMMUTABLE_CACHE_CONTROL
+    return f"public, max-age={getattr(settings, 'MEDIA_CACHE_MAX_AGE', 3600)}"
+
+
+def byte_range(request, size, etag, last_modified):
+    """
+    (start, length) for a satisfiable single Range header, "unsatisfiable",
+    or None to send the whole file (no/invalid/multi range, stale If-Range)
+    """
+    header = request.META.get("HTTP_RANGE", "")
+    match = RANGE_RE.match(header.replace(" ", ""))
+    if not match or not any(match.groups()):
+        return None
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if if_range and if_range != etag and parse_http_date_safe(if_range) != int(last_modified):
+        return None
+
+    first, last = match.groups()
+    if not first:
+        # bytes=-500: the final 500 bytes
+        length = min(int(last), size)
+        return (size - length, length) if length else "unsatisfiable"
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return "unsatisfiable"
+    return start, end - start + 1
+
+
+def serve_media(request, path, storage=None):
+    """Response for GET/HEAD of the stored file at `path` below MEDIA_URL"""
+    storage = storage or default_storage
+    name = clean_name(path)
+    if name is None:
+        raise Http404("Not found")
+
+    mime = content_type(name)
+    stored_name, encoding, found = select_variant(request, storage, name, mime)
+    if found is None:
+        raise Http404("Not found")
+    size, mtime = found
+
+    etag = entity_tag(name, size, mtime, encoding)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(mtime),
+        "Cache-Control": cache_control(name),
+        "Accept-Ranges": "bytes",
+    }
+    if mime.startswith(COMPRESSIBLE_TYPES):
+        headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    # 304 / 412 from If-None-Match, If-Modified-Since, If-Match...
+    base = HttpResponse(headers=headers)
+    conditional = get_conditional_response(request, etag=etag, last_modified=int(mtime), response=base)
+    if conditional is not base:
+        return conditional
+
+    status, start, length = 200, 0, size
+    requested = byte_range(request, size, etag, mtime)
+    if requested == "unsatisfiable":
+        response = HttpResponse(status=416, headers=headers)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+    if requested is not None:
+        status, (start, length) = 206, requested
+        headers["Content-Range"] = f"bytes {start}-{start + length - 1}/{size}"
+
+    if request.method == "HEAD":
+        response = HttpResponse(status=status, headers=headers, content_type=mime)
+    else:
+        response = FileResponse(
+            FileSlice(storage.open(stored_name), start, length),
+            status=status, headers=headers, content_type=mime,
+        )
+        response.block_size = BLOCK_SIZE
+    response["Content-Length"] = length
+    return response
+
+
+def media_url_prefix():
+    """MEDIA_URL when this app serves it (a local path), else None (CDN/bucket URL)"""
+    url = settings.MEDIA_URL or ""
+    if not getattr(settings, "MEDIA_SERVE", True) or not url.startswith("/") or url == "/":
+        return None
+    return url
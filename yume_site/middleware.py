@@ -0,0 +1,198 @@
+import os
+import threading
+
+from django.conf import settings
+from django.contrib.auth import middleware as auth_middleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages import middleware as messages_middleware
+from django.contrib.sessions import middleware as sessions_middleware
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404, HttpResponseNotAllowed, HttpResponseNotFound
+from whitenoise.base import WhiteNoise
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .media_serving import media_url_prefix, serve_media
+from .site_snapshot import SNAPSHOT_RENDER_KEY, changes_path, page_path, snapshot_root
+
+
+# Campaign links add these to public URLs; they never change the page
+IGNORED_QUERY_PARAMS = ("utm_", "fbclid", "gclid")
+
+
+class SiteSnapshotMiddleware(WhiteNoise):
+    """
+    Serve pages prerendered by `manage.py export_site_snapshot`.
+
+    Runs right after WhiteNoise, so anonymous reads of snapshot pages never
+    reach sessions, auth or the views. The file map is built once at
+    startup. Pages written or removed later, by this or any other process,
+    are applied from the snapshot's change log (site_snapshot.py): a request
+    costs one stat of the log.
+    """
+
+    def __init__(self, get_response=None):
+        self.get_response = get_response
+        super().__init__(
+            application=None,
+            autorefresh=False,
+            max_age=getattr(settings, "SITE_SNAPSHOT_MAX_AGE", 60),
+            allow_all_origins=False,
+            index_file=True,
+        )
+        self.root = snapshot_root()
+        self.lock = threading.Lock()
+        # (inode, bytes applied) of the change log
+        self.log_position = None
+        if self.root:
+            self.load_files()
+
+    def __call__(self, request):
+        if self.can_serve(request):
+            self.follow_changes()
+            page = self.files.get(request.path_info)
+            if page is not None:
+                try:
+                    response = WhiteNoiseMiddleware.serve(page, request)
+                except OSError:
+                    # Removed by a process that has not logged it yet
+                    return self.get_response(request)
+                response["X-Frame-Options"] = getattr(settings, "X_FRAME_OPTIONS", "DENY")
+                return response
+        return self.get_response(request)
+
+    def log_state(self):
+        try:
+            stat = os.stat(changes_path())
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size
+
+    def load_files(self):
+        """Map every page in the snapshot directory"""
+        # Read first: changes logged during the scan are applied again later
+        state = self.log_state()
+        self.files = {}
+        if os.path.isdir(self.root):
+            self.update_files_dictionary(os.path.abspath(self.root) + os.sep, "/")
+        self.log_position = state
+
+    def follow_changes(self):
+        """Re-read the pages logged since the last request"""
+        state = self.log_state()
+        if state == self.log_position:
+            return
+        with self.lock:
+            position = self.log_position
+            if state is None or (position and (state[0] != position[0] or state[1] < position[1])):
+                # Log removed or replaced
+                self.load_files()
+                return
+            start = position[1] if position else 0
+            with open(changes_path(), "rb") as log:
+                log.seek(start)
+                data = log.read(state[1] - start)
+            # Only whole lines; a line still being written waits
+            data = data[:data.rfind(b"\n") + 1]
+            for url in dict.fromkeys(data.decode().split()):
+                self.update_page(url)
+            self.log_position = (state[0], start + len(data))
+
+    def update_page(self, url):
+        """Re-map one page from what is on disk now"""
+        path = page_path(url)
+        file_url = "/" + os.path.relpath(path, self.root).replace(os.sep, "/")
+        index_url = file_url[:-len(self.index_file)]
+        for key in (file_url, index_url, index_url.rstrip("/")):
+            self.files.pop(key, None)
+        if os.path.isfile(path):
+            try:
+                self.add_file_to_dictionary(file_url, path)
+            except OSError:
+                # Removed again while being read: the next log line drops it
+                pass
+
+    def can_serve(self, request):
+        if not self.root:
+            return False
+        if request.method not in ("GET", "HEAD"):
+            return False
+        # Snapshot pages being rendered come from the views
+        if request.META.get(SNAPSHOT_RENDER_KEY):
+            return False
+        # Logged-in editors always get a freshly rendered page
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return False
+        return all(key.startswith(IGNORED_QUERY_PARAMS) for key in request.GET)
+
+
+class MediaFilesMiddleware:
+    """
+    Serve uploaded files under MEDIA_URL (see media_serving.py).
+
+    Sits next to WhiteNoise so media requests never reach sessions, auth,
+    the snapshot or the URL resolver. Disabled when MEDIA_URL points at a
+    CDN or bucket, or with MEDIA_SERVE = False.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = media_url_prefix()
+        if self.prefix is None:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        if not request.path_info.startswith(self.prefix):
+            return self.get_response(request)
+        if request.method not in ("GET", "HEAD"):
+            return HttpResponseNotAllowed(["GET", "HEAD"])
+        try:
+            return serve_media(request, request.path_info[len(self.prefix):])
+        except Http404:
+            return HttpResponseNotFound()
+
+
+# =========================
+# SESSION-LESS PUBLIC READS
+# =========================
+# Anonymous GET/HEAD requests outside SESSION_PATH_PREFIXES (the admin)
+# skip the session, auth and messages middleware: no session store is
+# created, no user is looked up and no Vary: Cookie is added, so public
+# pages stay shareable by caches. A session cookie (a logged-in editor) or
+# any other method (the form POSTs) takes the full stack.
+
+def is_public_read(request):
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
+        return False
+    prefixes = tuple(getattr(settings, "SESSION_PATH_PREFIXES", ("/admin/",)))
+    return not request.path_info.startswith(prefixes)
+
+
+class PublicReadSkipMixin:
+    """Pass public reads straight through; everything else runs the middleware"""
+
+    async_capable = False
+
+    def __call__(self, request):
+        if is_public_read(request):
+            self.skip(request)
+            return self.get_response(request)
+        return super().__call__(request)
+
+    def skip(self, request):
+        pass
+
+
+class SessionMiddleware(PublicReadSkipMixin, sessions_middleware.SessionMiddleware):
+    pass
+
+
+class AuthenticationMiddleware(PublicReadSkipMixin, auth_middleware.AuthenticationMiddleware):
+    def skip(self, request):
+        # Views and the auth context processor still find a user
+        request.user = AnonymousUser()
+
+
+class MessageMiddleware(PublicReadSkipMixin, messages_middleware.MessageMiddleware):
+    pass
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.11 on 2026-10-18 10:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yume_site', '0064_remove_galleryimage_title_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='advisor',
+            name='bio_hidden1_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='advisor',
+            name='bio_hidden2_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='advisor',
+            name='bio_part1_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='advisor',
+            name='bio_part2_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
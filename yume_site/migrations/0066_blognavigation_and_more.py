@@ -0,0 +1,57 @@
+# Generated by Django 4.2.11 on 2026-10-18 10:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yume_site', '0065_advisor_bio_hidden1_html_advisor_bio_hidden2_html_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogNavigation',
+            fields=[
+                ('blog', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='navigation', serialize=False, to='yume_site.dynamicblog')),
+            ],
+            options={
+                'verbose_name': 'Blog Navigation',
+                'verbose_name_plural': 'Blog Navigation',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='dynamicblog',
+            index=models.Index(fields=['is_published', 'publish_date', 'id'], name='yume_site_d_is_publ_6f640a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dynamicblog',
+            index=models.Index(fields=['is_published', 'category', 'publish_date', 'id'], name='yume_site_d_is_publ_9aa3f4_idx'),
+        ),
+        migrations.AddField(
+            model_name='blognavigation',
+            name='next_blog',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='yume_site.dynamicblog'),
+        ),
+        migrations.AddField(
+            model_name='blognavigation',
+            name='previous_blog',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='yume_site.dynamicblog'),
+        ),
+        migrations.AddField(
+            model_name='blognavigation',
+            name='related_blog_1',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='yume_site.dynamicblog'),
+        ),
+        migrations.AddField(
+            model_name='blognavigation',
+            name='related_blog_2',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='yume_site.dynamicblog'),
+        ),
+        migrations.AddField(
+            model_name='blognavigation',
+            name='related_blog_3',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='yume_site.dynamicblog'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.11 on 2026-10-18 11:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yume_site', '0066_blognavigation_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogCard',
+            fields=[
+                ('blog', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='yume_site.dynamicblog')),
+                ('title', models.CharField(max_length=200)),
+                ('slug', models.SlugField(max_length=200)),
+                ('category', models.CharField(choices=[('excel', 'Excel'), ('sql', 'SQL'), ('python', 'Python'), ('data_viz', 'Data Visualization'), ('azure', 'Azure'), ('ai_ml', 'AI & ML'), ('power_platform', 'Power Platform'), ('security', 'Security'), ('soft_skills', 'Soft Skills'), ('tech_training', 'Technology Training'), ('career', 'Career Development')], max_length=50)),
+                ('excerpt', models.TextField(max_length=200)),
+                ('featured_image', models.ImageField(upload_to='blog/featured_images/')),
+                ('publish_date', models.DateField()),
+                ('read_time', models.CharField(max_length=50)),
+                ('display_order', models.IntegerField(default=0)),
+                ('featured', models.BooleanField(default=False)),
+            ],
+            options={
+                'verbose_name': 'Blog Card',
+                'verbose_name_plural': 'Blog Cards',
+                'ordering': ['display_order', '-publish_date'],
+                'indexes': [models.Index(fields=['display_order', '-publish_date'], name='yume_site_b_display_632bd8_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,131 @@
+# Generated by Django 4.2.11 on 2026-10-18 11:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Numbered column families turned into blocks:
+# (kind, column prefix, count, {block field: column suffix})
+PROJECT_FAMILIES = [
+    ('partner', 'partner_{}_', 3, {'title': 'name', 'subtitle': 'type', 'icon': 'icon', 'color': 'color'}),
+    ('component', 'component_{}_', 3, {'title': 'title', 'subtitle': 'subtitle', 'icon': 'icon', 'color': 'color', 'text': 'items'}),
+    ('role_item', 'role_item_{}_', 4, {'title': 'title', 'subtitle': 'subtitle', 'icon': 'icon', 'color': 'color'}),
+    ('impact_metric', 'impact_metric_{}_', 2, {'number': 'number', 'text': 'text'}),
+    ('outcome', 'outcome_{}_', 3, {'title': 'label', 'value': 'value', 'color': 'color'}),
+    ('cert_feature', 'cert_feature_{}_', 4, {'text': 'text', 'icon': 'icon', 'color': 'color'}),
+    ('support_feature', 'support_feature_{}_', 4, {'text': 'text', 'icon': 'icon', 'color': 'color'}),
+    ('partner_badge', 'partner_badge_{}_', 3, {'title': 'name', 'icon': 'icon', 'color': 'color'}),
+    ('highlight', 'highlight_{}_', 3, {'text': 'text', 'color': 'color'}),
+]
+
+BLOG_FAMILIES = [
+    ('feature', 'feature_{}_', 4, {'title': 'title', 'icon': 'icon', 'text': 'content'}),
+    ('application', 'application_{}', 5, {'text': ''}),
+    ('stat', 'stat_{}_', 3, {'number': 'number', 'text': 'text'}),
+    ('course', 'course_{}_', 3, {'title': 'title', 'text': 'description', 'link': 'link'}),
+]
+
+
+def columns_to_blocks(apps, schema_editor):
+    """Copy every numbered column into a block, values unchanged"""
+    sources = [
+        (apps.get_model('yume_site', 'ProjectDetail'), apps.get_model('yume_site', 'ProjectBlock'),
+         'project_detail_id', PROJECT_FAMILIES),
+        (apps.get_model('yume_site', 'DynamicBlog'), apps.get_model('yume_site', 'BlogBlock'),
+         'blog_id', BLOG_FAMILIES),
+    ]
+    for Parent, Block, parent_field, families in sources:
+        blocks = []
+        for parent in Parent.objects.all().iterator():
+            for kind, prefix, count, columns in families:
+                for order in range(1, count + 1):
+                    values = {
+                        field: getattr(parent, prefix.format(order) + suffix)
+                        for field, suffix in columns.items()
+                    }
+                    blocks.append(Block(kind=kind, order=order, **{parent_field: parent.pk}, **values))
+        Block.objects.bulk_create(blocks, batch_size=1000)
+
+
+def blocks_to_columns(apps, schema_editor):
+    """Write blocks back into the numbered columns (reverse migration)"""
+    sources = [
+        (apps.get_model('yume_site', 'ProjectDetail'), apps.get_model('yume_site', 'ProjectBlock'),
+         'project_detail_id', PROJECT_FAMILIES),
+        (apps.get_model('yume_site', 'DynamicBlog'), apps.get_model('yume_site', 'BlogBlock'),
+         'blog_id', BLOG_FAMILIES),
+    ]
+    for Parent, Block, parent_field, families in sources:
+        families = {kind: (prefix, count, columns) for kind, prefix, count, columns in families}
+        for parent in Parent.objects.all().iterator():
+            changed = []
+            for block in Block.objects.filter(**{parent_field: parent.pk}):
+                prefix, count, columns = families[block.kind]
+                if block.order > count:
+                    continue
+                for field, suffix in columns.items():
+                    value = getattr(block, field)
+                    if value is None:
+                        continue
+                    column = prefix.format(block.order) + suffix
+                    setattr(parent, column, value)
+                    changed.append(column)
+            if changed:
+                parent.save(update_fields=changed)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yume_site', '0067_blogcard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectBlock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order', models.PositiveIntegerField(default=1)),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('subtitle', models.CharField(blank=True, max_length=200)),
+                ('text', models.TextField(blank=True, help_text='Main text (for lists: one item per line)')),
+                ('icon', models.CharField(blank=True, help_text='Bootstrap icon class, e.g. bi-building', max_length=50)),
+                ('color', models.CharField(blank=True, choices=[('primary', '🔵 Blue (Primary)'), ('success', '🟢 Green (Success)'), ('info', '🔵 Light Blue (Info)'), ('warning', '🟡 Yellow (Warning)'), ('danger', '🔴 Red (Danger)'), ('secondary', '⚫ Gray (Secondary)')], max_length=30)),
+                ('number', models.CharField(blank=True, help_text='Big number of a stat, e.g. 82% or 5+', max_length=50)),
+                ('value', models.IntegerField(blank=True, help_text='Percentage for progress bars (0-100)', null=True)),
+                ('link', models.CharField(blank=True, max_length=200)),
+                ('kind', models.CharField(choices=[('partner', 'Partner'), ('component', 'Program Component'), ('role_item', 'Role Item'), ('impact_metric', 'Impact Metric'), ('outcome', 'Outcome Bar'), ('cert_feature', 'Certification Feature'), ('support_feature', 'Support Feature'), ('partner_badge', 'Partner Badge'), ('highlight', 'Program Highlight')], max_length=30)),
+                ('project_detail', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blocks', to='yume_site.projectdetail')),
+            ],
+            options={
+                'verbose_name': 'Project Content Block',
+                'verbose_name_plural': 'Project Content Blocks',
+                'ordering': ['kind', 'order', 'id'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='BlogBlock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order', models.PositiveIntegerField(default=1)),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('subtitle', models.CharField(blank=True, max_length=200)),
+                ('text', models.TextField(blank=True, help_text='Main text (for lists: one item per line)')),
+                ('icon', models.CharField(blank=True, help_text='Bootstrap icon class, e.g. bi-building', max_length=50)),
+                ('color', models.CharField(blank=True, choices=[('primary', '🔵 Blue (Primary)'), ('success', '🟢 Green (Success)'), ('info', '🔵 Light Blue (Info)'), ('warning', '🟡 Yellow (Warning)'), ('danger', '🔴 Red (Danger)'), ('secondary', '⚫ Gray (Secondary)')], max_length=30)),
+                ('number', models.CharField(blank=True, help_text='Big number of a stat, e.g. 82% or 5+', max_length=50)),
+                ('value', models.IntegerField(blank=True, help_text='Percentage for progress bars (0-100)', null=True)),
+                ('link', models.CharField(blank=True, max_length=200)),
+                ('kind', models.CharField(choices=[('feature', 'Feature (Section 2)'), ('application', 'Application (Section 3)'), ('stat', 'Stat (Section 4)'), ('course', 'Related Course (Sidebar)')], max_length=30)),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blocks', to='yume_site.dynamicblog')),
+            ],
+            options={
+                'verbose_name': 'Blog Content Block',
+                'verbose_name_plural': 'Blog Content Blocks',
+                'ordering': ['kind', 'order', 'id'],
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(columns_to_blocks, blocks_to_columns),
+    ]
@@ -0,0 +1,521 @@
+# Generated by Django 4.2.11 on 2026-10-18 11:08
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yume_site', '0068_projectblock_blogblock'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='application_1',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='application_2',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='application_3',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='application_4',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='application_5',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='course_1_description',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='course_1_link',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='course_1_title',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='course_2_description',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='course_2_link',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='course_2_title',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='course_3_description',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='course_3_link',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='course_3_title',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='feature_1_content',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='feature_1_icon',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='feature_1_title',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='feature_2_content',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='feature_2_icon',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='feature_2_title',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='feature_3_content',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='feature_3_icon',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='feature_3_title',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='feature_4_content',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='feature_4_icon',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='feature_4_title',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='stat_1_number',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='stat_1_text',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='stat_2_number',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='stat_2_text',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='stat_3_number',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='stat_3_text',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='cert_feature_1_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='cert_feature_1_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='cert_feature_1_text',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='cert_feature_2_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='cert_feature_2_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='cert_feature_2_text',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='cert_feature_3_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='cert_feature_3_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='cert_feature_3_text',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='cert_feature_4_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='cert_feature_4_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='cert_feature_4_text',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='component_1_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='component_1_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='component_1_items',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='component_1_subtitle',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='component_1_title',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='component_2_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='component_2_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='component_2_items',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='component_2_subtitle',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='component_2_title',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='component_3_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='component_3_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='component_3_items',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='component_3_subtitle',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='component_3_title',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='highlight_1_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='highlight_1_text',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='highlight_2_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='highlight_2_text',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='highlight_3_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='highlight_3_text',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='impact_metric_1_number',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='impact_metric_1_text',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='impact_metric_2_number',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='impact_metric_2_text',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='outcome_1_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='outcome_1_label',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='outcome_1_value',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='outcome_2_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='outcome_2_label',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='outcome_2_value',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='outcome_3_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='outcome_3_label',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='outcome_3_value',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_1_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_1_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_1_name',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_1_type',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_2_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_2_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_2_name',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_2_type',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_3_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_3_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_3_name',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_3_type',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_badge_1_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_badge_1_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_badge_1_name',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_badge_2_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_badge_2_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_badge_2_name',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_badge_3_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_badge_3_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='partner_badge_3_name',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_1_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_1_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_1_subtitle',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_1_title',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_2_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_2_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_2_subtitle',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_2_title',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_3_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_3_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_3_subtitle',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_3_title',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_4_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_4_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_4_subtitle',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='role_item_4_title',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='support_feature_1_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='support_feature_1_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='support_feature_1_text',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='support_feature_2_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='support_feature_2_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='support_feature_2_text',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='support_feature_3_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='support_feature_3_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='support_feature_3_text',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='support_feature_4_color',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='support_feature_4_icon',
+        ),
+        migrations.RemoveField(
+            model_name='projectdetail',
+            name='support_feature_4_text',
+        ),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 4.2.11 on 2026-10-18 11:13
+
+from django.db import migrations, models
+
+
+# The full-text index is maintained by the database itself, so every
+# SearchDocument write is indexed in the same transaction.
+#
+# Postgres: a generated tsvector column (title weighted above body) with a
+# GIN index.
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE yume_site_searchdocument ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX yume_site_searchdocument_vector ON yume_site_searchdocument USING GIN (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS yume_site_searchdocument_vector",
+    "ALTER TABLE yume_site_searchdocument DROP COLUMN IF EXISTS search_vector",
+]
+
+# SQLite: an external-content FTS5 table kept in sync by triggers. No
+# stemming, FTS5 would stem the search-as-you-type prefix as well. A later
+# migration that rebuilds yume_site_searchdocument drops the triggers and
+# has to recreate them.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE yume_site_searchdocument_fts USING fts5(
+        title, body,
+        content='yume_site_searchdocument', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+    )
+    """,
+    """
+    CREATE TRIGGER yume_site_searchdocument_ai AFTER INSERT ON yume_site_searchdocument BEGIN
+        INSERT INTO yume_site_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER yume_site_searchdocument_ad AFTER DELETE ON yume_site_searchdocument BEGIN
+        INSERT INTO yume_site_searchdocument_fts(yume_site_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER yume_site_searchdocument_au AFTER UPDATE ON yume_site_searchdocument BEGIN
+        INSERT INTO yume_site_searchdocument_fts(yume_site_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO yume_site_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    "INSERT INTO yume_site_searchdocument_fts(yume_site_searchdocument_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS yume_site_searchdocument_ai",
+    "DROP TRIGGER IF EXISTS yume_site_searchdocument_ad",
+    "DROP TRIGGER IF EXISTS yume_site_searchdocument_au",
+    "DROP TABLE IF EXISTS yume_site_searchdocument_fts",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_fulltext_index(apps, schema_editor):
+    _run(schema_editor, {'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD})
+
+
+def drop_fulltext_index(apps, schema_editor):
+    _run(schema_editor, {'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yume_site', '0069_remove_dynamicblog_application_1_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('course', 'Course'), ('blog', 'Blog'), ('project', 'Project')], max_length=10)),
+                ('object_id', models.PositiveIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('url', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('is_public', models.BooleanField(default=True, help_text='Shown on /search/ (admin search also finds hidden rows)')),
+            ],
+            options={
+                'verbose_name': 'Search Document',
+                'verbose_name_plural': 'Search Documents',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_document'),
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.11 on 2026-10-18 11:30
+
+import datetime
+
+from django.db import migrations, models
+
+
+def fill_listing_keys(apps, schema_editor):
+    """Same packing as blog_listing.listing_key()"""
+    BlogCard = apps.get_model('yume_site', 'BlogCard')
+    last_date = datetime.date.max.toordinal()
+    cards = list(BlogCard.objects.only('display_order', 'publish_date'))
+    for card in cards:
+        card.listing_key = "{:010d}.{:07d}.{:012d}".format(
+            card.display_order + 2 ** 31,
+            last_date - card.publish_date.toordinal(),
+            10 ** 12 - 1 - card.blog_id,
+        )
+    BlogCard.objects.bulk_update(cards, ['listing_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yume_site', '0070_searchdocument'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='blogcard',
+            options={'ordering': ['listing_key'], 'verbose_name': 'Blog Card', 'verbose_name_plural': 'Blog Cards'},
+        ),
+        migrations.RemoveIndex(
+            model_name='blogcard',
+            name='yume_site_b_display_632bd8_idx',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='azure_count',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='career_count',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='excel_count',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='python_count',
+        ),
+        migrations.RemoveField(
+            model_name='dynamicblog',
+            name='sql_count',
+        ),
+        migrations.AddField(
+            model_name='blogcard',
+            name='listing_key',
+            field=models.CharField(default='', max_length=32),
+        ),
+        migrations.RunPython(fill_listing_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='blogcard',
+            index=models.Index(fields=['listing_key'], name='yume_site_b_listing_9df19c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogcard',
+            index=models.Index(fields=['category', 'listing_key'], name='yume_site_b_categor_4adb70_idx'),
+        ),
+    ]
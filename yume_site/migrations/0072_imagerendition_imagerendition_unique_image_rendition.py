@@ -0,0 +1,34 @@
+# Generated by Django 4.2.11 on 2026-10-18 11:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yume_site', '0071_blogcard_listing_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageRendition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(db_index=True, max_length=255)),
+                ('format', models.CharField(choices=[('avif', 'AVIF'), ('webp', 'WebP'), ('jpeg', 'JPEG'), ('png', 'PNG')], max_length=4)),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('file', models.FileField(max_length=255, upload_to='renditions/')),
+                ('size', models.PositiveIntegerField(help_text='File size in bytes')),
+            ],
+            options={
+                'verbose_name': 'Image Rendition',
+                'verbose_name_plural': 'Image Renditions',
+                'ordering': ['source', 'format', 'width'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='imagerendition',
+            constraint=models.UniqueConstraint(fields=('source', 'format', 'width'), name='unique_image_rendition'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.11 on 2026-10-18 11:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yume_site', '0073_renditionjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImagePlaceholder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=255, unique=True)),
+                ('lqip', models.TextField(blank=True, help_text='data: URI of a ~20px wide WebP')),
+                ('color', models.CharField(blank=True, help_text='Dominant colour as #rrggbb', max_length=7)),
+            ],
+            options={
+                'verbose_name': 'Image Placeholder',
+                'verbose_name_plural': 'Image Placeholders',
+            },
+        ),
+    ]
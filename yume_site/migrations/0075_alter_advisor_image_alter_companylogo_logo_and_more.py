@@ -0,0 +1,54 @@
+# Generated by Django 4.2.11 on 2026-10-18 11:43
+
+from django.db import migrations, models
+import yume_site.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yume_site', '0074_imageplaceholder'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='advisor',
+            name='image',
+            field=models.ImageField(help_text='Profile photo of the advisor (recommended size: 350x380px, JPG/PNG format)', upload_to='advisors/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='companylogo',
+            name='logo',
+            field=models.ImageField(help_text='Company logo image', upload_to='placements/company_logos/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='image',
+            field=models.ImageField(upload_to='courses/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='dynamicblog',
+            name='featured_image',
+            field=models.ImageField(help_text='Image for blog card (700x400px recommended)', upload_to='blog/featured_images/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='galleryimage',
+            name='image',
+            field=models.ImageField(help_text='Upload gallery image (recommended size: 800x600px)', upload_to='gallery/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='heroslide',
+            name='image',
+            field=models.ImageField(upload_to='hero_slides/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='projectcard',
+            name='thumbnail_image',
+            field=models.ImageField(help_text='Image for project card (300x200px recommended)', upload_to='projects/card_images/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='projectdetail',
+            name='hero_image',
+            field=models.ImageField(blank=True, help_text='Large image for project detail page (optional - uses card image if empty)', null=True, upload_to='projects/hero_images/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+    ]
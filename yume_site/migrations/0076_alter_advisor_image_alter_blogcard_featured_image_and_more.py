@@ -0,0 +1,60 @@
+# Generated by Django 4.2.11 on 2026-10-18 11:46
+
+from django.db import migrations, models
+import yume_site.storage
+import yume_site.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yume_site', '0075_alter_advisor_image_alter_companylogo_logo_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='advisor',
+            name='image',
+            field=models.ImageField(help_text='Profile photo of the advisor (recommended size: 350x380px, JPG/PNG format)', storage=yume_site.storage.ContentAddressedStorage(), upload_to='advisors/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='blogcard',
+            name='featured_image',
+            field=models.ImageField(storage=yume_site.storage.ContentAddressedStorage(), upload_to='blog/featured_images/'),
+        ),
+        migrations.AlterField(
+            model_name='companylogo',
+            name='logo',
+            field=models.ImageField(help_text='Company logo image', storage=yume_site.storage.ContentAddressedStorage(), upload_to='placements/company_logos/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='image',
+            field=models.ImageField(storage=yume_site.storage.ContentAddressedStorage(), upload_to='courses/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='dynamicblog',
+            name='featured_image',
+            field=models.ImageField(help_text='Image for blog card (700x400px recommended)', storage=yume_site.storage.ContentAddressedStorage(), upload_to='blog/featured_images/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='galleryimage',
+            name='image',
+            field=models.ImageField(help_text='Upload gallery image (recommended size: 800x600px)', storage=yume_site.storage.ContentAddressedStorage(), upload_to='gallery/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='heroslide',
+            name='image',
+            field=models.ImageField(storage=yume_site.storage.ContentAddressedStorage(), upload_to='hero_slides/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='projectcard',
+            name='thumbnail_image',
+            field=models.ImageField(help_text='Image for project card (300x200px recommended)', storage=yume_site.storage.ContentAddressedStorage(), upload_to='projects/card_images/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='projectdetail',
+            name='hero_image',
+            field=models.ImageField(blank=True, help_text='Large image for project detail page (optional - uses card image if empty)', null=True, storage=yume_site.storage.ContentAddressedStorage(), upload_to='projects/hero_images/', validators=[yume_site.validators.validate_image_pixels]),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.11 on 2026-10-18 11:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+import yume_site.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yume_site', '0076_alter_advisor_image_alter_blogcard_featured_image_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogoSpriteSheet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveSmallIntegerField(default=0)),
+                ('signature', models.CharField(max_length=64)),
+                ('webp', models.FileField(max_length=255, storage=yume_site.storage.ContentAddressedStorage(), upload_to='sprites/')),
+                ('png', models.FileField(max_length=255, storage=yume_site.storage.ContentAddressedStorage(), upload_to='sprites/')),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('positions', models.JSONField(default=dict, help_text='{logo id: [x, y, width, height]}')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('placements_section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='logo_sprite_sheets', to='yume_site.placementssection')),
+            ],
+            options={
+                'verbose_name': 'Logo Sprite Sheet',
+                'verbose_name_plural': 'Logo Sprite Sheets',
+                'ordering': ['placements_section', 'index'],
+                'unique_together': {('placements_section', 'index')},
+            },
+        ),
+    ]
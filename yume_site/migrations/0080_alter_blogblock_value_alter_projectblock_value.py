@@ -0,0 +1,24 @@
+# Generated by Django 4.2.11 on 2026-10-18 12:37
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yume_site', '0079_form_submission_fingerprints'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blogblock',
+            name='value',
+            field=models.IntegerField(blank=True, help_text='Percentage for progress bars (0-100)', null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.AlterField(
+            model_name='projectblock',
+            name='value',
+            field=models.IntegerField(blank=True, help_text='Percentage for progress bars (0-100)', null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)]),
+        ),
+    ]
@@ -1,8 +1,12 @@
 from django.db import models
 import re
 from django.utils.text import slugify
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+from .storage import content_addressed_storage
+from .validators import validate_image_pixels
+
 
 class ContactMessage(models.Model):
     first_name = models.CharField(max_length=50)
@@ -10,7 +14,14 @@ class ContactMessage(models.Model):
     phone = models.CharField(max_length=15)
     email = models.EmailField()
     message = models.TextField()
-    submitted_at = models.DateTimeField(auto_now_add=True)
+    # When the visitor submitted, not when the row was flushed
+    submitted_at = models.DateTimeField(default=timezone.now, editable=False)
+    # Journal entry the row was flushed from (submissions.py); unique so a
+    # replayed batch never inserts twice
+    submission_id = models.UUIDField(null=True, blank=True, unique=True, editable=False)
+    # Content hash per dedup window (submissions.fingerprints): the same
+    # details sent twice within the window are one row
+    fingerprint = models.CharField(max_length=64, null=True, blank=True, unique=True, editable=False)
 
     class Meta:
         verbose_name = "Contact"
@@ -66,7 +77,13 @@ class Enrollment(models.Model):
     mobile = models.CharField(max_length=15)
     education = models.CharField(max_length=50, choices=EDUCATION_CHOICES)
     course = models.CharField(max_length=100, choices=COURSE_CHOICES)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    # Journal entry the row was flushed from (submissions.py); unique so a
+    # replayed batch never inserts twice
+    submission_id = models.UUIDField(null=True, blank=True, unique=True, editable=False)
+    # Content hash per dedup window (submissions.fingerprints): the same
+    # details sent twice within the window are one row
+    fingerprint = models.CharField(max_length=64, null=True, blank=True, unique=True, editable=False)
 
     def __str__(self):
         return f"{self.first_name} - {self.course}"
@@ -79,17 +96,19 @@ class Enquiry(models.Model):
     email = models.EmailField()
     mobile = models.CharField(max_length=15)
     message = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    # Journal entry the row was flushed from (submissions.py); unique so a
+    # replayed batch never inserts twice
+    submission_id = models.UUIDField(null=True, blank=True, unique=True, editable=False)
+    # Content hash per dedup window (submissions.fingerprints): the same
+    # details sent twice within the window are one row
+    fingerprint = models.CharField(max_length=64, null=True, blank=True, unique=True, editable=False)
 
     def __str__(self):
         return f"{self.first_name} {self.email}"
 
 
 
-
-
-
-
 class ProjectCard(models.Model):
     """Model for PROJECT CARDS only (no detailed content)"""
     
@@ -117,6 +136,8 @@ class ProjectCard(models.Model):
     # === CARD IMAGE ===
     thumbnail_image = models.ImageField(
         upload_to='projects/card_images/',
+        validators=[validate_image_pixels],
+        storage=content_addressed_storage,
         help_text="Image for project card (300x200px recommended)"
     )
     
@@ -164,6 +185,10 @@ class ProjectCard(models.Model):
 class ProjectDetail(models.Model):
     """Model for PROJECT DETAIL PAGES only"""
     
+    # Repeated items (partners, components, role items, impact metrics,
+    # outcomes, certification/support features, badges, highlights) are
+    # ProjectBlock rows, see ContentBlock below
+    
     # Icon choices for non-coders
     ICON_CHOICES = [
         ('bi-building', '🏢 Building (Organization)'),
@@ -235,6 +260,8 @@ class ProjectDetail(models.Model):
     # === HERO IMAGE ===
     hero_image = models.ImageField(
         upload_to='projects/hero_images/',
+        validators=[validate_image_pixels],
+        storage=content_addressed_storage,
         help_text="Large image for project detail page (optional - uses card image if empty)",
         blank=True,
         null=True
@@ -252,92 +279,7 @@ class ProjectDetail(models.Model):
         help_text="Show partners section on detail page"
     )
     
-    # === PARTNER 1 ===
-    partner_1_name = models.CharField(
-        max_length=100,
-        default='YuMe Learning',
-        help_text="First partner organization name",
-        blank=True
-    )
-    
-    partner_1_type = models.CharField(
-        max_length=100,
-        default='Implementing Partner',
-        help_text="First partner type/role",
-        blank=True
-    )
-    
-    partner_1_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-building',
-        help_text="Select an icon for first partner"
-    )
-    
-    partner_1_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='primary',
-        help_text="Select color for first partner"
-    )
-    
-    # === PARTNER 2 ===
-    partner_2_name = models.CharField(
-        max_length=100,
-        default='NASSCOM',
-        help_text="Second partner organization name",
-        blank=True
-    )
-    
-    partner_2_type = models.CharField(
-        max_length=100,
-        default='Knowledge Partner',
-        help_text="Second partner type/role",
-        blank=True
-    )
-    
-    partner_2_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-shield-check',
-        help_text="Select an icon for second partner"
-    )
-    
-    partner_2_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='success',
-        help_text="Select color for second partner"
-    )
-    
-    # === PARTNER 3 ===
-    partner_3_name = models.CharField(
-        max_length=100,
-        default='ITC',
-        help_text="Third partner organization name",
-        blank=True
-    )
-    
-    partner_3_type = models.CharField(
-        max_length=100,
-        default='CSR Partner',
-        help_text="Third partner type/role",
-        blank=True
-    )
-    
-    partner_3_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-handshake',
-        help_text="Select an icon for third partner"
-    )
     
-    partner_3_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='info',
-        help_text="Select color for third partner"
-    )
     
     # === DETAILED CONTENT ===
     detailed_content = models.TextField(
@@ -432,111 +374,6 @@ class ProjectDetail(models.Model):
         blank=True
     )
     
-    # === COMPONENT 1 - Technical Skills ===
-    component_1_title = models.CharField(
-        max_length=100,
-        default='Technical Skills',
-        help_text="Title for first component",
-        blank=True
-    )
-    
-    component_1_subtitle = models.CharField(
-        max_length=100,
-        default='Programming & Development',
-        help_text="Subtitle for first component",
-        blank=True
-    )
-    
-    component_1_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-code-slash',
-        help_text="Icon for first component"
-    )
-    
-    component_1_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='primary',
-        help_text="Color for first component"
-    )
-    
-    component_1_items = models.TextField(
-        help_text="List items for first component (one per line)",
-        default="Python Programming\nFull Stack Development\nData Analytics\nSQL Database Management\nReal Dataset Problem-solving",
-        blank=True
-    )
-    
-    # === COMPONENT 2 - Hands-on Projects ===
-    component_2_title = models.CharField(
-        max_length=100,
-        default='Hands-on Projects',
-        help_text="Title for second component",
-        blank=True
-    )
-    
-    component_2_subtitle = models.CharField(
-        max_length=100,
-        default='Practical Experience',
-        help_text="Subtitle for second component",
-        blank=True
-    )
-    
-    component_2_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-laptop',
-        help_text="Icon for second component"
-    )
-    
-    component_2_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='success',
-        help_text="Color for second component"
-    )
-    
-    component_2_items = models.TextField(
-        help_text="List items for second component (one per line)",
-        default="Weekly Lab Sessions\nIndustry Mini-Projects\nCapstone Project\nTeam-based Simulations\nContinuous Assessment",
-        blank=True
-    )
-    
-    # === COMPONENT 3 - Career Development ===
-    component_3_title = models.CharField(
-        max_length=100,
-        default='Career Readiness',
-        help_text="Title for third component",
-        blank=True
-    )
-    
-    component_3_subtitle = models.CharField(
-        max_length=100,
-        default='Professional Development',
-        help_text="Subtitle for third component",
-        blank=True
-    )
-    
-    component_3_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-briefcase',
-        help_text="Icon for third component"
-    )
-    
-    component_3_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='warning',
-        help_text="Color for third component"
-    )
-    
-    component_3_items = models.TextField(
-        help_text="List items for third component (one per line)",
-        default="Resume & Portfolio Building\nLinkedIn Optimization\nMock Interview Sessions\nProfessional Communication\nIndustry Networking",
-        blank=True
-    )
-    
     
     
         # === ROLE & IMPACT SECTION ===
@@ -559,118 +396,7 @@ class ProjectDetail(models.Model):
         blank=True
     )
     
-    # Role items
-    role_item_1_title = models.CharField(
-        max_length=100,
-        default='Program Delivery',
-        help_text="First role item title",
-        blank=True
-    )
-    
-    role_item_1_subtitle = models.CharField(
-        max_length=100,
-        default='Training execution & management',
-        help_text="First role item subtitle",
-        blank=True
-    )
-    
-    role_item_1_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-gear',
-        help_text="Icon for first role item"
-    )
-    
-    role_item_1_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='primary',
-        help_text="Color for first role item"
-    )
-    
-    role_item_2_title = models.CharField(
-        max_length=100,
-        default='Learner Engagement',
-        help_text="Second role item title",
-        blank=True
-    )
-    
-    role_item_2_subtitle = models.CharField(
-        max_length=100,
-        default='Student support & monitoring',
-        help_text="Second role item subtitle",
-        blank=True
-    )
-    
-    role_item_2_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-people',
-        help_text="Icon for second role item"
-    )
     
-    role_item_2_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='success',
-        help_text="Color for second role item"
-    )
-    
-    role_item_3_title = models.CharField(
-        max_length=100,
-        default='Outcome Measurement',
-        help_text="Third role item title",
-        blank=True
-    )
-    
-    role_item_3_subtitle = models.CharField(
-        max_length=100,
-        default='Impact assessment & reporting',
-        help_text="Third role item subtitle",
-        blank=True
-    )
-    
-    role_item_3_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-graph-up',
-        help_text="Icon for third role item"
-    )
-    
-    role_item_3_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='info',
-        help_text="Color for third role item"
-    )
-    
-    role_item_4_title = models.CharField(
-        max_length=100,
-        default='Multi-region Implementation',
-        help_text="Fourth role item title",
-        blank=True
-    )
-    
-    role_item_4_subtitle = models.CharField(
-        max_length=100,
-        default='Statewide program coverage',
-        help_text="Fourth role item subtitle",
-        blank=True
-    )
-    
-    role_item_4_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-geo-alt',
-        help_text="Icon for fourth role item"
-    )
-    
-    role_item_4_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='warning',
-        help_text="Color for fourth role item"
-    )
     
     # === PROGRAM IMPACT ===
     impact_title = models.CharField(
@@ -694,95 +420,6 @@ class ProjectDetail(models.Model):
         blank=True
     )
     
-    # Impact metrics
-    impact_metric_1_number = models.CharField(
-        max_length=50,
-        default='5+',
-        help_text="First impact metric number",
-        blank=True
-    )
-    
-    impact_metric_1_text = models.CharField(
-        max_length=100,
-        default='Regions',
-        help_text="First impact metric text",
-        blank=True
-    )
-    
-    impact_metric_2_number = models.CharField(
-        max_length=50,
-        default='50',
-        help_text="Second impact metric number",
-        blank=True
-    )
-    
-    impact_metric_2_text = models.CharField(
-        max_length=100,
-        default='Hours/Student',
-        help_text="Second impact metric text",
-        blank=True
-    )
-    
-    # Outcome progress bars
-    outcome_1_label = models.CharField(
-        max_length=100,
-        default='Skill Enhancement',
-        help_text="First outcome label",
-        blank=True
-    )
-    
-    outcome_1_value = models.IntegerField(
-        default=94,
-        help_text="First outcome percentage (0-100)",
-        validators=[MinValueValidator(0), MaxValueValidator(100)]
-    )
-    
-    outcome_1_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='success',
-        help_text="Color for first outcome progress bar"
-    )
-    
-    outcome_2_label = models.CharField(
-        max_length=100,
-        default='Employability',
-        help_text="Second outcome label",
-        blank=True
-    )
-    
-    outcome_2_value = models.IntegerField(
-        default=89,
-        help_text="Second outcome percentage (0-100)",
-        validators=[MinValueValidator(0), MaxValueValidator(100)]
-    )
-    
-    outcome_2_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='warning',
-        help_text="Color for second outcome progress bar"
-    )
-    
-    outcome_3_label = models.CharField(
-        max_length=100,
-        default='Student Satisfaction',
-        help_text="Third outcome label",
-        blank=True
-    )
-    
-    outcome_3_value = models.IntegerField(
-        default=96,
-        help_text="Third outcome percentage (0-100)",
-        validators=[MinValueValidator(0), MaxValueValidator(100)]
-    )
-    
-    outcome_3_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='info',
-        help_text="Color for third outcome progress bar"
-    )
     
     
         # === CERTIFICATION & SUPPORT SECTION ===
@@ -826,90 +463,7 @@ class ProjectDetail(models.Model):
         help_text="Color for certification card"
     )
     
-    # Certification features (4 items)
-    cert_feature_1_text = models.CharField(
-        max_length=100,
-        default='Technical Validation',
-        help_text="First certification feature",
-        blank=True
-    )
-    
-    cert_feature_1_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-check-circle',
-        help_text="Icon for first feature"
-    )
-    
-    cert_feature_1_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='success',
-        help_text="Color for first feature"
-    )
-    
-    cert_feature_2_text = models.CharField(
-        max_length=100,
-        default='Employability Proof',
-        help_text="Second certification feature",
-        blank=True
-    )
-    
-    cert_feature_2_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-person-check',
-        help_text="Icon for second feature"
-    )
-    
-    cert_feature_2_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='primary',
-        help_text="Color for second feature"
-    )
-    
-    cert_feature_3_text = models.CharField(
-        max_length=100,
-        default='Industry Recognition',
-        help_text="Third certification feature",
-        blank=True
-    )
-    
-    cert_feature_3_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-award',
-        help_text="Icon for third feature"
-    )
-    
-    cert_feature_3_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='warning',
-        help_text="Color for third feature"
-    )
-    
-    cert_feature_4_text = models.CharField(
-        max_length=100,
-        default='Career Readiness Support',
-        help_text="Fourth certification feature",
-        blank=True
-    )
-    
-    cert_feature_4_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-briefcase',
-        help_text="Icon for fourth feature"
-    )
     
-    cert_feature_4_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='info',
-        help_text="Color for fourth feature"
-    )
     
     # === SUPPORT CARD ===
     support_title = models.CharField(
@@ -946,90 +500,6 @@ class ProjectDetail(models.Model):
         help_text="Color for support card"
     )
     
-    # Support features (4 items)
-    support_feature_1_text = models.CharField(
-        max_length=100,
-        default='Industry Connect',
-        help_text="First support feature",
-        blank=True
-    )
-    
-    support_feature_1_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-building',
-        help_text="Icon for first feature"
-    )
-    
-    support_feature_1_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='info',
-        help_text="Color for first feature"
-    )
-    
-    support_feature_2_text = models.CharField(
-        max_length=100,
-        default='Mock Interviews',
-        help_text="Second support feature",
-        blank=True
-    )
-    
-    support_feature_2_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-chat-dots',
-        help_text="Icon for second feature"
-    )
-    
-    support_feature_2_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='warning',
-        help_text="Color for second feature"
-    )
-    
-    support_feature_3_text = models.CharField(
-        max_length=100,
-        default='Mentorship',
-        help_text="Third support feature",
-        blank=True
-    )
-    
-    support_feature_3_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-people',
-        help_text="Icon for third feature"
-    )
-    
-    support_feature_3_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='secondary',
-        help_text="Color for third feature"
-    )
-    
-    support_feature_4_text = models.CharField(
-        max_length=100,
-        default='Career Guidance',
-        help_text="Fourth support feature",
-        blank=True
-    )
-    
-    support_feature_4_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-graph-up',
-        help_text="Icon for fourth feature"
-    )
-    
-    support_feature_4_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='danger',
-        help_text="Color for fourth feature"
-    )
     
     
         # === SUSTAINABLE PATHWAYS SECTION ===
@@ -1052,69 +522,7 @@ class ProjectDetail(models.Model):
         blank=True
     )
     
-    # Partner badges (3 badges)
-    partner_badge_1_name = models.CharField(
-        max_length=100,
-        default='YuMe Learning',
-        help_text="First partner badge name",
-        blank=True
-    )
-    
-    partner_badge_1_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-building',
-        help_text="Icon for first partner badge"
-    )
-    
-    partner_badge_1_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='primary',
-        help_text="Color for first partner badge"
-    )
-    
-    partner_badge_2_name = models.CharField(
-        max_length=100,
-        default='NASSCOM Foundation',
-        help_text="Second partner badge name",
-        blank=True
-    )
-    
-    partner_badge_2_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-shield-check',
-        help_text="Icon for second partner badge"
-    )
-    
-    partner_badge_2_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='success',
-        help_text="Color for second partner badge"
-    )
-    
-    partner_badge_3_name = models.CharField(
-        max_length=100,
-        default='ITC',
-        help_text="Third partner badge name",
-        blank=True
-    )
     
-    partner_badge_3_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-handshake',
-        help_text="Icon for third partner badge"
-    )
-    
-    partner_badge_3_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='info',
-        help_text="Color for third partner badge"
-    )
     
     # Program highlights
     highlights_title = models.CharField(
@@ -1124,66 +532,90 @@ class ProjectDetail(models.Model):
         blank=True
     )
     
-    highlight_1_text = models.CharField(
-        max_length=200,
-        default='Industry-Aligned Curriculum',
-        help_text="First highlight text",
-        blank=True
-    )
     
-    highlight_1_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='success',
-        help_text="Color for first highlight"
-    )
     
-    highlight_2_text = models.CharField(
-        max_length=200,
-        default='Hands-on Practical Experience',
-        help_text="Second highlight text",
-        blank=True
-    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
-    highlight_2_color = models.CharField(
-        max_length=30,
-        choices=COLOR_CHOICES,
-        default='primary',
-        help_text="Color for second highlight"
-    )
+    class Meta:
+        verbose_name = "Project Detail Page"
+        verbose_name_plural = "Project Detail Pages"
     
-    highlight_3_text = models.CharField(
-        max_length=200,
-        default='Mentorship & Career Guidance',
-        help_text="Third highlight text",
-        blank=True
-    )
+    def __str__(self):
+        return f"Detail page for {self.project_card.project_name}"
     
-    highlight_3_color = models.CharField(
+    @property
+    def student_count_display(self):
+        """Format student count with + sign"""
+        return f"{self.student_count}+"
+
+
+class ContentBlock(models.Model):
+    """One repeated item of a detail page (a partner, a feature, a stat...)"""
+    
+    order = models.PositiveIntegerField(default=1)
+    title = models.CharField(max_length=200, blank=True)
+    subtitle = models.CharField(max_length=200, blank=True)
+    text = models.TextField(
+        blank=True,
+        help_text="Main text (for lists: one item per line)"
+    )
+    icon = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text="Bootstrap icon class, e.g. bi-building"
+    )
+    color = models.CharField(
         max_length=30,
-        choices=COLOR_CHOICES,
-        default='warning',
-        help_text="Color for third highlight"
+        choices=ProjectDetail.COLOR_CHOICES,
+        blank=True
     )
-    
-    
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    number = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text="Big number of a stat, e.g. 82% or 5+"
+    )
+    value = models.IntegerField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(0), MaxValueValidator(100)],
+        help_text="Percentage for progress bars (0-100)"
+    )
+    link = models.CharField(max_length=200, blank=True)
     
     class Meta:
-        verbose_name = "Project Detail Page"
-        verbose_name_plural = "Project Detail Pages"
+        abstract = True
+        ordering = ['kind', 'order', 'id']
     
     def __str__(self):
-        return f"Detail page for {self.project_card.project_name}"
+        return f"{self.get_kind_display()} {self.order}"
+
+
+class ProjectBlock(ContentBlock):
+    """Partners, components, role items, outcomes... of a project page"""
+    
+    KIND_CHOICES = [
+        ('partner', 'Partner'),
+        ('component', 'Program Component'),
+        ('role_item', 'Role Item'),
+        ('impact_metric', 'Impact Metric'),
+        ('outcome', 'Outcome Bar'),
+        ('cert_feature', 'Certification Feature'),
+        ('support_feature', 'Support Feature'),
+        ('partner_badge', 'Partner Badge'),
+        ('highlight', 'Program Highlight'),
+    ]
     
-    @property
-    def student_count_display(self):
-        """Format student count with + sign"""
-        return f"{self.student_count}+"
-
-
-
+    project_detail = models.ForeignKey(
+        ProjectDetail,
+        on_delete=models.CASCADE,
+        related_name='blocks'
+    )
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    
+    class Meta(ContentBlock.Meta):
+        verbose_name = "Project Content Block"
+        verbose_name_plural = "Project Content Blocks"
 
 
 
@@ -1196,7 +628,11 @@ class Course(models.Model):
         blank=True,
         help_text="Shown only on course cards"
     )
-    image = models.ImageField(upload_to='courses/')
+    image = models.ImageField(
+        upload_to='courses/',
+        validators=[validate_image_pixels],
+        storage=content_addressed_storage,
+    )
 
     # =============================
     # COURSE DETAIL PAGE (HERO)
@@ -1584,7 +1020,6 @@ class CourseCareerOpportunity(models.Model):
 
 
 
-
 ICON_CHOICES = [
     ('bi-table', 'Table'),
     ('bi-lightning-charge', 'Lightning'),
@@ -1609,10 +1044,50 @@ ICON_CHOICES = [
 ]
 
 
+class BlogBlock(ContentBlock):
+    """Features, applications, stats and sidebar courses of a blog post"""
+    
+    KIND_CHOICES = [
+        ('feature', 'Feature (Section 2)'),
+        ('application', 'Application (Section 3)'),
+        ('stat', 'Stat (Section 4)'),
+        ('course', 'Related Course (Sidebar)'),
+    ]
+    
+    blog = models.ForeignKey(
+        'DynamicBlog',
+        on_delete=models.CASCADE,
+        related_name='blocks'
+    )
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    
+    class Meta(ContentBlock.Meta):
+        verbose_name = "Blog Content Block"
+        verbose_name_plural = "Blog Content Blocks"
+
+
+# Fields a blog card (listing page, admin changelist) actually shows
+BLOG_CARD_FIELDS = [
+    'id', 'title', 'slug', 'category', 'excerpt', 'featured_image',
+    'publish_date', 'read_time', 'display_order', 'featured', 'is_published',
+]
+
+
+class DynamicBlogQuerySet(models.QuerySet):
+    def published(self):
+        return self.filter(is_published=True)
+
+    def cards(self):
+        """Only the card columns, not the 100+ detail page columns"""
+        return self.only(*BLOG_CARD_FIELDS)
+
+
 # Update the DynamicBlog class in your existing models.py
 class DynamicBlog(models.Model):
     """Model for blogs only"""
     
+    # Features, applications, stats and sidebar courses are BlogBlock rows
+    
     # Category choices (without emojis)
     CATEGORY_CHOICES = [
         ('excel', 'Excel'),
@@ -1648,6 +1123,8 @@ class DynamicBlog(models.Model):
     
     featured_image = models.ImageField(
         upload_to='blog/featured_images/',
+        validators=[validate_image_pixels],
+        storage=content_addressed_storage,
         help_text="Image for blog card (700x400px recommended)"
     )
     
@@ -1723,93 +1200,7 @@ class DynamicBlog(models.Model):
         blank=True
     )
     
-    # Feature 1
-    feature_1_title = models.CharField(
-        max_length=100,
-        default='Pivot Tables',
-        help_text="First feature title",
-        blank=True
-    )
-    
-    feature_1_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-table',
-        help_text="Icon for first feature"
-    )
-    
-    feature_1_content = models.TextField(
-        max_length=200,
-        default='Transform data into insights, create dynamic reports, and use slicers for interactive filtering.',
-        help_text="Description for first feature",
-        blank=True
-    )
-    
-    # Feature 2
-    feature_2_title = models.CharField(
-        max_length=100,
-        default='Power Query',
-        help_text="Second feature title",
-        blank=True
-    )
-    
-    feature_2_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-lightning-charge',
-        help_text="Icon for second feature"
-    )
-    
-    feature_2_content = models.TextField(
-        max_length=200,
-        default='Automate data cleaning, combine multiple sources, and create repeatable workflows.',
-        help_text="Description for second feature",
-        blank=True
-    )
-    
-    # Feature 3
-    feature_3_title = models.CharField(
-        max_length=100,
-        default='Advanced Formulas',
-        help_text="Third feature title",
-        blank=True
-    )
-    
-    feature_3_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-graph-up',
-        help_text="Icon for third feature"
-    )
-    
-    feature_3_content = models.TextField(
-        max_length=200,
-        default='Master INDEX-MATCH, XLOOKUP, dynamic arrays, and statistical functions.',
-        help_text="Description for third feature",
-        blank=True
-    )
-    
-    # Feature 4
-    feature_4_title = models.CharField(
-        max_length=100,
-        default='Data Visualization',
-        help_text="Fourth feature title",
-        blank=True
-    )
-    
-    feature_4_icon = models.CharField(
-        max_length=50,
-        choices=ICON_CHOICES,
-        default='bi-bar-chart',
-        help_text="Icon for fourth feature"
-    )
     
-    feature_4_content = models.TextField(
-        max_length=200,
-        default='Create compelling charts and dashboards that communicate insights effectively.',
-        help_text="Description for fourth feature",
-        blank=True
-    )
     
     # Section 3: Applications Section
     section_3_title = models.CharField(
@@ -1819,40 +1210,7 @@ class DynamicBlog(models.Model):
         blank=True
     )
     
-    application_1 = models.CharField(
-        max_length=200,
-        default='Business Reporting: Create automated dashboards that update with new data',
-        help_text="First application",
-        blank=True
-    )
-    
-    application_2 = models.CharField(
-        max_length=200,
-        default='Financial Analysis: Build models with scenario analysis and forecasting',
-        help_text="Second application",
-        blank=True
-    )
-    
-    application_3 = models.CharField(
-        max_length=200,
-        default='Sales Tracking: Analyze performance and predict future trends',
-        help_text="Third application",
-        blank=True
-    )
-    
-    application_4 = models.CharField(
-        max_length=200,
-        default='Inventory Management: Track stock levels and optimize ordering',
-        help_text="Fourth application",
-        blank=True
-    )
     
-    application_5 = models.CharField(
-        max_length=200,
-        default='Project Management: Create Gantt charts and track project timelines',
-        help_text="Fifth application",
-        blank=True
-    )
     
     # Section 4: Career Impact
     section_4_title = models.CharField(
@@ -1868,48 +1226,7 @@ class DynamicBlog(models.Model):
         blank=True
     )
     
-    # Statistics
-    stat_1_number = models.CharField(
-        max_length=50,
-        default='82%',
-        help_text="First statistic number",
-        blank=True
-    )
-    
-    stat_1_text = models.CharField(
-        max_length=100,
-        default='Jobs require Excel',
-        help_text="First statistic text",
-        blank=True
-    )
-    
-    stat_2_number = models.CharField(
-        max_length=50,
-        default='35%',
-        help_text="Second statistic number",
-        blank=True
-    )
-    
-    stat_2_text = models.CharField(
-        max_length=100,
-        default='Higher productivity',
-        help_text="Second statistic text",
-        blank=True
-    )
-    
-    stat_3_number = models.CharField(
-        max_length=50,
-        default='₹6-12L',
-        help_text="Third statistic number",
-        blank=True
-    )
     
-    stat_3_text = models.CharField(
-        max_length=100,
-        default='Salary boost',
-        help_text="Third statistic text",
-        blank=True
-    )
     
     # Call to Action
     cta_title = models.CharField(
@@ -2119,71 +1436,7 @@ class DynamicBlog(models.Model):
         blank=True
     )
     
-    # Course 1
-    course_1_title = models.CharField(
-        max_length=200,
-        default='Excel for Data Analysis',
-        help_text="First course title",
-        blank=True
-    )
-    
-    course_1_description = models.CharField(
-        max_length=200,
-        default='Learn powerful Excel tools for data analysis',
-        help_text="First course description",
-        blank=True
-    )
-    
-    course_1_link = models.CharField(
-        max_length=200,
-        default='/courses/excel-data-analysis',
-        help_text="First course URL",
-        blank=True
-    )
-    
-    # Course 2
-    course_2_title = models.CharField(
-        max_length=200,
-        default='Data Visualization',
-        help_text="Second course title",
-        blank=True
-    )
-    
-    course_2_description = models.CharField(
-        max_length=200,
-        default='Create compelling visualizations',
-        help_text="Second course description",
-        blank=True
-    )
-    
-    course_2_link = models.CharField(
-        max_length=200,
-        default='/courses/data-visualization',
-        help_text="Second course URL",
-        blank=True
-    )
-    
-    # Course 3
-    course_3_title = models.CharField(
-        max_length=200,
-        default='SQL for Data Analysis',
-        help_text="Third course title",
-        blank=True
-    )
-    
-    course_3_description = models.CharField(
-        max_length=200,
-        default='Extract and analyze data using SQL',
-        help_text="Third course description",
-        blank=True
-    )
     
-    course_3_link = models.CharField(
-        max_length=200,
-        default='/courses/sql-data-analysis',
-        help_text="Third course URL",
-        blank=True
-    )
     
     # Blog Categories Section
     show_categories_section = models.BooleanField(
@@ -2198,46 +1451,25 @@ class DynamicBlog(models.Model):
         blank=True
     )
     
-    # Category Counts (for display)
-    excel_count = models.IntegerField(
-        default=6,
-        help_text="Number of Excel blog posts",
-        validators=[MinValueValidator(0)]
-    )
-    
-    sql_count = models.IntegerField(
-        default=5,
-        help_text="Number of SQL blog posts",
-        validators=[MinValueValidator(0)]
-    )
-    
-    python_count = models.IntegerField(
-        default=4,
-        help_text="Number of Python blog posts",
-        validators=[MinValueValidator(0)]
-    )
-    
-    azure_count = models.IntegerField(
-        default=3,
-        help_text="Number of Azure blog posts",
-        validators=[MinValueValidator(0)]
-    )
-    
-    career_count = models.IntegerField(
-        default=2,
-        help_text="Number of Career Tips blog posts",
-        validators=[MinValueValidator(0)]
-    )
+    # Category counts in the sidebar are computed (blog_listing.category_facets)
     
     
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = DynamicBlogQuerySet.as_manager()
+    
     class Meta:
         ordering = ['display_order', '-publish_date']
         verbose_name = "Blog"  # Changed from "Dynamic Blog"
         verbose_name_plural = "Blogs"  # Changed from "Dynamic Blogs"
+        indexes = [
+            # Previous / next navigation: (publish_date, id) is a total order
+            models.Index(fields=['is_published', 'publish_date', 'id']),
+            # Related posts: newest in the same category
+            models.Index(fields=['is_published', 'category', 'publish_date', 'id']),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -2272,14 +1504,216 @@ class DynamicBlog(models.Model):
     
     
     
+class BlogNavigation(models.Model):
+    """Precomputed previous / next / related posts for a published blog"""
+    
+    blog = models.OneToOneField(
+        DynamicBlog,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='navigation'
+    )
+    
+    # Neighbours in (publish_date, id) order
+    previous_blog = models.ForeignKey(
+        DynamicBlog, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    next_blog = models.ForeignKey(
+        DynamicBlog, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    
+    # Top 3 related posts (newest first)
+    related_blog_1 = models.ForeignKey(
+        DynamicBlog, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    related_blog_2 = models.ForeignKey(
+        DynamicBlog, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    related_blog_3 = models.ForeignKey(
+        DynamicBlog, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    
+    class Meta:
+        verbose_name = "Blog Navigation"
+        verbose_name_plural = "Blog Navigation"
+    
+    def __str__(self):
+        return f"Navigation for blog {self.blog_id}"
+    
+    @property
+    def related_blog_ids(self):
+        ids = [self.related_blog_1_id, self.related_blog_2_id, self.related_blog_3_id]
+        return [blog_id for blog_id in ids if blog_id]
+
+
+class BlogCard(models.Model):
+    """Narrow copy of a published blog's card fields for the listing page"""
+    
+    blog = models.OneToOneField(
+        DynamicBlog,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='card'
+    )
+    title = models.CharField(max_length=200)
+    slug = models.SlugField(max_length=200)
+    category = models.CharField(max_length=50, choices=DynamicBlog.CATEGORY_CHOICES)
+    excerpt = models.TextField(max_length=200)
+    featured_image = models.ImageField(upload_to='blog/featured_images/', storage=content_addressed_storage)
+    publish_date = models.DateField()
+    read_time = models.CharField(max_length=50)
+    display_order = models.IntegerField(default=0)
+    featured = models.BooleanField(default=False)
+    # (display_order, -publish_date, -id) packed into one ascending string,
+    # so a listing page is a single index range (see blog_listing.py)
+    listing_key = models.CharField(max_length=32, default='')
+    
+    CATEGORY_CHOICES = DynamicBlog.CATEGORY_CHOICES
+    category_display = DynamicBlog.category_display
+    category_color = DynamicBlog.category_color
     
+    class Meta:
+        ordering = ['listing_key']
+        verbose_name = "Blog Card"
+        verbose_name_plural = "Blog Cards"
+        indexes = [
+            models.Index(fields=['listing_key']),
+            models.Index(fields=['category', 'listing_key']),
+        ]
     
+    def __str__(self):
+        return self.title
+
+
+class SearchDocument(models.Model):
+    """
+    Flattened text of one course, blog or project page for site search.
+
+    The full-text index over title + body lives in the database (a GIN
+    indexed tsvector column on Postgres, an FTS5 table locally); see
+    search.py and migration 0070.
+    """
+
+    KIND_CHOICES = [
+        ('course', 'Course'),
+        ('blog', 'Blog'),
+        ('project', 'Project'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=255)
+    url = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    is_public = models.BooleanField(
+        default=True,
+        help_text="Shown on /search/ (admin search also finds hidden rows)"
+    )
+
+    class Meta:
+        verbose_name = "Search Document"
+        verbose_name_plural = "Search Documents"
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
+
+
+class ImageRendition(models.Model):
+    """
+    One resized copy of an uploaded image, generated by renditions.py.
+
+    Keyed by the storage name of the original so every model that points
+    at the same file (DynamicBlog and BlogCard) shares the variants.
+    """
+
+    FORMAT_CHOICES = [
+        ('avif', 'AVIF'),
+        ('webp', 'WebP'),
+        ('jpeg', 'JPEG'),
+        ('png', 'PNG'),
+    ]
+
+    source = models.CharField(max_length=255, db_index=True)
+    format = models.CharField(max_length=4, choices=FORMAT_CHOICES)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    file = models.FileField(upload_to='renditions/', max_length=255)
+    size = models.PositiveIntegerField(help_text="File size in bytes")
+
+    class Meta:
+        ordering = ['source', 'format', 'width']
+        verbose_name = "Image Rendition"
+        verbose_name_plural = "Image Renditions"
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'format', 'width'], name='unique_image_rendition'),
+        ]
+
+    def __str__(self):
+        return f"{self.source} ({self.format}, {self.width}w)"
+
+
+class ImagePlaceholder(models.Model):
+    """Blurred preview and dominant colour shown while an uploaded image loads"""
+
+    source = models.CharField(max_length=255, unique=True)
+    # Both blank for images with transparency, which must not get a
+    # background behind them
+    lqip = models.TextField(blank=True, help_text="data: URI of a ~20px wide WebP")
+    color = models.CharField(max_length=7, blank=True, help_text="Dominant colour as #rrggbb")
+
+    class Meta:
+        verbose_name = "Image Placeholder"
+        verbose_name_plural = "Image Placeholders"
+
+    def __str__(self):
+        return self.source
+
+
+class RenditionJob(models.Model):
+    """Queued rendition work for one uploaded image, run by `manage.py rendition_worker`"""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    source = models.CharField(max_length=255, unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Rendition Job"
+        verbose_name_plural = "Rendition Jobs"
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f"{self.source} ({self.status})"
 
 
 class HeroSlide(models.Model):
     title = models.CharField(max_length=200)
     subtitle = models.TextField()
-    image = models.ImageField(upload_to="hero_slides/")
+    image = models.ImageField(
+        upload_to="hero_slides/",
+        validators=[validate_image_pixels],
+        storage=content_addressed_storage,
+    )
     order = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
 
@@ -2291,7 +1725,6 @@ class HeroSlide(models.Model):
 
 
 
-
 class Advisor(models.Model):
     """Model for Advisor/Mentor section"""
     
@@ -2309,6 +1742,8 @@ class Advisor(models.Model):
     
     image = models.ImageField(
         upload_to='advisors/',
+        validators=[validate_image_pixels],
+        storage=content_addressed_storage,
         help_text="Profile photo of the advisor (recommended size: 350x380px, JPG/PNG format)"
     )
     
@@ -2345,6 +1780,12 @@ class Advisor(models.Model):
         blank=True
     )
     
+    # Highlighted HTML (generated on save from the bio fields + keywords)
+    bio_part1_html = models.TextField(blank=True, editable=False)
+    bio_part2_html = models.TextField(blank=True, editable=False)
+    bio_hidden1_html = models.TextField(blank=True, editable=False)
+    bio_hidden2_html = models.TextField(blank=True, editable=False)
+    
     # Display Settings
     display_order = models.IntegerField(
         default=0,
@@ -2374,51 +1815,78 @@ class Advisor(models.Model):
             return [keyword.strip() for keyword in self.keywords_to_highlight.split('\n') if keyword.strip()]
         return []
     
-    def highlight_keywords_in_text(self, text):
-        """Automatically highlight keywords in the text"""
+    # Bio field -> stored highlighted HTML field
+    HIGHLIGHTED_FIELDS = {
+        'bio_part1': 'bio_part1_html',
+        'bio_part2': 'bio_part2_html',
+        'bio_hidden1': 'bio_hidden1_html',
+        'bio_hidden2': 'bio_hidden2_html',
+    }
+    
+    def get_keywords_pattern(self):
+        """Compile all keywords into one alternation (None if no keywords)"""
+        # Only highlight keywords longer than 2 characters; longest first so
+        # "Data Science & AI-ML" wins over "Data Science"
+        keywords = sorted(
+            {keyword for keyword in self.get_keywords_list() if len(keyword) > 2},
+            key=len,
+            reverse=True
+        )
+        if not keywords:
+            return None
+        return re.compile(
+            r'\b(' + '|'.join(re.escape(keyword) for keyword in keywords) + r')\b',
+            flags=re.IGNORECASE
+        )
+    
+    def highlight_keywords_in_text(self, text, pattern=None):
+        """Highlight every keyword in the text in a single pass"""
         if not text:
             return ""
         
-        # Get keywords list
-        keywords = self.get_keywords_list()
-        if not keywords:
+        if pattern is None:
+            pattern = self.get_keywords_pattern()
+        if pattern is None:
             return text
         
-        # Process the text to highlight keywords
-        processed_text = text
-        
-        # Sort keywords by length (longest first) to prevent partial matches
-        sorted_keywords = sorted(keywords, key=len, reverse=True)
-        
-        for keyword in sorted_keywords:
-            if keyword and len(keyword) > 2:  # Only highlight words longer than 2 characters
-                # Create a pattern that matches the whole word
-                pattern = r'\b(' + re.escape(keyword) + r')\b'
-                # Replace with highlighted span
-                processed_text = re.sub(
-                    pattern,
-                    r'<span class="advisor-highlight">\1</span>',
-                    processed_text,
-                    flags=re.IGNORECASE
-                )
-        
-        return processed_text
+        return pattern.sub(r'<span class="advisor-highlight">\1</span>', text)
+    
+    def render_highlighted_bios(self):
+        """Fill the *_html fields from the bio fields"""
+        pattern = self.get_keywords_pattern()
+        for source, target in self.HIGHLIGHTED_FIELDS.items():
+            setattr(self, target, self.highlight_keywords_in_text(getattr(self, source), pattern))
+    
+    def save(self, *args, **kwargs):
+        self.render_highlighted_bios()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | set(self.HIGHLIGHTED_FIELDS.values())
+        super().save(*args, **kwargs)
+    
+    def _highlighted(self, source):
+        # Rows saved before the *_html columns existed fall back to live
+        # highlighting until `manage.py backfill_advisor_highlights` runs
+        html = getattr(self, self.HIGHLIGHTED_FIELDS[source])
+        if html or not getattr(self, source):
+            return html
+        return self.highlight_keywords_in_text(getattr(self, source))
     
     def get_highlighted_bio_part1(self):
         """Get bio part 1 with highlighted keywords"""
-        return self.highlight_keywords_in_text(self.bio_part1)
+        return self._highlighted('bio_part1')
     
     def get_highlighted_bio_part2(self):
         """Get bio part 2 with highlighted keywords"""
-        return self.highlight_keywords_in_text(self.bio_part2)
+        return self._highlighted('bio_part2')
     
     def get_highlighted_bio_hidden1(self):
         """Get hidden bio part 1 with highlighted keywords"""
-        return self.highlight_keywords_in_text(self.bio_hidden1)
+        return self._highlighted('bio_hidden1')
     
     def get_highlighted_bio_hidden2(self):
         """Get hidden bio part 2 with highlighted keywords"""
-        return self.highlight_keywords_in_text(self.bio_hidden2)
+        return self._highlighted('bio_hidden2')
     
     def has_more_content(self):
         """Check if advisor has additional content for Read More section"""
@@ -2437,6 +1905,8 @@ class GalleryImage(models.Model):
     
     image = models.ImageField(
         upload_to='gallery/',
+        validators=[validate_image_pixels],
+        storage=content_addressed_storage,
         help_text="Upload gallery image (recommended size: 800x600px)"
     )
     
@@ -2554,6 +2024,8 @@ class CompanyLogo(models.Model):
     
     logo = models.ImageField(
         upload_to='placements/company_logos/',
+        validators=[validate_image_pixels],
+        storage=content_addressed_storage,
         help_text="Company logo image"
     )
     
@@ -2585,6 +2057,37 @@ class CompanyLogo(models.Model):
         return self.company_name
 
 
+class LogoSpriteSheet(models.Model):
+    """
+    Active company logos of a placements section packed into one image,
+    rebuilt by logo_sprites.py whenever the logos change
+    """
+
+    placements_section = models.ForeignKey(
+        PlacementsSection,
+        on_delete=models.CASCADE,
+        related_name='logo_sprite_sheets',
+    )
+    index = models.PositiveSmallIntegerField(default=0)
+    # Hash of the packed logos (ids, files, order); equal means up to date
+    signature = models.CharField(max_length=64)
+    webp = models.FileField(upload_to='sprites/', storage=content_addressed_storage, max_length=255)
+    png = models.FileField(upload_to='sprites/', storage=content_addressed_storage, max_length=255)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    positions = models.JSONField(default=dict, help_text="{logo id: [x, y, width, height]}")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['placements_section', 'index']
+        unique_together = ('placements_section', 'index')
+        verbose_name = "Logo Sprite Sheet"
+        verbose_name_plural = "Logo Sprite Sheets"
+
+    def __str__(self):
+        return f"{self.placements_section} sheet {self.index}"
+
+
 class ManyMoreCompanies(models.Model):
     """'And Many More' section at the end"""
     
@@ -2628,8 +2131,6 @@ class ManyMoreCompanies(models.Model):
     
     
 
-
-
 from django.db import models
 
 
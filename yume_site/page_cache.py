@@ -0,0 +1,168 @@
+import contextvars
+import hashlib
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_init
+from django.http import HttpResponse
+
+from .cache_utils import get_versions, bump_version
+
+
+# =========================
+# DEPENDENCY TAGS
+# =========================
+# Every cached page remembers the version of each tag it depends on:
+#   "page_tag:yume_site.advisor"      -> any Advisor row (lists, filters)
+#   "page_tag:yume_site.advisor:12"   -> the Advisor with pk 12
+# Saving or deleting a row bumps its model tag, its own pk tag and the pk
+# tags of the rows it points to (a CompanyLogo bumps its PlacementsSection),
+# so only pages that read the changed rows are thrown away.
+
+PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+
+_recorded_tags = contextvars.ContextVar("page_cache_recorded", default=None)
+
+
+def model_tag(model):
+    return f"page_tag:{model._meta.label_lower}"
+
+
+def instance_tag(model, pk):
+    return f"page_tag:{model._meta.label_lower}:{pk}"
+
+
+@contextmanager
+def record_dependencies():
+    """Collect the tags of everything read inside the block"""
+    outer = _recorded_tags.get()
+    recorded = set()
+    token = _recorded_tags.set(recorded)
+    try:
+        yield recorded
+    finally:
+        _recorded_tags.reset(token)
+        if outer is not None:
+            outer.update(recorded)
+
+
+def note_dependencies(tags):
+    """Add tags to the active recorder, if any"""
+    recorded = _recorded_tags.get()
+    if recorded is not None:
+        recorded.update(tags)
+
+
+def record_instance(sender, instance, **kwargs):
+    """post_init hook: remember every row loaded while a page renders"""
+    recorded = _recorded_tags.get()
+    if recorded is not None and instance.pk is not None:
+        recorded.add(instance_tag(sender, instance.pk))
+
+
+post_init.connect(record_instance)
+
+
+def tags_for_instance(instance):
+    """Every tag a saved/deleted row can appear under"""
+    model = type(instance)
+    tags = [model_tag(model)]
+    if instance.pk is not None:
+        tags.append(instance_tag(model, instance.pk))
+
+    # A child row change (logo, FAQ, detail page) changes its parent's page
+    for field in model._meta.concrete_fields:
+        if field.many_to_one or field.one_to_one:
+            parent_pk = getattr(instance, field.attname)
+            if parent_pk is not None:
+                tags.append(instance_tag(field.related_model, parent_pk))
+    return tags
+
+
+def invalidate_tags(tags):
+    """Drop every cached page that depends on one of `tags`"""
+    tags = list(tags)
+
+    # After commit: a page rendered from the old rows while the admin
+    # transaction is still open must not survive the bump
+    def bump():
+        for tag in tags:
+            bump_version(tag)
+
+    transaction.on_commit(bump)
+
+
+def invalidate_instance(instance):
+    """Drop every cached page that read the saved/deleted row"""
+    invalidate_tags(tags_for_instance(instance))
+
+
+# =========================
+# VIEW DECORATOR
+# =========================
+def _is_cacheable_request(request):
+    if not getattr(settings, "PAGE_CACHE_ENABLED", True):
+        return False
+    if request.method not in ("GET", "HEAD"):
+        return False
+    # Logged-in editors (admin preview) always see a fresh page
+    return settings.SESSION_COOKIE_NAME not in request.COOKIES
+
+
+def _page_key(request):
+    url = f"{request.get_host()}{request.get_full_path()}"
+    return "page:" + hashlib.md5(url.encode()).hexdigest()
+
+
+def cached_public_page(*models):
+    """
+    Cache an anonymous GET page until one of its dependencies changes.
+
+    `models` are the model classes the view lists or filters on. Rows the
+    view actually loads are recorded automatically, so detail pages only
+    need to name the models they query as lists.
+    """
+    declared = sorted(model_tag(model) for model in models)
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            note_dependencies(declared)
+            if not _is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+
+            key = _page_key(request)
+            entry = cache.get(key)
+            if entry is not None:
+                content, content_type, tag_versions = entry
+                if get_versions(list(tag_versions)) == tag_versions:
+                    note_dependencies(tag_versions)
+                    response = HttpResponse(content, content_type=content_type)
+                    response["X-Page-Cache"] = "HIT"
+                    return response
+
+            # Versions are read before rendering so a save that lands
+            # mid-render leaves the stored page already stale
+            tag_versions = get_versions(declared)
+            with record_dependencies() as recorded:
+                response = view_func(request, *args, **kwargs)
+
+            if (
+                response.status_code == 200
+                and not response.streaming
+                and not response.cookies
+                and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+            ):
+                tag_versions.update(get_versions(sorted(recorded)))
+                cache.set(
+                    key,
+                    (response.content, response["Content-Type"], tag_versions),
+                    PAGE_CACHE_TIMEOUT,
+                )
+                response["X-Page-Cache"] = "MISS"
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,451 @@
+import fcntl
+import logging
+import math
+import os
+import re
+import tempfile
+from collections import Counter
+from contextlib import contextmanager
+
+import numpy as np
+from django.conf import settings
+
+from .models import BlogBlock, BlogNavigation, DynamicBlog
+from .page_cache import instance_tag
+from .site_snapshot import append_lines, read_lines, refresh_pages
+
+logger = logging.getLogger(__name__)
+
+
+# =========================
+# CONTENT-BASED RELATED POSTS
+# =========================
+# Each published blog becomes an L2-normalised TF-IDF vector over its title,
+# excerpt, content sections and feature blocks. The vectors live in CSR arrays
+# (indptr / indices / data) so 50k posts take a few tens of MB, and cosine
+# similarities are computed one block of posts at a time against all posts.
+#
+# `manage.py build_related_blogs` builds the index from scratch and saves it
+# to RELATED_BLOGS_INDEX_PATH. A single blog save then re-scores only that
+# blog and the posts whose top-k it enters or leaves, using the saved
+# vocabulary and IDF weights (new words count from the next full build).
+# Saves only queue the blog id once they commit; the rendition worker
+# re-scores the queued blogs in one pass under a file lock
+# (refresh_pending_related), so a rolled back save changes nothing and the
+# admin request never loads or writes the index.
+
+TEXT_FIELDS = ['title', 'excerpt', 'section_1_content', 'section_4_content']
+TEXT_BLOCKS = ['feature']
+
+TOP_K = 3
+MIN_DF = 2            # a word in one post only never makes two posts similar
+MAX_DF = 0.5          # words in more than half the posts carry no signal...
+MAX_DF_MIN_DOCS = 20  # ...once there are enough posts to tell
+QUERY_BLOCK = 256     # posts scored per block
+GATHER_BUDGET = 16 * 1024 * 1024  # (post, query) term matches per step
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]+")
+
+STOP_WORDS = frozenset("""
+    a about above after again all also am an and any are as at be because been
+    before being below between both but by can could did do does doing down
+    during each few for from further had has have having he her here hers him
+    his how i if in into is it its itself just me more most my no nor not now
+    of off on once only or other our ours out over own same she should so some
+    such than that the their theirs them then there these they this those
+    through to too under until up very was we were what when where which while
+    who whom why will with would you your yours
+""".split())
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def blog_texts(blog_ids=None):
+    """{blog id: text} for published blogs (all of them by default)"""
+    blogs = DynamicBlog.objects.filter(is_published=True)
+    blocks = BlogBlock.objects.filter(kind__in=TEXT_BLOCKS, blog__is_published=True)
+    if blog_ids is not None:
+        blogs = blogs.filter(id__in=blog_ids)
+        blocks = blocks.filter(blog_id__in=blog_ids)
+
+    texts = {}
+    for values in blogs.order_by('id').values('id', *TEXT_FIELDS).iterator(chunk_size=2000):
+        texts[values['id']] = [values[field] or "" for field in TEXT_FIELDS]
+    for blog_id, title, text in blocks.values_list('blog_id', 'title', 'text').iterator(chunk_size=2000):
+        texts[blog_id] += [title, text]
+    return {blog_id: " ".join(parts) for blog_id, parts in texts.items()}
+
+
+def index_path():
+    path = getattr(settings, 'RELATED_BLOGS_INDEX_PATH', None)
+    return str(path) if path else None
+
+
+@contextmanager
+def index_lock():
+    """Exclusive hold on the saved index across threads and worker processes"""
+    path = index_path()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.lock", "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+# =========================
+# INDEX
+# =========================
+class RelatedIndex:
+    """TF-IDF vectors of all published blogs plus everyone's current top-k"""
+
+    def __init__(self, ids, terms, idf, indptr, indices, data, topk_ids, topk_scores):
+        self.ids = ids                    # (N,) blog ids, row order
+        self.terms = terms                # (V,) vocabulary, column order
+        self.idf = idf                    # (V,) float32
+        self.indptr = indptr              # (N + 1,) CSR row offsets
+        self.indices = indices            # (nnz,) int32 columns
+        self.data = data                  # (nnz,) float32 weights
+        self.topk_ids = topk_ids          # (N, k) blog ids, -1 = empty
+        self.topk_scores = topk_scores    # (N, k) float32, descending
+        self.columns = {term: col for col, term in enumerate(terms.tolist())}
+        self.rows = {blog_id: row for row, blog_id in enumerate(ids.tolist())}
+
+    # ---------- VECTORS ----------
+
+    def vectorize(self, text):
+        """(columns, weights) of one document with this index's vocabulary"""
+        counts = Counter(token for token in tokenize(text) if token in self.columns)
+        return _weights(counts, self.columns, self.idf)
+
+    def set_row(self, blog_id, vector):
+        """Insert or replace one blog's vector"""
+        cols, vals = vector
+        row = self.rows.get(blog_id)
+        if row is None:
+            self.ids = np.append(self.ids, blog_id)
+            self.indices = np.concatenate([self.indices, cols])
+            self.data = np.concatenate([self.data, vals])
+            self.indptr = np.append(self.indptr, len(self.indices))
+            self.topk_ids = np.vstack([self.topk_ids, np.full((1, TOP_K), -1, dtype=np.int64)])
+            self.topk_scores = np.vstack([self.topk_scores, np.zeros((1, TOP_K), dtype=np.float32)])
+            self.rows[blog_id] = len(self.ids) - 1
+            return
+
+        lo, hi = self.indptr[row], self.indptr[row + 1]
+        self.indices = np.concatenate([self.indices[:lo], cols, self.indices[hi:]])
+        self.data = np.concatenate([self.data[:lo], vals, self.data[hi:]])
+        self.indptr[row + 1:] += len(cols) - (hi - lo)
+
+    def remove_row(self, blog_id):
+        row = self.rows.pop(blog_id, None)
+        if row is None:
+            return
+        lo, hi = self.indptr[row], self.indptr[row + 1]
+        self.indices = np.delete(self.indices, np.s_[lo:hi])
+        self.data = np.delete(self.data, np.s_[lo:hi])
+        self.indptr = np.delete(self.indptr, row + 1)
+        self.indptr[row + 1:] -= hi - lo
+        self.ids = np.delete(self.ids, row)
+        self.topk_ids = np.delete(self.topk_ids, row, axis=0)
+        self.topk_scores = np.delete(self.topk_scores, row, axis=0)
+        self.rows = {blog_id: row for row, blog_id in enumerate(self.ids.tolist())}
+
+    def row_vector(self, row):
+        lo, hi = self.indptr[row], self.indptr[row + 1]
+        return self.indices[lo:hi], self.data[lo:hi]
+
+    # ---------- SIMILARITY ----------
+
+    def scores(self, vectors):
+        """Cosine similarity of each vector against every row: (N, len(vectors))"""
+        n_rows = len(self.ids)
+        block = len(vectors)
+        result = np.zeros((n_rows, block), dtype=np.float32)
+        if not block:
+            return result
+
+        # The query vectors as one list of (term, query column, weight), by term
+        query_terms = np.concatenate([cols for cols, vals in vectors])
+        query_cols = np.repeat(np.arange(block), [len(cols) for cols, vals in vectors])
+        query_vals = np.concatenate([vals for cols, vals in vectors])
+        order = np.argsort(query_terms, kind='stable')
+        query_terms, query_cols, query_vals = query_terms[order], query_cols[order], query_vals[order]
+        terms, term_starts, term_counts = np.unique(query_terms, return_index=True, return_counts=True)
+        if not len(terms):
+            return result
+
+        max_nnz = max(1, GATHER_BUDGET // block)
+        start = 0
+        while start < n_rows:
+            # Largest run of rows whose term matches stay within budget
+            end = int(np.searchsorted(self.indptr, self.indptr[start] + max_nnz, side='right')) - 1
+            end = min(max(end, start + 1), n_rows)
+            lo, hi = self.indptr[start], self.indptr[end]
+            if hi > lo:
+                # Only the row entries whose term is in some query vector
+                position = np.searchsorted(terms, self.indices[lo:hi])
+                position[position == len(terms)] = 0
+                hits = np.flatnonzero(terms[position] == self.indices[lo:hi])
+                position = position[hits]
+                rows = np.repeat(np.arange(end - start), np.diff(self.indptr[start:end + 1]))[hits]
+
+                # Each hit pairs with every query entry of its term
+                counts = term_counts[position]
+                firsts = np.repeat(term_starts[position] - np.cumsum(counts) + counts, counts)
+                entries = firsts + np.arange(counts.sum())
+                products = np.repeat(self.data[lo:hi][hits], counts) * query_vals[entries]
+                cells = np.repeat(rows, counts) * block + query_cols[entries]
+                result[start:end] = np.bincount(
+                    cells, weights=products, minlength=(end - start) * block
+                ).reshape(end - start, block)
+            start = end
+        return result
+
+    def top_k(self, rows):
+        """Best TOP_K (ids, scores) for the given rows, similarity > 0 only"""
+        vectors = [self.row_vector(row) for row in rows]
+        scores = self.scores(vectors)
+        scores[rows, np.arange(len(rows))] = 0  # never related to itself
+        return _top_k_columns(scores, self.ids)
+
+    def recompute(self, rows):
+        for start in range(0, len(rows), QUERY_BLOCK):
+            block = rows[start:start + QUERY_BLOCK]
+            ids, scores = self.top_k(block)
+            self.topk_ids[block] = ids
+            self.topk_scores[block] = scores
+
+    # ---------- STORAGE ----------
+
+    def save(self, path):
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".npz")
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                np.savez(
+                    tmp,
+                    ids=self.ids, terms=self.terms, idf=self.idf,
+                    indptr=self.indptr, indices=self.indices, data=self.data,
+                    topk_ids=self.topk_ids, topk_scores=self.topk_scores,
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as stored:
+            return cls(**{name: stored[name] for name in stored.files})
+
+
+def _weights(counts, columns, idf):
+    if not counts:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+    cols = np.fromiter((columns[term] for term in counts), dtype=np.int32, count=len(counts))
+    tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+    vals = (1 + np.log(tf)) * idf[cols]
+    vals /= np.linalg.norm(vals)
+    order = np.argsort(cols)
+    return cols[order], vals[order].astype(np.float32)
+
+
+def _top_k_columns(scores, ids):
+    """Per column of an (N, B) score matrix: TOP_K best (ids, scores)"""
+    n_rows, block = scores.shape
+    top_ids = np.full((block, TOP_K), -1, dtype=np.int64)
+    top_scores = np.zeros((block, TOP_K), dtype=np.float32)
+    if n_rows == 0:
+        return top_ids, top_scores
+
+    k = min(TOP_K, n_rows)
+    by_column = scores.T
+    if n_rows > k:
+        candidates = np.argpartition(-by_column, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.tile(np.arange(n_rows), (block, 1))
+    candidate_scores = np.take_along_axis(by_column, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind='stable')
+    candidates = np.take_along_axis(candidates, order, axis=1)
+    candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+    found = candidate_scores > 0
+    top_ids[:, :k] = np.where(found, ids[candidates], -1)
+    top_scores[:, :k] = np.where(found, candidate_scores, 0)
+    return top_ids, top_scores
+
+
+def build_index():
+    """Vectorise every published blog and compute everyone's top-k"""
+    ids = []
+    documents = []
+    document_frequency = Counter()
+    for blog_id, text in blog_texts().items():
+        counts = Counter(tokenize(text))
+        ids.append(blog_id)
+        documents.append(counts)
+        document_frequency.update(counts.keys())
+
+    n_docs = len(documents)
+    max_df = MAX_DF * n_docs if n_docs >= MAX_DF_MIN_DOCS else n_docs
+    terms = sorted(
+        term for term, df in document_frequency.items()
+        if MIN_DF <= df <= max_df
+    )
+    columns = {term: col for col, term in enumerate(terms)}
+    idf = np.array(
+        [math.log((1 + n_docs) / (1 + document_frequency[term])) + 1 for term in terms],
+        dtype=np.float32,
+    )
+
+    indptr = [0]
+    indices = []
+    data = []
+    for counts in documents:
+        cols, vals = _weights(
+            Counter({term: tf for term, tf in counts.items() if term in columns}),
+            columns,
+            idf,
+        )
+        indices.append(cols)
+        data.append(vals)
+        indptr.append(indptr[-1] + len(cols))
+    documents.clear()
+
+    index = RelatedIndex(
+        ids=np.array(ids, dtype=np.int64),
+        terms=np.array(terms, dtype=str),
+        idf=idf,
+        indptr=np.array(indptr, dtype=np.int64),
+        indices=np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32),
+        data=np.concatenate(data) if data else np.zeros(0, dtype=np.float32),
+        topk_ids=np.full((n_docs, TOP_K), -1, dtype=np.int64),
+        topk_scores=np.zeros((n_docs, TOP_K), dtype=np.float32),
+    )
+    index.recompute(np.arange(n_docs))
+    return index
+
+
+def load_index():
+    path = index_path()
+    if not path or not os.path.exists(path):
+        return None
+    return RelatedIndex.load(path)
+
+
+# =========================
+# DATABASE
+# =========================
+def _related_values(topk_ids):
+    values = [int(blog_id) if blog_id >= 0 else None for blog_id in topk_ids]
+    return {f'related_blog_{i}_id': blog_id for i, blog_id in enumerate(values, start=1)}
+
+
+def apply_index(index, rows=None):
+    """Copy the index's top-k into BlogNavigation (all rows by default)"""
+    if rows is None:
+        rows = range(len(index.ids))
+    navigation = [
+        BlogNavigation(blog_id=int(index.ids[row]), **_related_values(index.topk_ids[row]))
+        for row in rows
+    ]
+    BlogNavigation.objects.bulk_update(
+        navigation,
+        ['related_blog_1', 'related_blog_2', 'related_blog_3'],
+        batch_size=1000,
+    )
+
+
+def rebuild_related_blogs():
+    """Full offline build; returns the index"""
+    index = build_index()
+    with index_lock():
+        index.save(index_path())
+        apply_index(index)
+    return index
+
+
+def has_index():
+    path = index_path()
+    return bool(path) and os.path.exists(path)
+
+
+def pending_path():
+    """Ids of the blogs waiting to be re-scored"""
+    return f"{index_path()}.pending"
+
+
+def queue_related_blog(blog_id):
+    """Have the worker re-score a saved blog (call after commit)"""
+    append_lines(pending_path(), [blog_id])
+
+
+def refresh_related_blogs(blog_ids):
+    """
+    Re-score changed blogs from their committed state (removed from the
+    index when deleted or unpublished), loading and saving the index once.
+    The caller holds index_lock().
+    """
+    index = load_index()
+    if index is None:
+        return
+
+    texts = blog_texts(blog_ids)
+    stale = set()
+    for blog_id in blog_ids:
+        # Everyone who listed this blog may lose it: fully re-score them
+        stale.update(int(index.ids[row]) for row in np.flatnonzero((index.topk_ids == blog_id).any(axis=1)))
+
+        text = texts.get(blog_id)
+        if text is not None:
+            index.set_row(blog_id, index.vectorize(text))
+            row = index.rows[blog_id]
+            similarity = index.scores([index.row_vector(row)])[:, 0]
+            similarity[row] = 0
+
+            # Blogs it now beats their k-th neighbour for pick it up
+            entering = np.flatnonzero(similarity > index.topk_scores[:, -1])
+            stale.update(int(index.ids[other]) for other in entering)
+            stale.add(blog_id)
+        else:
+            index.remove_row(blog_id)
+
+    rows = np.array(sorted(index.rows[other] for other in stale if other in index.rows), dtype=np.int64)
+    before = index.topk_ids[rows].copy()
+    index.recompute(rows)
+    # Saved last: a failed run is retried from the old index, in full
+    apply_index(index, rows)
+    index.save(index_path())
+
+    # Pages showing related posts that changed (queryset writes fire no signals)
+    changed = rows[(index.topk_ids[rows] != before).any(axis=1)]
+    refresh_pages(instance_tag(BlogNavigation, int(index.ids[row])) for row in changed)
+
+
+def refresh_pending_related():
+    """Re-score the queued blogs (rendition worker); returns how many"""
+    if not index_path():
+        return 0
+    pending = pending_path()
+    # Claimed first, so ids queued meanwhile wait for the next round; a
+    # claim left by a failed or killed worker is picked up again
+    claimed = pending + ".claimed"
+    with index_lock():
+        if not os.path.exists(claimed):
+            try:
+                os.replace(pending, claimed)
+            except FileNotFoundError:
+                return 0
+        blog_ids = list(dict.fromkeys(int(blog_id) for blog_id in read_lines(claimed)))
+        try:
+            refresh_related_blogs(blog_ids)
+        except Exception:
+            logger.exception("Related posts refresh failed for blogs %s", blog_ids)
+            return 0
+        os.remove(claimed)
+    return len(blog_ids)
@@ -0,0 +1,83 @@
+import datetime
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import RenditionJob
+from .page_cache import invalidate_tags, tags_for_instance
+from .renditions import IMAGE_FIELDS, store_renditions
+from .site_snapshot import instance_urls, refresh_for_tags
+
+
+# =========================
+# RENDITION JOB QUEUE
+# =========================
+# Uploads queue one RenditionJob per image (renditions.queue_renditions);
+# `manage.py rendition_worker` claims due jobs, encodes them in a process
+# pool and records the result here. Until a job is done the templates show
+# the original upload.
+
+MAX_ATTEMPTS = 4
+# Doubled after every failed attempt
+RETRY_DELAY = datetime.timedelta(seconds=30)
+# A running job this old belonged to a worker that died
+STALE_AFTER = datetime.timedelta(minutes=15)
+
+
+def claim_jobs(limit):
+    """Mark up to `limit` due jobs running; returns [(job id, source), ...]"""
+    now = timezone.now()
+    with transaction.atomic():
+        due = (
+            RenditionJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=RenditionJob.PENDING, run_after__lte=now)
+            .order_by('run_after', 'id')
+        )
+        jobs = list(due.values_list('id', 'source')[:limit])
+        RenditionJob.objects.filter(id__in=[job_id for job_id, source in jobs]).update(
+            status=RenditionJob.RUNNING, attempts=F('attempts') + 1, updated_at=now,
+        )
+    return jobs
+
+
+def release_stale_jobs():
+    """Put jobs left running by a killed worker back in the queue"""
+    return RenditionJob.objects.filter(
+        status=RenditionJob.RUNNING, updated_at__lt=timezone.now() - STALE_AFTER,
+    ).update(status=RenditionJob.PENDING, updated_at=timezone.now())
+
+
+def finish_job(job_id, source, rows, placeholder):
+    store_renditions(source, rows, placeholder)
+    # A re-upload re-queued the job while it ran: leave it pending
+    RenditionJob.objects.filter(pk=job_id, status=RenditionJob.RUNNING).update(
+        status=RenditionJob.DONE, last_error='', updated_at=timezone.now(),
+    )
+    refresh_owner_pages(source)
+
+
+def fail_job(job_id, error):
+    """Retry with backoff, or give up after MAX_ATTEMPTS"""
+    job = RenditionJob.objects.get(pk=job_id)
+    job.last_error = error
+    if job.attempts >= MAX_ATTEMPTS:
+        job.status = RenditionJob.FAILED
+    else:
+        job.status = RenditionJob.PENDING
+        job.run_after = timezone.now() + RETRY_DELAY * 2 ** (job.attempts - 1)
+    job.save(update_fields=['status', 'run_after', 'last_error', 'updated_at'])
+    return job
+
+
+def refresh_owner_pages(source):
+    """Pages cached with the original upload pick up the new srcset"""
+    tags, urls = set(), []
+    for model, field_name in IMAGE_FIELDS:
+        for instance in model.objects.filter(**{field_name: source}):
+            tags.update(tags_for_instance(instance))
+            urls += instance_urls(instance)
+    # One pass for every owner; the snapshot pages are queued for this worker
+    invalidate_tags(tags)
+    refresh_for_tags(tags, urls)
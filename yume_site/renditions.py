@@ -0,0 +1,271 @@
+import base64
+import io
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+import numpy as np
+from PIL import Image, ImageOps, features
+
+from .models import (
+    Advisor, CompanyLogo, Course, DynamicBlog, GalleryImage, HeroSlide,
+    ImagePlaceholder, ImageRendition, ProjectCard, ProjectDetail, RenditionJob,
+)
+
+
+# =========================
+# RESPONSIVE IMAGE RENDITIONS
+# =========================
+# Every uploaded image gets width-stepped copies in AVIF (when Pillow was
+# built with it), WebP and a JPEG fallback (PNG for images with
+# transparency). The {% responsive_image %} tag turns them into a
+# <picture> with srcset/sizes so phones stop downloading desktop images.
+# Uploads only queue a RenditionJob; `manage.py rendition_worker` does the
+# encoding outside the web request. The same pass stores an ImagePlaceholder
+# (blurred preview + dominant colour) painted behind the image while it loads.
+
+IMAGE_FIELDS = [
+    (HeroSlide, 'image'),
+    (Advisor, 'image'),
+    (GalleryImage, 'image'),
+    (CompanyLogo, 'logo'),
+    (DynamicBlog, 'featured_image'),
+    (ProjectCard, 'thumbnail_image'),
+    (ProjectDetail, 'hero_image'),
+    (Course, 'image'),
+]
+
+FIELDS_BY_MODEL = {}
+for model, field_name in IMAGE_FIELDS:
+    FIELDS_BY_MODEL.setdefault(model, []).append(field_name)
+
+# Originals wider than the last step are capped to it
+RENDITION_WIDTHS = (320, 640, 960, 1280, 1920)
+
+ENCODER_OPTIONS = {
+    'avif': {'quality': 55, 'speed': 8},
+    'webp': {'quality': 78, 'method': 4},
+    'jpeg': {'quality': 82, 'optimize': True, 'progressive': True},
+    'png': {'optimize': True},
+}
+
+PLACEHOLDER_WIDTH = 20
+
+MIME_TYPES = {
+    'avif': 'image/avif',
+    'webp': 'image/webp',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+}
+
+
+def has_alpha(image):
+    return image.mode in ('RGBA', 'LA', 'PA') or (
+        image.mode == 'P' and 'transparency' in image.info
+    )
+
+
+def output_formats(alpha):
+    """Modern formats first, then the fallback every browser can show"""
+    modern = [fmt for fmt in ('avif', 'webp') if features.check(fmt)]
+    return modern + ['png' if alpha else 'jpeg']
+
+
+def target_widths(width):
+    widths = [step for step in RENDITION_WIDTHS if step < width]
+    if width <= RENDITION_WIDTHS[-1]:
+        widths.append(width)
+    return widths
+
+
+def rendition_name(source, width, fmt):
+    """renditions/blog/featured_images/post/640.webp for blog/featured_images/post.jpg"""
+    stem = PurePosixPath(source).with_suffix('')
+    return f"renditions/{stem}/{width}.{fmt}"
+
+
+def open_source(name, draft_size=None):
+    with default_storage.open(name) as source:
+        image = Image.open(source)
+        if draft_size:
+            # JPEGs decode straight at a reduced scale (still >= draft_size)
+            image.draft('RGB', draft_size)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    alpha = has_alpha(image)
+    return image.convert('RGBA' if alpha else 'RGB'), alpha
+
+
+def dominant_color(image):
+    """Mean colour of the most common 4-bit-per-channel bin"""
+    small = image.copy()
+    small.thumbnail((64, 64))
+    pixels = np.asarray(small, dtype=np.uint8).reshape(-1, 3)
+    bins = (pixels >> 4).astype(np.int32)
+    keys = (bins[:, 0] << 8) | (bins[:, 1] << 4) | bins[:, 2]
+    top = np.bincount(keys, minlength=4096).argmax()
+    red, green, blue = pixels[keys == top].mean(axis=0).round().astype(int)
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def make_placeholder(image, alpha):
+    """{'lqip': data URI, 'color': '#rrggbb'} for ImagePlaceholder"""
+    if alpha:
+        return {'lqip': '', 'color': ''}
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    buffer = io.BytesIO()
+    image.resize((PLACEHOLDER_WIDTH, height), Image.BOX).save(buffer, 'WEBP', quality=40)
+    encoded = base64.b64encode(buffer.getvalue()).decode('ascii')
+    return {'lqip': f"data:image/webp;base64,{encoded}", 'color': dominant_color(image)}
+
+
+def render_renditions(name):
+    """
+    Write every rendition file of the stored image `name` and return the
+    rows to record plus the placeholder. Touches storage only, never the
+    database, so it can run in a worker process (see rendition_jobs.py).
+    """
+    image, alpha = open_source(name)
+    formats = output_formats(alpha)
+
+    rows = []
+    current = image
+    # Widest first, each step resized from the previous one
+    for width in sorted(target_widths(image.width), reverse=True):
+        height = max(1, round(image.height * width / image.width))
+        if current.size != (width, height):
+            current = current.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            buffer = io.BytesIO()
+            current.save(buffer, fmt.upper(), **ENCODER_OPTIONS[fmt])
+            path = rendition_name(name, width, fmt)
+            # Storage.save() never overwrites, it would pick a new name
+            default_storage.delete(path)
+            saved = default_storage.save(path, ContentFile(buffer.getvalue()))
+            rows.append({
+                'format': fmt, 'width': width, 'height': height,
+                'file': saved, 'size': buffer.tell(),
+            })
+    # The narrowest rendition is plenty for a 20px preview
+    return rows, make_placeholder(current, alpha)
+
+
+def render_placeholder(name):
+    image, alpha = open_source(name, draft_size=(256, 256))
+    return make_placeholder(image, alpha)
+
+
+def store_placeholder(name, placeholder):
+    ImagePlaceholder.objects.update_or_create(source=name, defaults=placeholder)
+
+
+def store_renditions(name, rows, placeholder):
+    """Replace the recorded renditions and placeholder of `name`; returns the rendition count"""
+    kept = {row['file'] for row in rows}
+    with transaction.atomic():
+        old = ImageRendition.objects.filter(source=name)
+        stale = [path for path in old.values_list('file', flat=True) if path not in kept]
+        old.delete()
+        ImageRendition.objects.bulk_create([ImageRendition(source=name, **row) for row in rows])
+        store_placeholder(name, placeholder)
+    for path in stale:
+        default_storage.delete(path)
+    return len(rows)
+
+
+def generate_renditions(name):
+    """(Re)build every rendition of `name` in this process"""
+    return store_renditions(name, *render_renditions(name))
+
+
+def queue_renditions(name):
+    """(Re)queue a rendition job; written in the caller's transaction"""
+    RenditionJob.objects.update_or_create(
+        source=name,
+        defaults={
+            'status': RenditionJob.PENDING,
+            'attempts': 0,
+            'run_after': timezone.now(),
+            'last_error': '',
+        },
+    )
+
+
+def ensure_renditions(instance):
+    """Queue renditions for image fields of a saved instance that have none yet"""
+    deferred = instance.get_deferred_fields()
+    for field_name in FIELDS_BY_MODEL.get(type(instance), ()):
+        if field_name in deferred:
+            continue
+        name = getattr(instance, field_name).name
+        if not name or ImageRendition.objects.filter(source=name).exists():
+            continue
+        active = (RenditionJob.PENDING, RenditionJob.RUNNING)
+        if not RenditionJob.objects.filter(source=name, status__in=active).exists():
+            queue_renditions(name)
+
+
+def source_names():
+    """Storage names of every uploaded image the site shows"""
+    names = set()
+    for model, field_name in IMAGE_FIELDS:
+        names.update(
+            model.objects.exclude(**{field_name: ''}).values_list(field_name, flat=True)
+        )
+    return sorted(names)
+
+
+def renditions_for(name):
+    """{format: [(width, height, url), ...]} narrowest first, for one stored image"""
+    return RenditionMap([name]).renditions_for(name)
+
+
+def placeholder_for(name):
+    """(lqip, color) of one stored image, or None"""
+    return ImagePlaceholder.objects.filter(source=name).values_list('lqip', 'color').first()
+
+
+class RenditionMap:
+    """
+    Renditions and placeholders of every image on a page, loaded in one
+    query each. Views pass it to templates as `image_renditions`, where
+    {% responsive_image %} reads it; images it was not built with are
+    looked up one by one.
+    """
+
+    def __init__(self, names):
+        self.names = {name for name in names if name}
+        self.variants = {}
+        self.placeholders = {}
+        if not self.names:
+            return
+        rows = (
+            ImageRendition.objects.filter(source__in=self.names)
+            .values_list('source', 'format', 'width', 'height', 'file')
+            .order_by('width')
+        )
+        for name, fmt, width, height, path in rows:
+            self.variants.setdefault(name, {}).setdefault(fmt, []).append(
+                (width, height, default_storage.url(path))
+            )
+        placeholders = ImagePlaceholder.objects.filter(source__in=self.names)
+        for name, lqip, color in placeholders.values_list('source', 'lqip', 'color'):
+            self.placeholders[name] = (lqip, color)
+
+    def renditions_for(self, name):
+        if name not in self.names:
+            return renditions_for(name)
+        # A copy: callers pop formats off it
+        return {fmt: list(items) for fmt, items in self.variants.get(name, {}).items()}
+
+    def placeholder_for(self, name):
+        if name not in self.names:
+            return placeholder_for(name)
+        return self.placeholders.get(name)
+
+
+def rendition_map(images):
+    """RenditionMap of the uploaded images (FieldFiles) a page shows"""
+    return RenditionMap(image.name for image in images if image)
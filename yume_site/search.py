@@ -0,0 +1,355 @@
+import re
+from collections import namedtuple
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.urls import reverse
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import mark_safe
+
+from .models import (
+    BlogBlock, Course, CurriculumMonth, CurriculumSection, CurriculumTopic,
+    DynamicBlog, ProjectBlock, ProjectCard, ProjectDetail, SearchDocument,
+)
+
+
+# =========================
+# SITE SEARCH
+# =========================
+# Every course, blog and project page is flattened into one SearchDocument
+# row (title + body text). The database keeps the full-text index over
+# those rows (migration 0070):
+#   Postgres -> tsvector column with a GIN index, ranked with ts_rank_cd
+#   SQLite   -> FTS5 table kept in sync by triggers, ranked with bm25
+# Saves of the source rows rewrite their document (signals.py), so the
+# index is always as fresh as the pages themselves.
+
+PAGE_SIZE = 10
+MAX_QUERY_LENGTH = 200
+MAX_TERMS = 8
+
+# Snippet highlight markers; replaced by <mark> after the text is escaped
+MARK_START = "\x02"
+MARK_END = "\x03"
+
+SearchResult = namedtuple("SearchResult", ["kind", "title", "url", "snippet"])
+
+
+# =========================
+# DOCUMENTS
+# =========================
+BLOG_FIELDS = [
+    'excerpt', 'author_name',
+    'section_1_title', 'section_1_content', 'section_2_title',
+    'section_3_title', 'section_4_title', 'section_4_content',
+]
+BLOG_BLOCKS = ['feature', 'application', 'stat']
+
+PROJECT_CARD_FIELDS = ['tagline', 'category', 'short_description']
+PROJECT_DETAIL_FIELDS = [
+    'badge_text', 'location', 'target_audience', 'detailed_content',
+    'program_overview_title', 'program_overview_content',
+    'implementing_partner_name', 'partner_2_name_overview', 'partner_3_name_overview',
+    'program_objective', 'learning_approach_title', 'learning_approach_main',
+    'learning_approach_sub', 'role_title', 'role_description',
+    'impact_title', 'impact_main_text',
+    'certification_title', 'certification_subtitle', 'certification_description',
+    'support_title', 'support_subtitle', 'support_description',
+    'pathways_title', 'pathways_description',
+]
+
+
+def _body(parts):
+    return "\n".join(strip_tags(part).strip() for part in parts if part and part.strip())
+
+
+def _block_parts(blocks, kinds=None):
+    parts = []
+    for block in blocks:
+        if kinds is None or block.kind in kinds:
+            parts += [block.title, block.subtitle, block.text]
+    return parts
+
+
+def course_document(course):
+    # .all() everywhere so rebuild_search_index() can prefetch
+    parts = [course.subtitle, course.card_description, course.overview, course.course_url]
+    for month in course.curriculum_months.all():
+        if month.is_active:
+            parts += [month.title, month.subtitle]
+    parts += [section.title for section in course.curriculum_sections.all()]
+    parts += [topic.title for topic in course.curriculum_topics.all()]
+    return {
+        'title': course.title,
+        'url': reverse('course_detail', args=[course.course_url]),
+        'body': _body(parts),
+        'is_public': course.is_active,
+    }
+
+
+def blog_document(blog):
+    parts = [getattr(blog, field) for field in BLOG_FIELDS]
+    parts.append(blog.category_display)
+    parts += _block_parts(blog.blocks.all(), BLOG_BLOCKS)
+    return {
+        'title': blog.title,
+        'url': reverse('dynamic_blog_detail', args=[blog.slug]),
+        'body': _body(parts),
+        'is_public': blog.is_published,
+    }
+
+
+def project_document(card):
+    parts = [getattr(card, field) for field in PROJECT_CARD_FIELDS]
+    try:
+        detail = card.detail_page
+    except ProjectDetail.DoesNotExist:
+        detail = None
+    if detail is not None:
+        parts += [getattr(detail, field) for field in PROJECT_DETAIL_FIELDS]
+        parts += _block_parts(detail.blocks.all())
+    return {
+        'title': card.project_name,
+        'url': reverse('project_detail', args=[card.slug]),
+        'body': _body(parts),
+        'is_public': card.is_active,
+    }
+
+
+# kind -> (queryset of source rows, document builder)
+DOCUMENT_SOURCES = {
+    'course': (
+        lambda: Course.objects.prefetch_related(
+            'curriculum_months', 'curriculum_sections', 'curriculum_topics'
+        ),
+        course_document,
+    ),
+    'blog': (
+        lambda: DynamicBlog.objects.prefetch_related('blocks'),
+        blog_document,
+    ),
+    'project': (
+        lambda: ProjectCard.objects.select_related('detail_page').prefetch_related('detail_page__blocks'),
+        project_document,
+    ),
+}
+
+
+def _project_of_block(block):
+    return (
+        ProjectDetail.objects
+        .filter(pk=block.project_detail_id)
+        .values_list('project_card_id', flat=True)
+        .first()
+    )
+
+
+# Saved/deleted model -> (document kind, id of the row that owns the document)
+SEARCH_SOURCES = {
+    Course: ('course', lambda course: course.pk),
+    CurriculumMonth: ('course', lambda month: month.course_id),
+    CurriculumSection: ('course', lambda section: section.course_id),
+    CurriculumTopic: ('course', lambda topic: topic.course_id),
+    DynamicBlog: ('blog', lambda blog: blog.pk),
+    BlogBlock: ('blog', lambda block: block.blog_id),
+    ProjectCard: ('project', lambda card: card.pk),
+    ProjectDetail: ('project', lambda detail: detail.project_card_id),
+    ProjectBlock: ('project', _project_of_block),
+}
+
+
+def refresh_search_document(kind, object_id):
+    """Rewrite (or drop) the search document of one course / blog / project"""
+    if object_id is None:
+        return
+    queryset, build = DOCUMENT_SOURCES[kind]
+    source = queryset().filter(pk=object_id).first()
+    if source is None:
+        SearchDocument.objects.filter(kind=kind, object_id=object_id).delete()
+        return
+    SearchDocument.objects.update_or_create(
+        kind=kind, object_id=object_id, defaults=build(source)
+    )
+
+
+def refresh_for_source(instance):
+    """Refresh the document a saved/deleted source row belongs to"""
+    kind, owner_id = SEARCH_SOURCES[type(instance)]
+    refresh_search_document(kind, owner_id(instance))
+
+
+@transaction.atomic
+def rebuild_search_index():
+    """Rebuild every search document; returns the number of documents"""
+    documents = []
+    for kind, (queryset, build) in DOCUMENT_SOURCES.items():
+        for source in queryset():
+            documents.append(SearchDocument(kind=kind, object_id=source.pk, **build(source)))
+
+    SearchDocument.objects.all().delete()
+    SearchDocument.objects.bulk_create(documents, batch_size=500)
+    return len(documents)
+
+
+# =========================
+# QUERIES
+# =========================
+def query_terms(query):
+    """Plain words of a search box query (operators and punctuation dropped)"""
+    return re.findall(r"[^\W_]+", query.lower()[:MAX_QUERY_LENGTH])[:MAX_TERMS]
+
+
+def _fts5_match(terms):
+    # Every word must match; the last one is a prefix (search as you type)
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+# Whole words are stemmed ('courses' -> 'cours'); the last word also
+# matches as an unstemmed prefix, as 'analy' would stem to 'anali'
+TSQUERY = "(to_tsquery('english', %s) && (to_tsquery('english', %s) || to_tsquery('simple', %s)))"
+
+
+def _tsquery_params(terms):
+    *words, last = terms
+    return [" & ".join(words), last, f"{last}:*"]
+
+
+def _kind_filter(column, kinds):
+    if not kinds:
+        return "", []
+    return f" AND {column} IN ({', '.join(['%s'] * len(kinds))})", list(kinds)
+
+
+# Only the newest MAX_CANDIDATES matches are ranked: exact for anything but
+# very common words, and a word found in every document no longer means
+# scoring every document
+MAX_CANDIDATES = 2000
+
+# CROSS JOIN keeps the FTS table as the outer loop; the other order runs
+# the MATCH once per document. The rowid floor is a range FTS5 can use.
+SQLITE_SEARCH = """
+    SELECT d.id, d.kind, d.title, d.url,
+           snippet(yume_site_searchdocument_fts, 1, %s, %s, '…', 24)
+    FROM yume_site_searchdocument_fts
+    CROSS JOIN yume_site_searchdocument d ON d.id = yume_site_searchdocument_fts.rowid
+    WHERE yume_site_searchdocument_fts MATCH %s AND d.is_public{kinds}
+      AND yume_site_searchdocument_fts.rowid >= coalesce((
+          SELECT rowid FROM yume_site_searchdocument_fts
+          WHERE yume_site_searchdocument_fts MATCH %s
+          ORDER BY rowid DESC LIMIT 1 OFFSET %s
+      ), 0)
+    ORDER BY bm25(yume_site_searchdocument_fts, 10.0, 1.0), d.id
+    LIMIT %s OFFSET %s
+"""
+
+# Headlines are expensive, so they are built for the page of results only
+POSTGRES_SEARCH = """
+    SELECT d.id, d.kind, d.title, d.url, ts_headline('english', d.body, q, %s)
+    FROM (
+        SELECT id, ts_rank_cd(search_vector, q) AS rank
+        FROM (
+            SELECT id, search_vector
+            FROM yume_site_searchdocument
+            WHERE search_vector @@ {tsquery} AND is_public{kinds}
+            ORDER BY id DESC
+            LIMIT %s
+        ) candidates
+        CROSS JOIN {tsquery} q
+        ORDER BY rank DESC, id
+        LIMIT %s OFFSET %s
+    ) top
+    JOIN yume_site_searchdocument d ON d.id = top.id
+    CROSS JOIN {tsquery} q
+    ORDER BY top.rank DESC, top.id
+"""
+POSTGRES_HEADLINE = (
+    f'StartSel="{MARK_START}", StopSel="{MARK_END}", '
+    'MaxFragments=2, MaxWords=24, MinWords=12, FragmentDelimiter=" … "'
+)
+
+
+def _snippet(text):
+    html = escape(text or "").replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+    return mark_safe(html)
+
+
+def search_site(query, kinds=None, page=1):
+    """
+    (results, has_next) for a public search query, best match first.
+
+    `kinds` limits the search to some of SearchDocument.KIND_CHOICES.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return [], False
+
+    offset = (page - 1) * PAGE_SIZE
+    limit = PAGE_SIZE + 1
+    if connection.vendor == 'postgresql':
+        kind_sql, kind_params = _kind_filter("kind", kinds)
+        tsquery = _tsquery_params(terms)
+        sql = POSTGRES_SEARCH.format(kinds=kind_sql, tsquery=TSQUERY)
+        params = [
+            POSTGRES_HEADLINE, *tsquery, *kind_params, MAX_CANDIDATES,
+            *tsquery, limit, offset, *tsquery,
+        ]
+    elif connection.vendor == 'sqlite':
+        kind_sql, kind_params = _kind_filter("d.kind", kinds)
+        match = _fts5_match(terms)
+        sql = SQLITE_SEARCH.format(kinds=kind_sql)
+        params = [
+            MARK_START, MARK_END, match, *kind_params,
+            match, MAX_CANDIDATES - 1, limit, offset,
+        ]
+    else:
+        return _fallback_search(terms, kinds, offset, limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    results = [
+        SearchResult(kind, title, url, _snippet(snippet))
+        for _, kind, title, url, snippet in rows
+    ]
+    return results[:PAGE_SIZE], len(results) > PAGE_SIZE
+
+
+def _fallback_search(terms, kinds, offset, limit):
+    """Unranked substring search for databases without a full-text index"""
+    documents = SearchDocument.objects.filter(is_public=True).order_by('id')
+    if kinds:
+        documents = documents.filter(kind__in=kinds)
+    for term in terms:
+        documents = documents.filter(Q(title__icontains=term) | Q(body__icontains=term))
+    rows = documents.values_list('kind', 'title', 'url', 'body')[offset:offset + limit]
+    results = [SearchResult(kind, title, url, body[:160]) for kind, title, url, body in rows]
+    return results[:PAGE_SIZE], len(results) > PAGE_SIZE
+
+
+def matching_ids(kind, query):
+    """
+    Subquery of the source ids whose document matches `query`, hidden rows
+    included (admin search), or None when the query has no words or the
+    database has no full-text index.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return None
+    if connection.vendor == 'postgresql':
+        return RawSQL(
+            "SELECT object_id FROM yume_site_searchdocument "
+            f"WHERE kind = %s AND search_vector @@ {TSQUERY}",
+            [kind, *_tsquery_params(terms)],
+        )
+    if connection.vendor == 'sqlite':
+        return RawSQL(
+            "SELECT d.object_id FROM yume_site_searchdocument_fts "
+            "CROSS JOIN yume_site_searchdocument d ON d.id = yume_site_searchdocument_fts.rowid "
+            "WHERE yume_site_searchdocument_fts MATCH %s AND d.kind = %s",
+            [_fts5_match(terms), kind],
+        )
+    return None
@@ -0,0 +1,193 @@
+from functools import partial
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save, pre_delete
+
+from .blog_cards import refresh_blog_card
+from .blog_listing import bump_blog_facets
+from .content_blocks import create_default_blog_blocks, create_default_project_blocks
+from .blog_navigation import navigation_state, refresh_blog_navigation
+from .course_snapshot import COURSE_MODELS, bump_course_version
+from .logo_sprites import rebuild_logo_sprites, release_sprite_file
+from .media_files import image_names, release_file, remember_images, replaced_images
+from .page_cache import invalidate_instance
+from .related_blogs import TEXT_BLOCKS, has_index, queue_related_blog
+from .renditions import FIELDS_BY_MODEL, ensure_renditions
+from .search import SEARCH_SOURCES, refresh_for_source
+from .site_snapshot import refresh_for_instance
+from .uploads import MAX_DIMENSIONS, shrink_uploads
+from .models import (
+    BlogBlock, BlogCard, BlogNavigation, CompanyLogo, DynamicBlog, ImagePlaceholder, ImageRendition,
+    LogoSpriteSheet, ProjectDetail, RenditionJob, SearchDocument,
+)
+
+
+# =========================
+# COURSE SNAPSHOT INVALIDATION
+# =========================
+def course_content_changed(sender, **kwargs):
+    """Any course change makes the cached course snapshots stale"""
+    transaction.on_commit(bump_course_version)
+
+
+for model in COURSE_MODELS:
+    post_save.connect(course_content_changed, sender=model)
+    post_delete.connect(course_content_changed, sender=model)
+
+
+# =========================
+# DEFAULT CONTENT BLOCKS
+# =========================
+# Connected before the blog index handlers so a new blog is indexed with
+# its default feature blocks
+def project_detail_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        create_default_project_blocks(instance)
+
+
+def blog_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        create_default_blog_blocks(instance)
+
+
+post_save.connect(project_detail_created, sender=ProjectDetail)
+post_save.connect(blog_created, sender=DynamicBlog)
+
+
+# =========================
+# SITE SEARCH INDEX
+# =========================
+# After the default blocks, so a new page is indexed with them
+def search_source_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_for_source(instance)
+
+
+for model in SEARCH_SOURCES:
+    post_save.connect(search_source_changed, sender=model)
+    post_delete.connect(search_source_changed, sender=model)
+
+
+# =========================
+# BLOG NAVIGATION INDEX + BLOG CARDS + CATEGORY COUNTS
+# =========================
+def remember_blog_navigation(sender, instance, **kwargs):
+    """Keep the old index entry so its old neighbours can be fixed up"""
+    instance._old_navigation = navigation_state(instance.pk) if instance.pk else None
+
+
+def blog_saved(sender, instance, **kwargs):
+    old_navigation = getattr(instance, "_old_navigation", None)
+    refresh_blog_card(instance)
+    refresh_blog_navigation(instance, old_navigation)
+    # Only published posts have navigation, so its category is the old count
+    old_facet = old_navigation[0] if old_navigation else None
+    if old_facet != (instance.category if instance.is_published else None):
+        transaction.on_commit(bump_blog_facets)
+
+
+def blog_deleted(sender, instance, **kwargs):
+    old_navigation = getattr(instance, "_old_navigation", None)
+    refresh_blog_card(instance, deleted=True)
+    refresh_blog_navigation(instance, old_navigation, deleted=True)
+    if old_navigation:
+        transaction.on_commit(bump_blog_facets)
+
+
+pre_save.connect(remember_blog_navigation, sender=DynamicBlog)
+pre_delete.connect(remember_blog_navigation, sender=DynamicBlog)
+post_save.connect(blog_saved, sender=DynamicBlog)
+post_delete.connect(blog_deleted, sender=DynamicBlog)
+
+
+def blog_block_changed(sender, instance, raw=False, **kwargs):
+    """Feature blocks are part of the text related posts are matched on"""
+    if not raw and instance.kind in TEXT_BLOCKS and has_index():
+        transaction.on_commit(partial(queue_related_blog, instance.blog_id))
+
+
+post_save.connect(blog_block_changed, sender=BlogBlock)
+post_delete.connect(blog_block_changed, sender=BlogBlock)
+
+
+# =========================
+# UPLOAD DOWNSIZING + RESPONSIVE IMAGE RENDITIONS + MEDIA RELEASE
+# =========================
+# pre_save runs before FileField writes the upload, so only the
+# downsized copy ever reaches media/
+def image_owner_saving(sender, instance, raw=False, **kwargs):
+    if not raw:
+        shrink_uploads(instance)
+        remember_images(instance)
+
+
+for model in {model for model, field_name in MAX_DIMENSIONS}:
+    pre_save.connect(image_owner_saving, sender=model)
+
+
+# Renditions are queued in the save's transaction; the rendition worker
+# refreshes the owner's pages once the files exist. Replaced images are
+# released after commit, when no other row shares them.
+def image_owner_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        ensure_renditions(instance)
+        for name in replaced_images(instance):
+            transaction.on_commit(partial(release_file, name))
+
+
+def image_owner_deleted(sender, instance, **kwargs):
+    for name in image_names(instance).values():
+        transaction.on_commit(partial(release_file, name))
+
+
+for model in FIELDS_BY_MODEL:
+    post_save.connect(image_owner_saved, sender=model)
+    post_delete.connect(image_owner_deleted, sender=model)
+
+
+# =========================
+# COMPANY LOGO SPRITE SHEETS
+# =========================
+# Rebuilt after commit, once per admin save at most: the inline saves every
+# changed logo, and later rebuilds find the signature unchanged. Saving the
+# new sheets invalidates the placements page like any other content row.
+def company_logo_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(partial(rebuild_logo_sprites, instance.placements_section_id))
+
+
+def sprite_sheet_deleted(sender, instance, **kwargs):
+    for name in (instance.webp.name, instance.png.name):
+        transaction.on_commit(partial(release_sprite_file, name))
+
+
+post_save.connect(company_logo_changed, sender=CompanyLogo)
+post_delete.connect(company_logo_changed, sender=CompanyLogo)
+post_delete.connect(sprite_sheet_deleted, sender=LogoSpriteSheet)
+
+
+# =========================
+# PAGE CACHE + SITE SNAPSHOT INVALIDATION
+# =========================
+def site_content_changed(sender, instance, **kwargs):
+    """Drop the cached pages and snapshot files that show the saved/deleted row"""
+    invalidate_instance(instance)
+    refresh_for_instance(instance)
+
+
+# Cards and navigation rows are rebuilt from DynamicBlog saves: the listing
+# pages depend on the DynamicBlog model tag and a post's page on its pk tag,
+# while the posts whose previous / next or related posts change are dropped
+# explicitly (navigation_changed, refresh_related_blogs). Search documents
+# only feed /search/, which is never cached; the rendition worker refreshes
+# the pages of an image once its renditions are stored
+DERIVED_MODELS = (
+    BlogNavigation, BlogCard, SearchDocument, ImageRendition, ImagePlaceholder, RenditionJob,
+)
+
+for model in apps.get_app_config("yume_site").get_models():
+    if model in DERIVED_MODELS:
+        continue
+    post_save.connect(site_content_changed, sender=model)
+    post_delete.connect(site_content_changed, sender=model)
@@ -0,0 +1,353 @@
+import fcntl
+import gzip
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.test import Client
+from django.urls import NoReverseMatch, reverse
+
+from .models import Course, DynamicBlog, ProjectCard
+from .page_cache import invalidate_tags, record_dependencies, tags_for_instance
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional locally
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+
+# WSGI environ key of the requests that render snapshot pages; not an
+# HTTP_* key, so no client can send it
+SNAPSHOT_RENDER_KEY = "yume_site.snapshot_render"
+
+
+# =========================
+# PRERENDERED SITE SNAPSHOT
+# =========================
+# Every public page is rendered once into SITE_SNAPSHOT_ROOT as
+# <url>/index.html (+ .gz and .br). SiteSnapshotMiddleware serves those
+# files before sessions, auth or any view run.
+#
+# A manifest next to the snapshot directory keeps the page-cache tags each
+# page read. Once an admin save commits, the pages that showed the changed
+# rows are removed and their URLs queued; the rendition worker re-renders
+# them (refresh_pending). Every page written or removed is appended to a
+# change log, which SiteSnapshotMiddleware follows to keep its file map
+# current without scanning the directory.
+
+def snapshot_root():
+    root = getattr(settings, "SITE_SNAPSHOT_ROOT", None)
+    return str(root) if root else None
+
+
+def _beside_root(suffix):
+    return snapshot_root().rstrip(os.sep) + suffix
+
+
+def manifest_path():
+    return _beside_root(".manifest.json")
+
+
+def changes_path():
+    """Log of snapshot URLs whose files were written or removed"""
+    return _beside_root(".changes")
+
+
+def pending_path():
+    """URLs waiting for the worker to re-render them"""
+    return _beside_root(".pending")
+
+
+def page_path(url):
+    return os.path.join(snapshot_root(), url.lstrip("/"), "index.html")
+
+
+# =========================
+# URL DISCOVERY
+# =========================
+def _reverse(name, *args):
+    try:
+        return reverse(name, args=args)
+    except NoReverseMatch:
+        return None
+
+
+def instance_urls(instance):
+    """Detail page URL(s) owned by a row"""
+    if isinstance(instance, DynamicBlog) and instance.slug:
+        # A category's first post also creates its listing page
+        urls = [
+            _reverse("dynamic_blog_detail", instance.slug),
+            _reverse("blog_category", instance.category),
+        ]
+    elif isinstance(instance, ProjectCard) and instance.slug:
+        urls = [_reverse("project_detail", instance.slug)]
+    elif isinstance(instance, Course) and instance.course_url:
+        urls = [_reverse("course_detail", instance.course_url)]
+    else:
+        urls = []
+    return [url for url in urls if url]
+
+
+def public_urls():
+    """Every named yume_site URL without arguments plus every detail page"""
+    from . import urls as site_urls
+
+    urls = []
+    for pattern in site_urls.urlpatterns:
+        if pattern.name and not pattern.pattern.converters:
+            url = _reverse(pattern.name)
+            if url:
+                urls.append(url)
+
+    for slug in DynamicBlog.objects.filter(is_published=True).values_list("slug", flat=True):
+        urls.append(_reverse("dynamic_blog_detail", slug))
+    categories = (
+        DynamicBlog.objects.filter(is_published=True)
+        .order_by().values_list("category", flat=True).distinct()
+    )
+    for category in categories:
+        urls.append(_reverse("blog_category", category))
+    for slug in ProjectCard.objects.filter(is_active=True).values_list("slug", flat=True):
+        urls.append(_reverse("project_detail", slug))
+    for course_url in Course.objects.filter(is_active=True).values_list("course_url", flat=True):
+        urls.append(_reverse("course_detail", course_url))
+
+    return list(dict.fromkeys(url for url in urls if url))
+
+
+# =========================
+# FILES
+# =========================
+def _atomic_write(path, data):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def append_lines(path, lines):
+    """One item per line, in a single O_APPEND write so lines from several processes never mix"""
+    if not lines:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, "".join(f"{line}\n" for line in lines).encode())
+    finally:
+        os.close(fd)
+
+
+def read_lines(path):
+    """Items of a change log or queue file, deduplicated in order"""
+    try:
+        with open(path) as f:
+            return list(dict.fromkeys(line.strip() for line in f if line.strip()))
+    except FileNotFoundError:
+        return []
+
+
+@contextmanager
+def snapshot_lock():
+    """One process rendering pages and rewriting the manifest at a time"""
+    path = _beside_root(".lock")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def write_page(url, content):
+    """Write a page and its compressed variants; returns bytes written"""
+    path = page_path(url)
+    variants = {".gz": gzip.compress(content, 9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(content)
+
+    # Variants first, so the html never points at older compressed copies
+    for suffix, data in variants.items():
+        if len(data) < len(content):
+            _atomic_write(path + suffix, data)
+        else:
+            _remove(path + suffix)
+    if brotli is None:
+        _remove(path + ".br")
+    _atomic_write(path, content)
+    append_lines(changes_path(), [url])
+    return len(content)
+
+
+def remove_page(url):
+    path = page_path(url)
+    for suffix in ("", ".gz", ".br"):
+        _remove(path + suffix)
+    append_lines(changes_path(), [url])
+
+
+def load_manifest():
+    try:
+        with open(manifest_path()) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    data = json.dumps(manifest, indent=1, sort_keys=True).encode()
+    _atomic_write(manifest_path(), data)
+
+
+# =========================
+# RENDERING
+# =========================
+def _client():
+    host = settings.ALLOWED_HOSTS[0].lstrip(".") if settings.ALLOWED_HOSTS else ""
+    if not host or host == "*":
+        host = "localhost"
+    return Client(HTTP_HOST=host)
+
+
+def render_page(client, url):
+    """(html, tags) for a snapshot-able page, or (None, tags) if it is not one"""
+    with record_dependencies() as tags:
+        # Rendered by the views, never answered from the current snapshot
+        response = client.get(url, **{SNAPSHOT_RENDER_KEY: True})
+    # Redirects, 404s and pages that set cookies (CSRF forms) stay dynamic
+    if (
+        response.status_code != 200
+        or response.cookies
+        or not response["Content-Type"].startswith("text/html")
+    ):
+        return None, tags
+    return response.content, tags
+
+
+def _render_urls(urls, manifest):
+    client = _client()
+    results = []
+    for url in urls:
+        content, tags = render_page(client, url)
+        # Out of every middleware's file map before the new files land, so
+        # none serves them with the old files' headers
+        remove_page(url)
+        if content is None:
+            manifest.pop(url, None)
+            results.append((url, None))
+        else:
+            results.append((url, write_page(url, content)))
+            manifest[url] = sorted(tags)
+    return results
+
+
+def refresh_urls(urls):
+    """Re-render `urls`, dropping the ones that are no longer pages"""
+    with snapshot_lock():
+        manifest = load_manifest()
+        try:
+            return _render_urls(urls, manifest)
+        finally:
+            save_manifest(manifest)
+
+
+def export_site():
+    """Full export; pages that disappeared since the last export are removed"""
+    with snapshot_lock():
+        old_manifest = load_manifest()
+        manifest = {}
+        try:
+            results = _render_urls(public_urls(), manifest)
+        finally:
+            save_manifest(manifest)
+        for url in set(old_manifest) - set(manifest):
+            remove_page(url)
+    return results
+
+
+# =========================
+# INCREMENTAL REBUILD
+# =========================
+def refresh_for_tags(tags, urls=()):
+    """
+    Once the transaction commits, take out the snapshot pages that carry
+    any of `tags` (plus `urls`) and queue them for the rendition worker.
+    Django serves them until they are re-rendered.
+    """
+    if not snapshot_root() or not os.path.exists(manifest_path()):
+        return
+
+    tags = set(tags)
+    manifest = load_manifest()
+    urls = [url for url, page_tags in manifest.items() if tags.intersection(page_tags)] + list(urls)
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return
+
+    def take_out():
+        for url in urls:
+            remove_page(url)
+        append_lines(pending_path(), urls)
+
+    transaction.on_commit(take_out)
+
+
+def refresh_for_instance(instance):
+    """Re-render the snapshot pages that showed a saved/deleted row"""
+    refresh_for_tags(tags_for_instance(instance), instance_urls(instance))
+
+
+def refresh_pages(tags):
+    """Drop the cached pages and snapshot pages that depend on any of `tags`"""
+    tags = list(tags)
+    invalidate_tags(tags)
+    refresh_for_tags(tags)
+
+
+def refresh_pending():
+    """Re-render the queued URLs (rendition worker); returns [(url, bytes or None)]"""
+    if not snapshot_root():
+        return []
+    pending = pending_path()
+    # Claimed first, so URLs queued while rendering wait for the next round;
+    # a claim left by a failed or killed worker is picked up again
+    claimed = pending + ".claimed"
+    with snapshot_lock():
+        if not os.path.exists(claimed):
+            try:
+                os.replace(pending, claimed)
+            except FileNotFoundError:
+                return []
+        urls = read_lines(claimed)
+        manifest = load_manifest()
+        try:
+            results = _render_urls(urls, manifest)
+        except Exception:
+            # Kept claimed: retried on the next round
+            logger.exception("Site snapshot refresh failed for %s", urls)
+            return []
+        finally:
+            save_manifest(manifest)
+        _remove(claimed)
+    return results
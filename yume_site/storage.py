@@ -0,0 +1,63 @@
+import hashlib
+import os
+import re
+import uuid
+from pathlib import PurePosixPath
+
+from django.core.files.storage import FileSystemStorage
+
+
+# =========================
+# CONTENT-ADDRESSED MEDIA STORAGE
+# =========================
+# Uploaded images are named by the SHA-256 of their bytes, in one namespace
+# shared by every ImageField: the same picture uploaded twice (or into two
+# models) is stored once, and a name never points at different bytes, so
+# its URL can be cached as immutable. References are counted from the
+# image fields themselves, see media_files.py.
+
+CAS_PREFIX = 'cas'
+CAS_NAME_RE = re.compile(rf'^{CAS_PREFIX}/[0-9a-f]{{2}}/[0-9a-f]{{32}}(\.[a-z0-9]+)?$')
+
+
+def file_digest(content):
+    """SHA-256 hex digest of a Django File, read in chunks"""
+    sha = hashlib.sha256()
+    for chunk in content.chunks():
+        sha.update(chunk)
+    return sha.hexdigest()
+
+
+def content_name(name, digest):
+    """cas/3f/3fa2...c9.jpg: 128 bits of the digest plus the original extension"""
+    extension = PurePosixPath(name).suffix.lower()
+    return f"{CAS_PREFIX}/{digest[:2]}/{digest[:32]}{extension}"
+
+
+def is_content_addressed(name):
+    return bool(CAS_NAME_RE.match(name or ''))
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that ignores upload_to and the uploaded file name
+    (apart from its extension) and stores each distinct content once.
+    Names written before the switch keep working for reads.
+    """
+
+    def _save(self, name, content):
+        name = content_name(name, file_digest(content))
+        full_path = self.path(name)
+        if os.path.exists(full_path):
+            # Already stored; the fresh mtime keeps media_files.release_file
+            # from deleting it under a reference that is not committed yet
+            os.utime(full_path)
+            return name
+        # Written under a unique name first, so a concurrent identical
+        # upload never reads a partial file
+        partial = super()._save(f"{name}.{uuid.uuid4().hex}.part", content)
+        os.replace(self.path(partial), full_path)
+        return name
+
+
+content_addressed_storage = ContentAddressedStorage()
@@ -0,0 +1,305 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import SimpleLazyObject
+
+from .models import ContactMessage, Enquiry, Enrollment
+
+logger = logging.getLogger(__name__)
+
+
+# =========================
+# WRITE-BEHIND FORM SUBMISSIONS
+# =========================
+# The contact, enquiry and enrollment POSTs are validated, appended to a
+# local SQLite journal (WAL, fsynced on every commit) and acknowledged
+# without waiting on the main database. `manage.py flush_submissions` moves
+# them over in batches with bulk_create and marks them flushed. Every row
+# keeps its journal id in a unique submission_id, so a batch replayed after
+# a crash between those two steps is skipped, not doubled.
+#
+# Duplicates are answered with the usual success response and never reach
+# the database:
+# - the page sends an Idempotency-Key per filled-in form, reused by double
+#   clicks and retries, which becomes the journal id;
+# - a fingerprint of the identifying fields (email, mobile, course...) per
+#   SUBMISSION_DEDUP_WINDOW is unique in the journal and on the models.
+# Flushed entries stay in the journal for the window to answer both.
+
+
+class SubmissionForm(NamedTuple):
+    model: type
+    # Taken from the POST
+    fields: tuple
+    timestamp_field: str
+    # Same values within the window = the same submission
+    dedup_fields: tuple
+
+
+SUBMISSION_FORMS = {
+    "contact": SubmissionForm(
+        ContactMessage, ("first_name", "last_name", "phone", "email", "message"), "submitted_at",
+        ("email", "phone", "message"),
+    ),
+    "enquiry": SubmissionForm(
+        Enquiry, ("first_name", "last_name", "email", "mobile", "message"), "created_at",
+        ("email", "mobile", "message"),
+    ),
+    "enrollment": SubmissionForm(
+        Enrollment, ("first_name", "last_name", "email", "mobile", "education", "course"), "created_at",
+        ("email", "mobile", "course"),
+    ),
+}
+
+FLUSH_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    received_at TEXT NOT NULL,
+    error TEXT,
+    fingerprint TEXT,
+    flushed_at REAL
+)
+"""
+# Journals written before deduplication lack these
+ADDED_COLUMNS = {"fingerprint": "TEXT", "flushed_at": "REAL"}
+INDEXES = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS submissions_fingerprint ON submissions (fingerprint)",
+    "CREATE INDEX IF NOT EXISTS submissions_flushed_at ON submissions (flushed_at)",
+)
+
+
+class SubmissionJournal:
+    """Submission buffer in a SQLite file; one connection per thread and process"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.local = threading.local()
+
+    def connection(self):
+        # A forked gunicorn worker must not reuse its parent's connection
+        if getattr(self.local, "pid", None) != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # An acknowledged submission survives a power cut
+            connection.execute("PRAGMA synchronous=FULL")
+            connection.execute(SCHEMA)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(submissions)")}
+            for column, column_type in ADDED_COLUMNS.items():
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE submissions ADD COLUMN {column} {column_type}")
+            for index in INDEXES:
+                connection.execute(index)
+            self.local.connection, self.local.pid = connection, os.getpid()
+        return self.local.connection
+
+    def append(self, entry_id, kind, values, fingerprints):
+        """
+        Journal a submission under the current fingerprint; False (nothing
+        written) if the id or any of `fingerprints` is already journaled
+        """
+        connection = self.connection()
+        # Check and insert under the write lock, so concurrent repeats see each other
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            placeholders = ", ".join("?" * len(fingerprints))
+            duplicate = connection.execute(
+                f"SELECT 1 FROM submissions WHERE id = ? OR fingerprint IN ({placeholders})",
+                (entry_id, *fingerprints),
+            ).fetchone()
+            if duplicate is None:
+                connection.execute(
+                    "INSERT INTO submissions (id, kind, payload, received_at, fingerprint) VALUES (?, ?, ?, ?, ?)",
+                    (entry_id, kind, json.dumps(values), timezone.now().isoformat(), fingerprints[0]),
+                )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        return duplicate is None
+
+    def pending(self, limit):
+        """[(id, kind, values, received_at, fingerprint)] oldest first, failed entries left out"""
+        rows = self.connection().execute(
+            "SELECT id, kind, payload, received_at, fingerprint FROM submissions "
+            "WHERE error IS NULL AND flushed_at IS NULL ORDER BY rowid LIMIT ?",
+            (limit,),
+        )
+        return [
+            (entry_id, kind, json.loads(payload), received_at, fingerprint)
+            for entry_id, kind, payload, received_at, fingerprint in rows
+        ]
+
+    def mark_flushed(self, entry_ids):
+        now = time.time()
+        self._write("UPDATE submissions SET flushed_at = ? WHERE id = ?", [(now, entry_id) for entry_id in entry_ids])
+
+    def purge(self, older_than):
+        """Forget entries flushed before `older_than` (epoch seconds)"""
+        self._write("DELETE FROM submissions WHERE flushed_at < ?", [(older_than,)])
+
+    def mark_failed(self, failures):
+        """Keep entries the database rejects for inspection, out of the flush"""
+        self._write("UPDATE submissions SET error = ? WHERE id = ?", [(error, entry_id) for entry_id, error in failures])
+
+    def counts(self):
+        """(pending, failed)"""
+        return self.connection().execute(
+            "SELECT COUNT(*) - COUNT(error), COUNT(error) FROM submissions WHERE flushed_at IS NULL"
+        ).fetchone()
+
+    def _write(self, sql, rows):
+        # One transaction, so one fsync for the whole batch
+        connection = self.connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(sql, rows)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+
+journal = SimpleLazyObject(lambda: SubmissionJournal(settings.SUBMISSION_JOURNAL))
+
+
+# =========================
+# ACCEPTING
+# =========================
+
+def dedup_window():
+    return getattr(settings, "SUBMISSION_DEDUP_WINDOW", 10 * 60)
+
+
+def normalise(field, value):
+    if field in ("mobile", "phone"):
+        return re.sub(r"\D", "", value)[-10:]
+    return " ".join(value.lower().split())
+
+
+def fingerprints(kind, values, now=None):
+    """
+    Content hashes for the current and the previous window. Only the
+    current one is stored; checking both means a repeat just after a
+    window boundary is still caught.
+    """
+    form = SUBMISSION_FORMS[kind]
+    content = "|".join(normalise(field, values[field]) for field in form.dedup_fields)
+    window = int((now or time.time()) // dedup_window())
+    return [
+        hashlib.sha256(f"{kind}|{bucket}|{content}".encode()).hexdigest()
+        for bucket in (window, window - 1)
+    ]
+
+
+def entry_id_for(key):
+    """The client's Idempotency-Key as a journal id, or a fresh one"""
+    try:
+        return uuid.UUID(key).hex
+    except (TypeError, ValueError, AttributeError):
+        return uuid.uuid4().hex
+
+
+def accept_submission(kind, data, key=None):
+    """
+    Validate a form POST and journal it; returns (entry id, False) or, for
+    a repeat of a journaled submission, (entry id, True) with nothing written.
+    Raises ValidationError without journaling anything.
+    """
+    form = SUBMISSION_FORMS[kind]
+    values = {field: (data.get(field) or "").strip() for field in form.fields}
+    # No unique/constraint checks: those would query the database
+    form.model(**values).full_clean(
+        exclude=[form.timestamp_field, "submission_id", "fingerprint"],
+        validate_unique=False, validate_constraints=False,
+    )
+    entry_id = entry_id_for(key)
+    if not journal.append(entry_id, kind, values, fingerprints(kind, values)):
+        return entry_id, True
+    if not getattr(settings, "SUBMISSION_WRITE_BEHIND", False):
+        flush_submissions()
+    return entry_id, False
+
+
+# =========================
+# FLUSHING
+# =========================
+
+def build_row(kind, entry_id, values, received_at, fingerprint):
+    form = SUBMISSION_FORMS[kind]
+    return form.model(
+        submission_id=entry_id,
+        fingerprint=fingerprint,
+        **{form.timestamp_field: parse_datetime(received_at)},
+        **values,
+    )
+
+
+def insert_rows(rows):
+    """
+    bulk_create per model in one transaction. Journal ids already flushed
+    and fingerprints flushed by another server's journal are skipped.
+    """
+    by_model = defaultdict(list)
+    for row in rows:
+        by_model[type(row)].append(row)
+    with transaction.atomic():
+        for model, model_rows in by_model.items():
+            model.objects.bulk_create(model_rows, ignore_conflicts=True)
+
+
+def flush_submissions(limit=FLUSH_BATCH):
+    """
+    Move up to `limit` journal entries into the database; returns (flushed, failed).
+    Connection errors propagate and leave the entries in the journal.
+    """
+    entries = journal.pending(limit)
+    rows, failures = [], []
+    for entry_id, kind, values, received_at, fingerprint in entries:
+        try:
+            rows.append((entry_id, build_row(kind, entry_id, values, received_at, fingerprint)))
+        except (KeyError, TypeError, ValueError) as exc:
+            # Journaled by an older version of the forms
+            failures.append((entry_id, f"{type(exc).__name__}: {exc}"))
+
+    try:
+        insert_rows([row for entry_id, row in rows])
+        flushed = [entry_id for entry_id, row in rows]
+    except (IntegrityError, DataError):
+        # One bad row fails the batch: insert one by one to set it aside
+        flushed = []
+        for entry_id, row in rows:
+            try:
+                insert_rows([row])
+            except (IntegrityError, DataError) as exc:
+                failures.append((entry_id, f"{type(exc).__name__}: {exc}"))
+            else:
+                flushed.append(entry_id)
+
+    if failures:
+        logger.error("Set aside %d form submission(s) the database rejected", len(failures))
+        journal.mark_failed(failures)
+    if flushed:
+        journal.mark_flushed(flushed)
+    # Kept while a repeat could still match the current or previous window
+    journal.purge(time.time() - 2 * dedup_window())
+    return len(flushed), len(failures)
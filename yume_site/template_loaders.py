@@ -0,0 +1,18 @@
+from django.template.loaders import app_directories, filesystem
+
+from .inline_styles import bundle_links, rewrite_source
+
+
+class InlineStylesMixin:
+    """Serve template sources with their <style> runs swapped for bundle <link>s"""
+
+    def get_contents(self, origin):
+        return rewrite_source(super().get_contents(origin), bundle_links)
+
+
+class FilesystemLoader(InlineStylesMixin, filesystem.Loader):
+    pass
+
+
+class AppDirectoriesLoader(InlineStylesMixin, app_directories.Loader):
+    pass
@@ -0,0 +1,131 @@
+from pathlib import PurePosixPath
+
+from django import template
+from django.forms.utils import flatatt
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from yume_site.image_resizer import OUTPUT_FORMATS, resize_url
+from yume_site.renditions import MIME_TYPES, RenditionMap
+
+register = template.Library()
+
+
+def srcset(variants):
+    return ", ".join(f"{url} {width}w" for width, height, url in variants)
+
+
+def img_attrs(attrs):
+    attrs = {key.replace("_", "-"): value for key, value in attrs.items()}
+    attrs.setdefault("loading", "lazy")
+    attrs.setdefault("decoding", "async")
+    return attrs
+
+
+def page_renditions(context):
+    """The view's RenditionMap, or an empty one that looks images up one by one"""
+    return context.get("image_renditions") or RenditionMap(())
+
+
+@register.simple_tag(takes_context=True)
+def responsive_image(context, image, sizes="100vw", **attrs):
+    """
+    <picture> for an uploaded image with AVIF/WebP sources and a JPEG/PNG
+    <img> fallback, all width-described for `sizes`.
+
+        {% responsive_image blog.featured_image sizes="(max-width: 768px) 100vw, 33vw" alt=blog.title class="card-img-top" %}
+
+    Extra keyword arguments become <img> attributes (data_aos -> data-aos).
+    Images without renditions yet render as a plain <img> of the original.
+    A stored placeholder is inlined as the <img> background. Renditions
+    come from the view's `image_renditions` map when it has one.
+    """
+    if not image:
+        return ""
+
+    attrs = img_attrs(attrs)
+    renditions = page_renditions(context)
+
+    # Blurred preview behind the <img> until the real image paints over it
+    placeholder = renditions.placeholder_for(image.name)
+    if placeholder and placeholder[0]:
+        lqip, color = placeholder
+        background = f"background: {color} url({lqip}) center / cover no-repeat"
+        style = str(attrs.get("style", "")).strip().rstrip(";")
+        attrs["style"] = f"{style}; {background}" if style else background
+
+    variants = renditions.renditions_for(image.name)
+    fallback = variants.pop("jpeg", None) or variants.pop("png", None)
+    if not fallback:
+        return format_html('<img src="{}"{}>', image.url, flatatt(attrs))
+
+    # The widest fallback gives the intrinsic size (and aspect ratio)
+    width, height, url = fallback[-1]
+    sources = format_html_join(
+        "",
+        '<source type="{}" srcset="{}" sizes="{}">',
+        ((MIME_TYPES[fmt], srcset(items), sizes) for fmt, items in variants.items()),
+    )
+    # display: contents keeps the <img> laid out as the child of the
+    # original parent, so existing image CSS still applies
+    return format_html(
+        '<picture style="display: contents">{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}"{}></picture>',
+        sources, url, srcset(fallback), sizes, width, height, flatatt(attrs),
+    )
+
+
+@register.simple_tag
+def resized_image(source, *boxes, **attrs):
+    """
+    <img> of an uploaded image or a static path, shrunk by the /img/
+    endpoint to fit each "WxH" box (1x, 2x, ... density in order).
+
+        {% resized_image 'images/company/bosch.png' "160x40" "320x80" alt="Bosch" class="img-fluid" %}
+
+    Boxes must be listed in settings.IMAGE_RESIZE_SIZES. SVGs (and anything
+    but JPEG/PNG/WebP/AVIF) render as a plain <img> of the original.
+    """
+    if hasattr(source, "name"):
+        kind, name = "media", source.name
+        original = source.url if name else ""
+    else:
+        kind, name = "static", str(source)
+        original = static(name)
+    if not name:
+        return ""
+
+    attrs = img_attrs(attrs)
+    if not boxes or PurePosixPath(name).suffix.lower() not in OUTPUT_FORMATS:
+        return format_html('<img src="{}"{}>', original, flatatt(attrs))
+
+    urls = [resize_url(kind, name, *map(int, box.split("x"))) for box in boxes]
+    density = ", ".join(f"{url} {index}x" for index, url in enumerate(urls, start=1))
+    return format_html('<img src="{}" srcset="{}"{}>', urls[0], density, flatatt(attrs))
+
+
+@register.simple_tag
+def logo_sprite_styles(sprites):
+    """<style> with the sheet and cell rules of a logo_sprites.LogoSprites"""
+    if not sprites:
+        return ""
+    # Built only from stored names, numbers and fixed text
+    return mark_safe(f"<style>{sprites.css}</style>")
+
+
+@register.simple_tag(takes_context=True)
+def logo_sprite(context, logo, sprites, sizes="100vw", **attrs):
+    """
+    A company logo as its cell of the section's sprite sheet:
+
+        {% logo_sprite logo logo_sprites sizes="22vw" alt=logo.company_name %}
+
+    Logos missing from the sheets (just added, or not decodable) fall back
+    to responsive_image with the same arguments.
+    """
+    sheet = sprites.cells.get(logo.pk) if sprites else None
+    if sheet is None:
+        return responsive_image(context, logo.logo, sizes, **attrs)
+    alt = attrs.pop("alt", logo.company_name)
+    classes = f"logo-sprite logo-sprite-sheet-{sheet} logo-sprite-{logo.pk} {attrs.pop('class', '')}".strip()
+    return format_html('<span role="img" aria-label="{}" class="{}"></span>', alt, classes)
@@ -1,3 +1,320 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import signal
+import sqlite3
+import tempfile
+import uuid
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+
+from .models import BlogBlock, ContactInformation, ContactMessage, DynamicBlog, Enquiry
+from .site_snapshot import (
+    append_lines, page_path, pending_path, read_lines, refresh_pending, refresh_urls,
+    remove_page, write_page,
+)
+from .submissions import SubmissionJournal, accept_submission, flush_submissions
+
+
+class IsolatedTestCase(TestCase):
+    """Own cache, snapshot directory and related posts index per test"""
+
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        settings_override = override_settings(
+            CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+            PAGE_CACHE_ENABLED=True,
+            SITE_SNAPSHOT_ROOT=f"{self.tmp}/snapshot",
+            RELATED_BLOGS_INDEX_PATH=f"{self.tmp}/related.npz",
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+        self.client = Client()
+
+    def create_blog(self, slug="pivot-tables", **values):
+        values = {
+            "title": "Pivot tables in practice",
+            "category": "excel",
+            "excerpt": "Summarise a sheet in a few clicks",
+            "is_published": True,
+            "publish_date": timezone.now() - timedelta(days=1),
+            **values,
+        }
+        return DynamicBlog.objects.create(slug=slug, **values)
+
+
+# =========================
+# PAGE CACHE
+# =========================
+class PageCacheTests(IsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.blog = self.create_blog()
+        self.url = f"/blog/dynamic/{self.blog.slug}/"
+
+    def test_second_request_is_a_hit(self):
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+
+        self.assertEqual(first["X-Page-Cache"], "MISS")
+        self.assertEqual(second["X-Page-Cache"], "HIT")
+        self.assertEqual(first.content, second.content)
+
+    def test_block_save_drops_the_post_page(self):
+        self.client.get(self.url)
+        block = BlogBlock.objects.get(blog=self.blog, kind="feature", order=1)
+        block.title = "Slicers and timelines"
+        with self.captureOnCommitCallbacks(execute=True):
+            block.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Page-Cache"], "MISS")
+        self.assertContains(response, "Slicers and timelines")
+
+    def test_unrelated_save_keeps_the_page(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            ContactInformation.objects.create(address="Chennai", phone="9876543210", email="hello@example.com")
+
+        self.assertEqual(self.client.get(self.url)["X-Page-Cache"], "HIT")
+
+    def test_logged_in_requests_skip_the_cache(self):
+        self.client.get(self.url)
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = "editor"
+
+        self.assertNotIn("X-Page-Cache", self.client.get(self.url))
+
+
+# =========================
+# SITE SNAPSHOT
+# =========================
+class SiteSnapshotTests(IsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.blog = self.create_blog()
+        self.url = f"/blog/dynamic/{self.blog.slug}/"
+
+    def test_refresh_pending_retries_after_a_render_failure(self):
+        append_lines(pending_path(), [self.url])
+        with mock.patch("yume_site.site_snapshot._render_urls", side_effect=OSError("disk full")):
+            with self.assertLogs("yume_site.site_snapshot", "ERROR"):
+                self.assertEqual(refresh_pending(), [])
+        self.assertFalse(os.path.exists(page_path(self.url)))
+
+        rendered = refresh_pending()
+        self.assertEqual([url for url, size in rendered], [self.url])
+        self.assertTrue(os.path.exists(page_path(self.url)))
+        self.assertEqual(refresh_pending(), [])
+
+    def test_middleware_follows_written_and_removed_pages(self):
+        self.assertFalse(self.client.get(self.url).streaming)
+
+        write_page(self.url, b"<html>snapshot</html>")
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        self.assertEqual(b"".join(response.streaming_content), b"<html>snapshot</html>")
+
+        remove_page(self.url)
+        self.assertFalse(self.client.get(self.url).streaming)
+
+    def test_saves_queue_the_pages_that_showed_the_row(self):
+        refresh_urls([self.url])
+        block = BlogBlock.objects.get(blog=self.blog, kind="feature", order=1)
+        block.title = "Slicers and timelines"
+        with self.captureOnCommitCallbacks(execute=True):
+            block.save()
+
+        self.assertFalse(os.path.exists(page_path(self.url)))
+        self.assertIn(self.url, read_lines(pending_path()))
+        refresh_pending()
+        with open(page_path(self.url), "rb") as page:
+            self.assertIn(b"Slicers and timelines", page.read())
+
+
+# =========================
+# WRITE-BEHIND FORM SUBMISSIONS
+# =========================
+@override_settings(SUBMISSION_WRITE_BEHIND=True)
+class SubmissionTestCase(IsolatedTestCase):
+    """Submissions go to a journal and token buckets of their own"""
+
+    def setUp(self):
+        super().setUp()
+        self.journal = SubmissionJournal(f"{self.tmp}/submissions.sqlite3")
+        for patch in (
+            mock.patch("yume_site.submissions.journal", self.journal),
+            # Token buckets remember senders in process memory too
+            mock.patch.dict("yume_site.throttling._buckets", clear=True),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def contact(self, **values):
+        return {
+            "first_name": "Asha", "last_name": "Rao", "phone": "98765 43210",
+            "email": "asha@example.com", "message": "Do you run weekend batches?",
+            **values,
+        }
+
+
+class SubmissionFlushTests(SubmissionTestCase):
+    def test_accepted_submissions_wait_in_the_journal(self):
+        accept_submission("contact", self.contact())
+
+        self.assertEqual(self.journal.counts(), (1, 0))
+        self.assertFalse(ContactMessage.objects.exists())
+
+    def test_flush_moves_entries_into_the_database(self):
+        accept_submission("contact", self.contact())
+        accept_submission("enquiry", {**self.contact(), "mobile": "9123456780"})
+
+        self.assertEqual(flush_submissions(), (2, 0))
+        self.assertEqual(self.journal.counts(), (0, 0))
+        self.assertEqual(ContactMessage.objects.get().email, "asha@example.com")
+        self.assertEqual(Enquiry.objects.count(), 1)
+
+    def test_replaying_a_flushed_batch_adds_nothing(self):
+        accept_submission("contact", self.contact())
+        accept_submission("contact", self.contact(email="ravi@example.com", phone="9000000001"))
+        flush_submissions()
+
+        # A crash between the insert and marking the entries flushed
+        self.journal.connection().execute("UPDATE submissions SET flushed_at = NULL")
+        self.assertEqual(flush_submissions(), (2, 0))
+        self.assertEqual(ContactMessage.objects.count(), 2)
+        self.assertEqual(self.journal.counts(), (0, 0))
+
+    def test_rows_the_database_rejects_are_set_aside(self):
+        accept_submission("contact", self.contact())
+        self.journal.connection().execute("UPDATE submissions SET kind = 'retired_form'")
+
+        with self.assertLogs("yume_site.submissions", "ERROR"):
+            self.assertEqual(flush_submissions(), (0, 1))
+        self.assertEqual(self.journal.counts(), (0, 1))
+
+    def test_flusher_keeps_running_after_a_journal_error(self):
+        calls = []
+
+        def flush(batch):
+            calls.append(batch)
+            if len(calls) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            # Stopped like the platform stops it, once the journal is empty
+            os.kill(os.getpid(), signal.SIGTERM)
+            return 0, 0
+
+        self.addCleanup(signal.signal, signal.SIGTERM, signal.getsignal(signal.SIGTERM))
+        stderr = io.StringIO()
+        with mock.patch("yume_site.management.commands.flush_submissions.flush_submissions", flush):
+            call_command("flush_submissions", poll=0, stderr=stderr)
+
+        self.assertEqual(len(calls), 2)
+        self.assertIn("database is locked", stderr.getvalue())
+
+
+class SubmissionDedupTests(SubmissionTestCase):
+    def post(self, data, key=None):
+        headers = {"HTTP_IDEMPOTENCY_KEY": key} if key else {}
+        return self.client.post("/contact/", data, **headers)
+
+    def test_replayed_idempotency_key_is_stored_once(self):
+        key = str(uuid.uuid4())
+        responses = [self.post(self.contact(), key) for _ in range(3)]
+
+        for response in responses:
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["status"], "success")
+        flush_submissions()
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertEqual(ContactMessage.objects.get().submission_id, uuid.UUID(key))
+
+    def test_same_details_within_the_window_are_stored_once(self):
+        self.post(self.contact(), str(uuid.uuid4()))
+        # Another click on a fresh form: new key, same person and message
+        response = self.post(self.contact(email=" ASHA@example.com", phone="+91 98765-43210"), str(uuid.uuid4()))
+
+        self.assertEqual(response.json()["status"], "success")
+        self.assertEqual(self.journal.counts(), (1, 0))
+
+    def test_window_boundary_does_not_split_a_repeat(self):
+        window = settings.SUBMISSION_DEDUP_WINDOW
+        start = (1_000_000 * window) + window - 1  # one second before a boundary
+        with mock.patch("yume_site.submissions.time.time", return_value=start):
+            self.assertFalse(accept_submission("contact", self.contact())[1])
+        with mock.patch("yume_site.submissions.time.time", return_value=start + 2):
+            self.assertTrue(accept_submission("contact", self.contact())[1])
+        with mock.patch("yume_site.submissions.time.time", return_value=start + 2 * window + 1):
+            self.assertFalse(accept_submission("contact", self.contact())[1])
+
+        self.assertEqual(self.journal.counts(), (2, 0))
+
+    def test_different_message_is_a_new_submission(self):
+        self.post(self.contact(), str(uuid.uuid4()))
+        self.post(self.contact(message="And weekday evenings?"), str(uuid.uuid4()))
+
+        self.assertEqual(self.journal.counts(), (2, 0))
+
+
+# =========================
+# FORM THROTTLING
+# =========================
+@override_settings(
+    FORM_THROTTLES={"contact": {"ip": ("60/h", 5), "identity": ("6/h", 2)}},
+    THROTTLE_TRUSTED_PROXIES=1,
+)
+class FormThrottleTests(SubmissionTestCase):
+    def post(self, data, key=None, ip="203.0.113.7"):
+        return self.client.post(
+            "/contact/", data, REMOTE_ADDR=ip, HTTP_IDEMPOTENCY_KEY=key or str(uuid.uuid4()),
+        )
+
+    def test_sender_over_the_limit_gets_429_with_retry_after(self):
+        for number in range(2):
+            self.assertEqual(self.post(self.contact(message=f"Question {number}")).status_code, 200)
+
+        with self.assertLogs("django.request", "WARNING"):
+            response = self.post(self.contact(message="Question 2"))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()["status"], "error")
+        # One token every 10 minutes
+        self.assertEqual(int(response["Retry-After"]), 600)
+        self.assertEqual(self.journal.counts(), (2, 0))
+
+    def test_address_over_the_limit_gets_429(self):
+        for number in range(5):
+            self.post(self.contact(email=f"student{number}@example.com", phone=f"900000000{number}"))
+
+        with self.assertLogs("django.request", "WARNING"):
+            response = self.post(self.contact(email="student9@example.com", phone="9000000009"))
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 0)
+
+    def test_replays_and_repeats_cost_no_identity_tokens(self):
+        key = str(uuid.uuid4())
+        for _ in range(3):
+            self.assertEqual(self.post(self.contact(), key).status_code, 200)
+        self.assertEqual(self.post(self.contact()).status_code, 200)
+
+        self.assertEqual(self.post(self.contact(message="A real follow-up")).status_code, 200)
+
+    def test_forwarded_address_from_the_trusted_proxy_is_used(self):
+        for number in range(5):
+            self.client.post(
+                "/contact/", self.contact(email=f"s{number}@example.com", phone=f"900000000{number}"),
+                REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR=f"198.51.100.{number}",
+            )
+
+        response = self.client.post(
+            "/contact/", self.contact(email="s9@example.com", phone="9000000009"),
+            REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="198.51.100.99",
+        )
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,183 @@
+import hashlib
+import math
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .submissions import normalise
+
+
+# =========================
+# FORM THROTTLING
+# =========================
+# Token buckets for the public form POSTs, keyed by client IP and by the
+# email/mobile submitted, with a rate and burst per endpoint and key kind
+# (FORM_THROTTLES). A bucket is kept as one number, the time it will be
+# full again (GCRA), in the shared cache so limits hold across gunicorn
+# workers. Each worker also remembers the last time it saw per key. That
+# can only lag the shared one, so a key over its limit locally is rejected
+# without a cache round trip. Two workers admitting one key at the same
+# instant may each let a request in: limits are exact to within the worker
+# count.
+
+UNITS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+# Local times kept per bucket before expired ones are dropped
+LOCAL_KEYS = 10000
+
+IDENTITY_FIELDS = ("email", "mobile", "phone")
+
+
+def parse_rate(rate):
+    """'6/h' -> seconds per token"""
+    count, unit = rate.split("/")
+    return UNITS[unit[0]] / int(count)
+
+
+class TokenBucket:
+    def __init__(self, name, rate, burst):
+        self.name = name
+        self.interval = parse_rate(rate)
+        # A full bucket lets `burst` requests through at once
+        self.tolerance = (burst - 1) * self.interval
+        self.lock = threading.Lock()
+        self.seen = {}
+
+    def cache_key(self, key):
+        return f"throttle:{self.name}:{hashlib.sha256(key.encode()).hexdigest()[:32]}"
+
+    def take(self, key, now=None, spend=True):
+        """
+        Spend a token for `key` (only check for one with spend=False): 0 if
+        there was one, else seconds until there is
+        """
+        now = time.time() if now is None else now
+        seen = self.seen.get(key, 0)
+        if seen - now > self.tolerance:
+            return seen - now - self.tolerance
+
+        cache_key = self.cache_key(key)
+        full_at = max(cache.get(cache_key) or 0, seen, now)
+        if full_at - now > self.tolerance:
+            self.remember(key, full_at, now)
+            return full_at - now - self.tolerance
+        if not spend:
+            return 0
+        full_at += self.interval
+        # Gone from the cache exactly when the bucket is full again
+        cache.set(cache_key, full_at, math.ceil(full_at - now))
+        self.remember(key, full_at, now)
+        return 0
+
+    def remember(self, key, full_at, now):
+        with self.lock:
+            if len(self.seen) >= LOCAL_KEYS:
+                self.seen = {known: at for known, at in self.seen.items() if at > now}
+            self.seen[key] = full_at
+
+
+_buckets = {}
+
+
+def bucket(endpoint, kind):
+    """The TokenBucket for an endpoint and key kind, None if not throttled"""
+    limit = getattr(settings, "FORM_THROTTLES", {}).get(endpoint, {}).get(kind)
+    if limit is None:
+        return None
+    # Keyed by the limit too, so a settings change gets a fresh bucket
+    name = (endpoint, kind, *limit)
+    if name not in _buckets:
+        _buckets[name] = TokenBucket(f"{endpoint}:{kind}", *limit)
+    return _buckets[name]
+
+
+def client_ip(request):
+    """The client's address: the entry THROTTLE_TRUSTED_PROXIES hops from the right of X-Forwarded-For"""
+    proxies = getattr(settings, "THROTTLE_TRUSTED_PROXIES", 0)
+    forwarded = [part.strip() for part in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if part.strip()]
+    if proxies and forwarded:
+        # Entries further left are set by the client and could be anything
+        return forwarded[-min(proxies, len(forwarded))]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+# =========================
+# COUNTERS
+# =========================
+# Rejections per endpoint and key kind: this worker's in `throttled`, all
+# workers' since the deploy in the cache (manage.py throttle_stats)
+
+throttled = Counter()
+
+
+def counter_key(endpoint, kind):
+    return f"throttle_count:{endpoint}:{kind}"
+
+
+def record_throttled(endpoint, kind):
+    throttled[endpoint, kind] += 1
+    key = counter_key(endpoint, kind)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add and incr
+        cache.set(key, 1, None)
+
+
+def throttled_counts():
+    """{(endpoint, kind): rejections} across workers"""
+    names = [(endpoint, kind) for endpoint, limits in getattr(settings, "FORM_THROTTLES", {}).items() for kind in limits]
+    counts = cache.get_many([counter_key(*name) for name in names])
+    return {name: counts.get(counter_key(*name), 0) for name in names}
+
+
+# =========================
+# CHECK
+# =========================
+
+def identities(request):
+    """Bucket keys of the email / mobile / phone submitted"""
+    for field in IDENTITY_FIELDS:
+        value = normalise(field, request.POST.get(field) or "")
+        if value:
+            yield f"{field}:{value}"
+
+
+def check_form_throttle(request, endpoint):
+    """
+    Seconds the client must wait before this POST is accepted, 0 if it may
+    go ahead. Runs before any ORM query; the IP is checked first, so a
+    flood from one address is rejected without touching the identity
+    buckets (the body has already been parsed by CsrfViewMiddleware).
+
+    Identity tokens are only checked here: charge_identity() spends them
+    once the submission is journaled as new, so replays and repeats of an
+    accepted submission cost the sender nothing.
+    """
+    ip_bucket = bucket(endpoint, "ip")
+    if ip_bucket is not None:
+        wait = ip_bucket.take(client_ip(request))
+        if wait:
+            record_throttled(endpoint, "ip")
+            return wait
+
+    identity_bucket = bucket(endpoint, "identity")
+    if identity_bucket is not None:
+        for key in identities(request):
+            wait = identity_bucket.take(key, spend=False)
+            if wait:
+                record_throttled(endpoint, "identity")
+                return wait
+    return 0
+
+
+def charge_identity(request, endpoint):
+    """Spend the identity tokens of a POST that journaled a new submission"""
+    identity_bucket = bucket(endpoint, "identity")
+    if identity_bucket is not None:
+        for key in identities(request):
+            identity_bucket.take(key)
@@ -0,0 +1,106 @@
+import logging
+import tempfile
+from pathlib import PurePosixPath
+
+from django.core.files import File
+from PIL import ExifTags, Image, ImageOps
+
+from .models import (
+    Advisor, CompanyLogo, Course, DynamicBlog, GalleryImage, HeroSlide,
+    ProjectCard, ProjectDetail,
+)
+from .renditions import has_alpha
+
+logger = logging.getLogger(__name__)
+
+
+# =========================
+# UPLOAD DOWNSIZING
+# =========================
+# A new upload is replaced, before it is written to media/, by a re-encoded
+# copy that fits its field's bounding box (about twice the recommended or
+# largest displayed size, for high-density screens) with EXIF/XMP removed.
+# JPEGs are decoded in draft mode at the smallest 1/2..1/8 scale that still
+# covers the box, so a 24 MP photo never exists in memory at full size;
+# other formats are capped in pixels by validators.validate_image_pixels.
+
+MAX_DIMENSIONS = {
+    (HeroSlide, 'image'): (1920, 1080),
+    (Advisor, 'image'): (700, 760),
+    (GalleryImage, 'image'): (1600, 1200),
+    (CompanyLogo, 'logo'): (600, 300),
+    (DynamicBlog, 'featured_image'): (1400, 800),
+    # Also the project detail hero when it has no hero image
+    (ProjectCard, 'thumbnail_image'): (1200, 800),
+    (ProjectDetail, 'hero_image'): (1920, 1080),
+    (Course, 'image'): (600, 600),
+}
+
+SAVE_OPTIONS = {
+    'JPEG': {'quality': 88, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 88, 'method': 4},
+}
+
+# Re-encoded copies stay in memory up to this size, then spill to disk
+SPOOL_SIZE = 2 * 1024 * 1024
+
+
+def stored_target_size(image, max_size):
+    """Size the image is shrunk to, in its stored (pre-EXIF-rotation) orientation"""
+    width, height = image.size
+    rotated = image.getexif().get(ExifTags.Base.Orientation) in (5, 6, 7, 8)
+    box_width, box_height = max_size[::-1] if rotated else max_size
+    scale = min(box_width / width, box_height / height, 1)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def downsize_upload(field_file, max_size):
+    """Swap an uncommitted upload for a stripped copy that fits `max_size`"""
+    upload = field_file.file
+    upload.seek(0)
+    with Image.open(upload) as image:
+        fmt = image.format
+        image.draft('RGB', stored_target_size(image, max_size))
+        image.load()
+        ImageOps.exif_transpose(image, in_place=True)
+        alpha = has_alpha(image)
+        if image.mode in ('1', 'P'):
+            # Palette images would be resized with NEAREST
+            image = image.convert('RGBA' if alpha else 'RGB')
+        image.thumbnail(max_size, Image.LANCZOS, reducing_gap=3.0)
+
+        if fmt not in SAVE_OPTIONS:
+            # GIF, BMP, TIFF...: stored as PNG or JPEG from now on
+            fmt = 'PNG' if alpha else 'JPEG'
+        if fmt == 'JPEG' and image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        output = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        # Only the colour profile is kept, not EXIF/XMP/text chunks
+        options = dict(SAVE_OPTIONS[fmt], icc_profile=image.info.get('icc_profile'))
+        image.save(output, fmt, **options)
+
+    name = PurePosixPath(field_file.name)
+    extension = '.jpg' if fmt == 'JPEG' else f'.{fmt.lower()}'
+    if Image.registered_extensions().get(name.suffix.lower()) != fmt:
+        name = name.with_suffix(extension)
+    output.seek(0)
+    field_file.file = File(output, name=name.name)
+    field_file.name = str(name)
+
+
+def shrink_uploads(instance):
+    """Downsize every image field of an instance that holds a new upload"""
+    deferred = instance.get_deferred_fields()
+    for (model, field_name), max_size in MAX_DIMENSIONS.items():
+        if type(instance) is not model or field_name in deferred:
+            continue
+        field_file = getattr(instance, field_name)
+        if not field_file or field_file._committed:
+            continue
+        try:
+            downsize_upload(field_file, max_size)
+        except (OSError, ValueError, Image.DecompressionBombError):
+            # Validated as an image by the form, so keep it as uploaded
+            logger.exception("Could not downsize upload %s", field_file.name)
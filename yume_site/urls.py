@@ -55,8 +55,11 @@ urlpatterns = [
     
     path("faqs/", views.faqs, name="faqs"),
     
+    path("search/", views.search, name="search"),
+    
      # Blog URLs
     path("blog/", views.blog, name="blog"),
+    path("blog/category/<slug:category>/", views.blog, name="blog_category"),
     path("blog/dynamic/<slug:slug>/", views.dynamic_blog_detail, name="dynamic_blog_detail"),
     
     path("excel_blog/", views.excel_blog, name="excel_blog"),
@@ -75,6 +78,7 @@ urlpatterns = [
     path("enrollment_form/", views.enrollment_form, name="enrollment_form"),
     
     path("enquire_now/", views.enquire_now, name="enquire_now"),
+    path("csrf/", views.csrf_token, name="csrf_token"),
     
     
     # path("projects/", views.projects_page, name="projects"),
@@ -88,6 +92,7 @@ urlpatterns = [
     
     path("projects/", views.projects_page, name="projects"),
     path('projects/<slug:slug>/', views.project_detail, name='project_detail'),
-    
+
+    path("img/<int:width>x<int:height>/<str:kind>/<path:path>", views.resize_image, name="resize_image"),
  
 ]
@@ -0,0 +1,31 @@
+from django.core.exceptions import ValidationError
+from PIL import Image
+
+# Largest upload decoded at full size (PNG, WebP, GIF): ~100 MB as RGBA
+MAX_IMAGE_PIXELS = 24_000_000
+# JPEGs are decoded at 1/2 to 1/8 scale (draft mode), see uploads.py
+MAX_JPEG_PIXELS = 100_000_000
+
+
+def validate_image_pixels(value):
+    """Reject new uploads too large to decode within the dyno's memory"""
+    if getattr(value, '_committed', True):
+        return
+    try:
+        value.file.seek(0)
+        with Image.open(value.file) as image:
+            width, height = image.size
+            fmt = image.format
+    except Image.DecompressionBombError:
+        width = height = None
+        fmt = None
+    finally:
+        value.file.seek(0)
+
+    limit = MAX_JPEG_PIXELS if fmt == 'JPEG' else MAX_IMAGE_PIXELS
+    if width is None or width * height > limit:
+        raise ValidationError(
+            "This image is too large. Please upload one under %(limit)d megapixels.",
+            code='image_too_large',
+            params={'limit': limit // 1_000_000},
+        )
@@ -1,18 +1,23 @@
 from django.shortcuts import render
 from .models import Course
+from .page_cache import cached_public_page
+from .renditions import rendition_map
 
 from .models import HeroSlide
 
+@cached_public_page(HeroSlide)
 def home_page(request):
     hero_slides = HeroSlide.objects.filter(is_active=True).order_by("order")
     return render(request, "home.html", {
-        "hero_slides": hero_slides
+        "hero_slides": hero_slides,
+        "image_renditions": rendition_map(slide.image for slide in hero_slides),
     })
 
 
 from django.shortcuts import render
 from .models import Advisor, GalleryImage
 
+@cached_public_page(Advisor, GalleryImage)
 def about_page(request):
     """About page with dynamic advisors and gallery"""
     
@@ -22,6 +27,9 @@ def about_page(request):
     context = {
         "advisors": advisors,
         "gallery_images": gallery_images,
+        "image_renditions": rendition_map(
+            [advisor.image for advisor in advisors] + [image.image for image in gallery_images]
+        ),
     }
     return render(request, "about.html", context)
 
@@ -116,9 +124,17 @@ def placements_page(request):
     
 
 from django.shortcuts import render
-from .models import PlacementsSection, InternshipSection
+from .models import (
+    PlacementsSection, CompanyLogo, LogoSpriteSheet, ManyMoreCompanies,
+    InternshipSection, InternshipBenefit
+)
+from .logo_sprites import logo_sprites_for
 
 
+@cached_public_page(
+    PlacementsSection, CompanyLogo, LogoSpriteSheet, ManyMoreCompanies,
+    InternshipSection, InternshipBenefit
+)
 def placements_page(request):
     placements_section = (
         PlacementsSection.objects
@@ -142,20 +158,29 @@ def placements_page(request):
     )
 
     internship_benefits = internship_section.benefits.all() if internship_section else None
+    logo_sprites = logo_sprites_for(placements_section)
+    # Logos missing from the sprite sheets render as responsive images
+    unsprited = [logo.logo for logo in company_logos if not logo_sprites or logo.pk not in logo_sprites.cells]
 
     return render(request, "placements.html", {
         "placements_section": placements_section,
         "company_logos": company_logos,          # ✅ FIX
         "many_more_section": many_more_section,  # ✅ FIX
+        "logo_sprites": logo_sprites,
+        "image_renditions": rendition_map(unsprited),
         "internship_section": internship_section,
         "internship_benefits": internship_benefits,
     })
 
 
 
+@cached_public_page(Course)
 def courses_page(request):
     courses = Course.objects.filter(is_active=True).order_by('order')
-    return render(request, 'courses.html', {'courses': courses})
+    return render(request, 'courses.html', {
+        'courses': courses,
+        'image_renditions': rendition_map(course.image for course in courses),
+    })
 
 
 
@@ -166,15 +191,33 @@ def faqs(request):
 # Add these functions to your existing yume_site/views.py
 
 from .models import DynamicBlog
+from .blog_listing import blog_page, category_facets, is_valid_cursor
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 
-def blog(request):
-    """Show all blogs (static + dynamic)"""
-    # Get all published dynamic blogs
-    dynamic_blogs = DynamicBlog.objects.filter(is_published=True).order_by('display_order', '-publish_date')
+@cached_public_page(DynamicBlog)
+def blog(request, category=None):
+    """Show blogs (static + dynamic), optionally one category"""
+    categories = dict(DynamicBlog.CATEGORY_CHOICES)
+    if category is not None and category not in categories:
+        raise Http404("Unknown blog category")
+    after = request.GET.get("after")
+    if after is not None and not is_valid_cursor(after):
+        raise Http404("Invalid page")
+
+    # Keyset pages over the narrow card table (see blog_listing.py)
+    dynamic_blogs, next_cursor = blog_page(category, after)
+    facets = category_facets()
     
     return render(request, "blog.html", {
-        "dynamic_blogs": dynamic_blogs
+        "dynamic_blogs": dynamic_blogs,
+        "image_renditions": rendition_map(card.featured_image for card in dynamic_blogs),
+        "next_cursor": next_cursor,
+        "is_first_page": after is None,
+        "category": category,
+        "category_label": categories.get(category),
+        "category_facets": facets,
+        "total_count": sum(facet["count"] for facet in facets),
     })
 
 
@@ -192,34 +235,56 @@ def blog(request):
 #         "blog": blog_post,
 #         "related_blogs": related_blogs
 #     })
-    
+
+# Rows it shows are recorded as it loads them: a save only drops the pages
+# of that post and of the posts that link to it
+@cached_public_page()
 def dynamic_blog_detail(request, slug):
     """Show dynamic blog detail page"""
-    blog_post = get_object_or_404(DynamicBlog, slug=slug, is_published=True)
-    
-    # Get related blogs (same category)
-    related_blogs = DynamicBlog.objects.filter(
-        category=blog_post.category,
+    blog_post = get_object_or_404(
+        DynamicBlog.objects.select_related('navigation').prefetch_related('blocks'),
+        slug=slug,
         is_published=True
-    ).exclude(id=blog_post.id).order_by('-publish_date')[:3]
+    )
     
-    # Get previous blog
-    previous_blog = DynamicBlog.objects.filter(
-        publish_date__lt=blog_post.publish_date,
-        is_published=True
-    ).order_by('-publish_date').first()
+    # Previous / next / related come from the precomputed navigation index
+    # (see blog_navigation.py): one primary-key lookup for all five
+    previous_blog = None
+    next_blog = None
+    related_blogs = []
+    navigation = getattr(blog_post, 'navigation', None)
+    if navigation:
+        neighbours = DynamicBlog.objects.only(
+            'title', 'slug', 'featured_image', 'publish_date'
+        ).in_bulk([
+            blog_id for blog_id in (
+                navigation.previous_blog_id,
+                navigation.next_blog_id,
+                *navigation.related_blog_ids,
+            ) if blog_id
+        ])
+        previous_blog = neighbours.get(navigation.previous_blog_id)
+        next_blog = neighbours.get(navigation.next_blog_id)
+        related_blogs = [
+            neighbours[blog_id] for blog_id in navigation.related_blog_ids
+            if blog_id in neighbours
+        ]
     
-    # Get next blog
-    next_blog = DynamicBlog.objects.filter(
-        publish_date__gt=blog_post.publish_date,
-        is_published=True
-    ).order_by('publish_date').first()
+    # Sidebar post counts per category (cached, see blog_listing.py)
+    facets = category_facets()
     
     return render(request, "blog_detail.html", {
         "blog": blog_post,
+        # Features, applications, stats and sidebar courses
+        "blocks": group_blocks(blog_post.blocks.all()),
         "related_blogs": related_blogs,
+        "image_renditions": rendition_map(
+            [blog_post.featured_image] + [related.featured_image for related in related_blogs]
+        ),
         "previous_blog": previous_blog,
-        "next_blog": next_blog
+        "next_blog": next_blog,
+        "category_facets": facets,
+        "total_count": sum(facet["count"] for facet in facets),
     })
 
 
@@ -300,35 +365,67 @@ def enquire_now(request):
 
 #     return render(request, "contact.html")
 
+import logging
+import math
+
 from django.shortcuts import render
 from django.http import JsonResponse
+from django.core.exceptions import ValidationError
 from .models import ContactMessage, ContactInformation
+from .submissions import accept_submission
+from .throttling import charge_identity, check_form_throttle
+
+logger = logging.getLogger(__name__)
+
+
+def submission_response(request, kind, success_message):
+    """
+    Journal a form POST (submissions.py) and answer the page's AJAX handler.
+    A repeat of an accepted submission gets the same success response.
+    """
+    # Before anything touches the journal or the database
+    wait = check_form_throttle(request, kind)
+    if wait:
+        response = JsonResponse({
+            "status": "error",
+            "message": "Too many submissions. Please try again in a little while."
+        }, status=429)
+        response["Retry-After"] = math.ceil(wait)
+        return response
+
+    try:
+        entry_id, repeat = accept_submission(kind, request.POST, key=request.headers.get("Idempotency-Key"))
+    except ValidationError:
+        # Field errors can echo the input, which the page renders as HTML
+        return JsonResponse({
+            "status": "error",
+            "message": "Please check the form and try again."
+        })
+    except Exception:
+        logger.exception("Could not journal a %s submission", kind)
+        return JsonResponse({
+            "status": "error",
+            "message": "Something went wrong. Please try again."
+        })
+    if not repeat:
+        charge_identity(request, kind)
+    return JsonResponse({
+        "status": "success",
+        "message": success_message
+    })
 
 
-def contact_page(request):
 
-    contact_info = ContactInformation.objects.first()
+@cached_public_page(ContactInformation)
+def contact_page(request):
 
+    # Before any query, so a throttled POST never reaches the database
     if request.method == "POST":
-        try:
-            ContactMessage.objects.create(
-                first_name=request.POST.get('first_name'),
-                last_name=request.POST.get('last_name'),
-                phone=request.POST.get('phone'),
-                email=request.POST.get('email'),
-                message=request.POST.get('message')
-            )
-
-            return JsonResponse({
-                "status": "success",
-                "message": "Thank you! Your message has been sent successfully."
-            })
-
-        except Exception:
-            return JsonResponse({
-                "status": "error",
-                "message": "Something went wrong. Please try again."
-            })
+        return submission_response(
+            request, "contact", "Thank you! Your message has been sent successfully."
+        )
+
+    contact_info = ContactInformation.objects.first()
 
     return render(request, "contact.html", {
         "contact_info": contact_info
@@ -341,28 +438,12 @@ from django.shortcuts import render
 from django.http import JsonResponse
 from .models import Enrollment
 
+@cached_public_page()
 def enrollment_form(request):
 
     # 👉 POST: Save data (AJAX)
     if request.method == "POST":
-        try:
-            Enrollment.objects.create(
-                first_name=request.POST.get('first_name'),
-                last_name=request.POST.get('last_name'),
-                email=request.POST.get('email'),
-                mobile=request.POST.get('mobile'),
-                education=request.POST.get('education'),
-                course=request.POST.get('course'),
-            )
-            return JsonResponse({
-                'status': 'success',
-                'message': 'Enrollment completed successfully!'
-            })
-        except Exception as e:
-            return JsonResponse({
-                'status': 'error',
-                'message': 'Something went wrong. Please try again.'
-            })
+        return submission_response(request, "enrollment", "Enrollment completed successfully!")
 
     # 👉 GET: Show enrollment page
     return render(request, "enrollment_form.html")
@@ -374,28 +455,13 @@ from django.shortcuts import render
 from django.http import JsonResponse
 from .models import Enquiry
 
+@cached_public_page()
 def enquire_now(request):
 
     if request.method == "POST":
-        try:
-            Enquiry.objects.create(
-                first_name=request.POST.get('first_name'),
-                last_name=request.POST.get('last_name'),
-                email=request.POST.get('email'),
-                mobile=request.POST.get('mobile'),
-                message=request.POST.get('message'),
-            )
-
-            return JsonResponse({
-                "status": "success",
-                "message": "Thank you! Your enquiry has been submitted successfully."
-            })
-
-        except Exception:
-            return JsonResponse({
-                "status": "error",
-                "message": "Something went wrong. Please try again."
-            })
+        return submission_response(
+            request, "enquiry", "Thank you! Your enquiry has been submitted successfully."
+        )
 
     return render(request, "enquire_now.html")
 
@@ -405,28 +471,23 @@ def enquire_now(request):
 
 
 
-from django.shortcuts import render, get_object_or_404
-from .models import Course
+from django.shortcuts import render
+from django.http import Http404
+from .course_snapshot import COURSE_MODELS, get_course_snapshot
 
+@cached_public_page(*COURSE_MODELS)
 def course_detail(request, course_url):
-    course = get_object_or_404(
-        Course,
-        course_url=course_url,
-        is_active=True
-    )
-
-    curriculum_months = course.curriculum_months.filter(
-        is_active=True
-    ).prefetch_related(
-        "sections__topics"
-    )
+    # Whole course graph comes from the versioned snapshot cache
+    course = get_course_snapshot(course_url)
+    if course is None:
+        raise Http404("Course not found")
 
     return render(
         request,
         "course_detail.html",
         {
             "course": course,
-            "curriculum_months": curriculum_months,
+            "curriculum_months": course.curriculum_months,
         }
     )
 
@@ -434,27 +495,112 @@ def course_detail(request, course_url):
 
 from django.shortcuts import render, get_object_or_404
 from .models import ProjectCard
+from .content_blocks import group_blocks
 
 
+@cached_public_page(ProjectCard)
 def projects_page(request):
     """Show all active project cards"""
     project_cards = ProjectCard.objects.filter(is_active=True).order_by('display_order')
     
     return render(request, "projects.html", {
-        "project_cards": project_cards
+        "project_cards": project_cards,
+        "image_renditions": rendition_map(card.thumbnail_image for card in project_cards),
     })
 
 
+@cached_public_page()
 def project_detail(request, slug):
     """Show project detail page"""
-    project_card = get_object_or_404(ProjectCard, slug=slug, is_active=True)
+    project_card = get_object_or_404(
+        ProjectCard.objects
+        .select_related('detail_page')
+        .prefetch_related('detail_page__blocks'),
+        slug=slug,
+        is_active=True
+    )
     
     # Get detail page if it exists
     detail_page = None
+    blocks = {}
     if hasattr(project_card, 'detail_page'):
         detail_page = project_card.detail_page
+        blocks = group_blocks(detail_page.blocks.all())
     
     return render(request, "project_detail.html", {
         "project_card": project_card,
-        "detail_page": detail_page
-    })
\ No newline at end of file
+        "detail_page": detail_page,
+        "blocks": blocks,
+        # The page shows one image, and only with a detail page
+        "image_renditions": rendition_map(
+            [detail_page.hero_image or project_card.thumbnail_image] if detail_page else []
+        ),
+    })
+
+
+from .models import SearchDocument
+from .search import MAX_QUERY_LENGTH, search_site
+
+
+def search(request):
+    """Ranked full-text search over courses, blogs and projects"""
+    query = request.GET.get("q", "").strip()[:MAX_QUERY_LENGTH]
+    kind = request.GET.get("type", "")
+    if kind not in dict(SearchDocument.KIND_CHOICES):
+        kind = ""
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+    except ValueError:
+        page = 1
+
+    results, has_next = search_site(query, [kind] if kind else None, page)
+
+    return render(request, "search.html", {
+        "query": query,
+        "kind": kind,
+        "kind_choices": SearchDocument.KIND_CHOICES,
+        "results": results,
+        "page": page,
+        "has_next": has_next,
+    })
+
+
+from .image_resizer import allowed_size, cache_storage, cached_image
+from .media_serving import IMMUTABLE_CACHE_CONTROL, serve_media
+from .storage import is_content_addressed
+
+
+def resize_image(request, width, height, kind, path):
+    """/img/<w>x<h>/<media|static>/<path>: the image shrunk to fit the box"""
+    if request.method not in ("GET", "HEAD") or not allowed_size(width, height):
+        raise Http404("Unknown image size")
+    for attempt in range(2):
+        cached = cached_image(kind, path, width, height)
+        if cached is None:
+            raise Http404("No such image")
+        try:
+            response = serve_media(request, cached, storage=cache_storage)
+            break
+        except (Http404, FileNotFoundError):
+            # Evicted between rendering and opening it; render it again
+            if attempt:
+                raise Http404("No such image")
+    if kind == "media" and is_content_addressed(path):
+        response["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+from django.middleware.csrf import get_token
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
+
+
+@require_safe
+@never_cache
+def csrf_token(request):
+    """
+    A CSRF token for the AJAX forms, fetched just before posting.
+    The form pages themselves stay free of tokens so they can be cached.
+    """
+    # Sets the CSRF cookie the token is checked against
+    return JsonResponse({"token": get_token(request)})